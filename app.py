@@ -1,34 +1,146 @@
+import time
+_START = time.perf_counter()
+
+import os
 import sys
+import importlib
+import atexit
+import threading
 from PySide6.QtWidgets import QApplication, QMainWindow, QStackedWidget, QToolBar, QPushButton, QWidget, QHBoxLayout
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QObject, QEvent
+from pages.filter_bar import FilterBar
+from data_store import DataStore
+import profiler
+
+# Page modules are imported and built on first navigation, so pandas, SciPy and
+# QtCharts are not loaded before the Home screen paints.
+PAGES = {
+    "home": ("pages.home_page", "HomePage"),
+    "stats": ("pages.stats_page", "StatsPage"),
+    "graphs": ("pages.graphs_page", "GraphsPage"),
+    "table": ("pages.table_page", "TablePage"),
+    "perf": ("pages.perf_page", "PerfPage"),
+}
+
+class StartupReport(QObject):
+    """
+    Milestones in seconds since the process started, printed once the window first paints.
+    Enabled with --startup-report or DATA_APP_STARTUP_REPORT=1.
+    """
+    def __init__(self, start):
+        super().__init__()
+        self.start = start
+        self.marks = []
+        self.painted = False
+        self.after_paint = []  # callables run once the first frame is on screen
+        self.enabled = "--startup-report" in sys.argv or os.environ.get("DATA_APP_STARTUP_REPORT") == "1"
+
+    def mark(self, label):
+        self.marks.append((label, time.perf_counter() - self.start))
+        if self.enabled and self.painted:
+            # Pages built later on are reported as they happen.
+            print(f"[startup] {label:<24} {self.marks[-1][1]:.3f}s", file=sys.stderr)
+
+    def watch_first_paint(self, widget):
+        widget.installEventFilter(self)
 
-from pages.home_page import HomePage
-from pages.stats_page import StatsPage  # If still needed; otherwise, remove
-from pages.graphs_page import GraphsPage
-from pages.table_page import TablePage
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Paint:
+            obj.removeEventFilter(self)
+            self.mark("first paint")
+            self.painted = True
+            if self.enabled:
+                for label, seconds in self.marks:
+                    print(f"[startup] {label:<24} {seconds:.3f}s", file=sys.stderr)
+            for callback in self.after_paint:
+                callback()
+        return False
+
+startup = StartupReport(_START)
+startup.mark("Qt imported")
+
+def preload_data_modules():
+    # Warm the pandas/logic import off the GUI thread so the first file load does not pay for it.
+    threading.Thread(target=importlib.import_module, args=("logic",), daemon=True).start()
 
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Minimalistic Data Analytics App")
         self.resize(1200, 800)
-        self.df = None  # Shared DataFrame
+        # Shared data; pages read it through the df, profile and data_filter properties below.
+        self.store = DataStore(self)
+        self.store.changed.connect(self.on_data_changed)
 
-        # Create a stacked widget and pages
+        # Create a stacked widget; pages are added as they are first shown.
         self.stack = QStackedWidget()
         self.setCentralWidget(self.stack)
+        self.pages = {}
 
-        self.home_page = HomePage(self)  # Home page with file browsing etc.
-        self.stats_page = StatsPage(self)  # Statistics page; optional if you prefer
-        self.graphs_page = GraphsPage(self)  # Graphs page using Qt Charts
-        self.table_page = TablePage(self)    # New Table page showing data
+        self.show_page("home")
+        self.create_toolbar()
+        self.addToolBarBreak()
+        self.create_filter_bar()
 
-        self.stack.addWidget(self.home_page)   # index 0
-        self.stack.addWidget(self.stats_page)    # index 1
-        self.stack.addWidget(self.graphs_page)   # index 2
-        self.stack.addWidget(self.table_page)    # index 3
+    def page(self, name):
+        """Return the page called name, importing and building it on first use."""
+        if name not in self.pages:
+            module_name, class_name = PAGES[name]
+            page_class = getattr(importlib.import_module(module_name), class_name)
+            self.pages[name] = page_class(self)
+            self.stack.addWidget(self.pages[name])
+            startup.mark(f"{class_name} built")
+        return self.pages[name]
 
-        self.create_toolbar()
+    @property
+    def df(self):
+        return self.store.df
+
+    @property
+    def profile(self):
+        """column_profile.DatasetProfile for self.df, built at load time or on first use."""
+        return self.store.profile
+
+    @profile.setter
+    def profile(self, profile):
+        self.store.set_profile(profile)
+
+    @property
+    def data_filter(self):
+        """logic.FilteredView over self.df, or None for all rows."""
+        return self.store.data_filter
+
+    def show_page(self, name):
+        page = self.page(name)
+        # Data pages redraw only if the store changed since they last showed it.
+        if name in ("stats", "graphs", "table") and page.shown_version != self.store.version:
+            page.refresh_data()
+        elif name == "perf":
+            page.refresh()
+        self.stack.setCurrentWidget(page)
+
+    def on_data_changed(self, change):
+        if change.kind == "file":
+            import logic
+            title = "Minimalistic Data Analytics App"
+            self.setWindowTitle(title + " (sample preview)" if logic.sample_info(self.df) is not None else title)
+        # Only the page on screen is redrawn now; the others catch up when shown.
+        current = self.stack.currentWidget()
+        for name, page in self.pages.items():
+            if page is current and name != "home":
+                self.show_page(name)
+
+    def set_filter(self, conditions):
+        """Filter every page to rows matching all conditions; returns the view or None."""
+        return self.store.set_filter(conditions)
+
+    def create_filter_bar(self):
+        toolbar = QToolBar()
+        toolbar.setMovable(False)
+        toolbar.setStyleSheet("QToolBar { background-color: #000000; border: none; }")
+        self.filter_bar = FilterBar(self)
+        toolbar.addWidget(self.filter_bar)
+        self.addToolBar(Qt.TopToolBarArea, toolbar)
 
     def create_toolbar(self):
         toolbar = QToolBar()
@@ -38,29 +150,38 @@ class MainWindow(QMainWindow):
             QPushButton { background-color: #000000; color: #00FF00; border: none; padding: 8px 12px; }
             QPushButton:hover { background-color: #005500; }
         """)
-        
+
         home_btn = QPushButton("Home")
-        home_btn.clicked.connect(lambda: self.stack.setCurrentWidget(self.home_page))
+        home_btn.clicked.connect(lambda: self.show_page("home"))
         stats_btn = QPushButton("Statistics")
-        stats_btn.clicked.connect(lambda: self.stack.setCurrentWidget(self.stats_page))
+        stats_btn.clicked.connect(lambda: self.show_page("stats"))
         graphs_btn = QPushButton("Graphs")
-        graphs_btn.clicked.connect(lambda: self.graphs_page.update_columns() or self.stack.setCurrentWidget(self.graphs_page))
+        graphs_btn.clicked.connect(lambda: self.show_page("graphs"))
         table_btn = QPushButton("Table")
-        table_btn.clicked.connect(lambda: self.table_page.update_table() or self.stack.setCurrentWidget(self.table_page))
-        
+        table_btn.clicked.connect(lambda: self.show_page("table"))
+        perf_btn = QPushButton("Performance")
+        perf_btn.clicked.connect(lambda: self.show_page("perf"))
+
         layout = QHBoxLayout()
         layout.setSpacing(20)
         layout.addWidget(home_btn)
         layout.addWidget(stats_btn)
         layout.addWidget(graphs_btn)
         layout.addWidget(table_btn)
+        layout.addWidget(perf_btn)
         container = QWidget()
         container.setLayout(layout)
         toolbar.addWidget(container)
         self.addToolBar(Qt.TopToolBarArea, toolbar)
 
 if __name__ == "__main__":
+    trace_path = profiler.enable_from_environment()
+    if trace_path:
+        atexit.register(profiler.export_trace, trace_path)
     app = QApplication(sys.argv)
     window = MainWindow()
+    startup.mark("window built")
+    startup.watch_first_paint(window)
+    startup.after_paint.append(preload_data_modules)
     window.show()
-    sys.exit(app.exec())
\ No newline at end of file
+    sys.exit(app.exec())
@@ -0,0 +1,255 @@
+"""
+Headless batch analysis over folders of data files.
+
+Runs the logic.py pipeline (load, describe_data, correlation_matrix, pivot tables
+and graph prepare_data/get_statistics) for every file, several files at a time,
+and writes one result per file plus a run summary. Qt is never imported.
+
+    python batch.py data/ --output results/ --pivot product,region,sales \\
+        --graph histogram:sales --graph bar:product --workers 8
+    python batch.py a.csv b.json --output results/ --format csv
+
+Graph specs are kind:column, or bubble:x,y,size. Kinds: bar, pie, histogram,
+line, scatter, box, area, bubble.
+"""
+import os
+import sys
+import json
+import time
+import math
+import argparse
+
+# logic (and pandas/numpy) are imported inside the functions that need them so
+# argument errors and --help return immediately.
+
+DATA_SUFFIXES = (".csv", ".json", ".ndjson", ".jsonl")
+GRAPH_KINDS = {
+    "bar": "BarChartGraph",
+    "pie": "PieChartGraph",
+    "histogram": "HistogramGraph",
+    "line": "LineChartGraph",
+    "scatter": "ScatterChartGraph",
+    "box": "BoxPlotGraph",
+    "area": "AreaChartGraph",
+    "bubble": "BubbleChartGraph",
+}
+
+def find_files(paths, recursive=False):
+    """Expand files and folders into (file path, output name) pairs, in sorted order."""
+    found = []
+    for path in paths:
+        if os.path.isfile(path):
+            found.append((path, os.path.splitext(os.path.basename(path))[0]))
+            continue
+        if not os.path.isdir(path):
+            raise FileNotFoundError(f"No such file or folder: {path}")
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            if not recursive:
+                dirs[:] = []
+            for name in sorted(files):
+                if name.lower().endswith(DATA_SUFFIXES):
+                    file_path = os.path.join(root, name)
+                    relative = os.path.splitext(os.path.relpath(file_path, path))[0]
+                    found.append((file_path, relative.replace(os.sep, "__")))
+    return found
+
+def load_file(file_path, use_cache=False):
+    import logic
+    suffix = os.path.splitext(file_path)[1].lower()
+    if suffix == ".json":
+        return logic.load_json(file_path)
+    if suffix in (".ndjson", ".jsonl"):
+        return logic.load_ndjson(file_path)
+    return logic.load_csv(file_path, use_cache=use_cache)
+
+def parse_pivot(spec):
+    parts = [part.strip().lower() for part in spec.split(",")]
+    if len(parts) not in (3, 4):
+        raise argparse.ArgumentTypeError("pivot must be INDEX,COLUMNS,VALUES[,AGGFUNC]")
+    return tuple(parts) if len(parts) == 4 else tuple(parts) + ("mean",)
+
+def parse_graph(spec):
+    kind, _, columns = spec.partition(":")
+    kind = kind.strip().lower()
+    columns = tuple(col.strip().lower() for col in columns.split(",") if col.strip())
+    if kind not in GRAPH_KINDS:
+        raise argparse.ArgumentTypeError(f"unknown graph kind {kind!r}; choose from {', '.join(GRAPH_KINDS)}")
+    if len(columns) != (3 if kind == "bubble" else 1):
+        raise argparse.ArgumentTypeError(f"{kind} needs {'x,y,size columns' if kind == 'bubble' else 'one column'}")
+    return kind, columns
+
+def jsonable(value):
+    """Convert frames, numpy values and timestamps to plain JSON types (NaN -> null)."""
+    import numpy as np
+    import pandas as pd
+    if isinstance(value, pd.DataFrame):
+        return {"index": jsonable(value.index.tolist()), "columns": jsonable(value.columns.tolist()),
+                "data": jsonable(value.to_numpy(dtype=object).tolist())}
+    if isinstance(value, pd.Series):
+        return jsonable(value.to_dict())
+    if isinstance(value, dict):
+        return {str(key): jsonable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return [jsonable(item) for item in value]
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if value is None or isinstance(value, (str, int, bool)):
+        return value
+    if value is pd.NaT or (not isinstance(value, (list, dict)) and pd.isna(value)):
+        return None
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+def run_graph(df, kind, columns, bins, include_data, approximate=False):
+    import logic
+    graph_class = getattr(logic, GRAPH_KINDS[kind])
+    missing = [col for col in columns if col not in df.columns]
+    if missing:
+        return {"error": f"missing column(s): {', '.join(missing)}"}
+    graph = graph_class(df, *columns)
+    if kind == "histogram":
+        graph.set_bins(bins)
+    if approximate and hasattr(graph, "set_approximate"):
+        graph.set_approximate(True)
+    try:
+        data = graph.prepare_data()
+        result = {"statistics": graph.get_statistics()}
+    except Exception as e:
+        return {"error": f"{type(e).__name__}: {e}"}
+    if include_data:
+        result["data"] = data
+    return result
+
+def analyse_file(file_path, options):
+    """Run the configured analysis on one file. Runs in a worker process."""
+    import logic
+    start = time.perf_counter()
+    df = load_file(file_path, use_cache=options["use_cache"])
+    result = {
+        "file": os.path.abspath(file_path),
+        "rows": len(df),
+        "columns": [str(col) for col in df.columns],
+        "describe": logic.describe_data(df),
+        "correlation": logic.correlation_matrix(df),
+        "pivots": {},
+        "graphs": {},
+    }
+    for index, columns, values, aggfunc in options["pivots"]:
+        name = f"{index},{columns},{values},{aggfunc}"
+        missing = [col for col in (index, columns, values) if col not in df.columns]
+        if missing:
+            result["pivots"][name] = {"error": f"missing column(s): {', '.join(missing)}"}
+            continue
+        result["pivots"][name] = logic.create_pivot_table(df, index, columns, values, aggfunc, parallel=False)
+    for kind, columns in options["graphs"]:
+        name = f"{kind}:{','.join(columns)}"
+        result["graphs"][name] = run_graph(df, kind, columns, options["bins"], options["include_graph_data"],
+                                           options["approximate"])
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+def write_json(result, out_dir, name):
+    path = os.path.join(out_dir, f"{name}.json")
+    with open(path, "w") as f:
+        json.dump(jsonable(result), f, indent=2)
+    return path
+
+def write_csv(result, out_dir, name):
+    import pandas as pd
+    folder = os.path.join(out_dir, name)
+    os.makedirs(folder, exist_ok=True)
+    result["describe"].to_csv(os.path.join(folder, "describe.csv"))
+    result["correlation"].to_csv(os.path.join(folder, "correlation.csv"))
+    for i, (spec, table) in enumerate(result["pivots"].items(), 1):
+        if isinstance(table, pd.DataFrame):
+            table.to_csv(os.path.join(folder, f"pivot_{i}.csv"))
+    rows = []
+    for spec, graph in result["graphs"].items():
+        if "error" in graph:
+            rows.append({"graph": spec, "statistic": "error", "value": graph["error"]})
+            continue
+        for key, value in (graph["statistics"] or {}).items():
+            rows.append({"graph": spec, "statistic": key, "value": json.dumps(jsonable(value))})
+        if "data" in graph:
+            data = graph["data"] or {}
+            frame = pd.DataFrame(data) if all(isinstance(v, list) for v in data.values()) else pd.DataFrame([data])
+            frame.to_csv(os.path.join(folder, f"graph_{spec.replace(':', '_').replace(',', '_')}.csv"), index=False)
+    pd.DataFrame(rows, columns=["graph", "statistic", "value"]).to_csv(os.path.join(folder, "graphs.csv"), index=False)
+    return folder
+
+def process_file(file_path, name, options):
+    """Analyse one file and write its output; returns a summary row and never raises."""
+    start = time.perf_counter()
+    try:
+        result = analyse_file(file_path, options)
+        writer = write_csv if options["format"] == "csv" else write_json
+        output = writer(result, options["output"], name)
+        return {"file": file_path, "status": "ok", "rows": result["rows"], "output": output,
+                "seconds": round(time.perf_counter() - start, 4), "error": None}
+    except Exception as e:
+        return {"file": file_path, "status": "failed", "rows": None, "output": None,
+                "seconds": round(time.perf_counter() - start, 4), "error": f"{type(e).__name__}: {e}"}
+
+def run(files, options, workers):
+    """Process files with a pool of worker processes; summary rows come back in input order."""
+    if workers <= 1 or len(files) <= 1:
+        rows = (process_file(path, name, options) for path, name in files)
+        return [_report(row) for row in rows]
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(process_file, path, name, options) for path, name in files]
+        return [_report(future.result()) for future in futures]
+
+def _report(row):
+    print(f"{row['status']:>6} {row['seconds']:>8.2f}s  {row['file']}", file=sys.stderr)
+    return row
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the analysis pipeline over data files without the GUI.")
+    parser.add_argument("paths", nargs="+", help="CSV/JSON/NDJSON files or folders containing them")
+    parser.add_argument("--output", "-o", required=True, help="folder for the results")
+    parser.add_argument("--format", choices=["json", "csv"], default="json")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--recursive", action="store_true", help="also search subfolders")
+    parser.add_argument("--pivot", action="append", type=parse_pivot, default=[],
+                        metavar="INDEX,COLUMNS,VALUES[,AGGFUNC]")
+    parser.add_argument("--graph", action="append", type=parse_graph, default=[], metavar="KIND:COLUMN")
+    parser.add_argument("--bins", type=int, default=10, help="histogram bins")
+    parser.add_argument("--include-graph-data", action="store_true",
+                        help="also write each graph's prepared data (large for line/scatter/area/bubble)")
+    parser.add_argument("--use-cache", action="store_true", help="read and write the binary CSV cache")
+    parser.add_argument("--approximate", action="store_true",
+                        help="sketch-based bar/histogram/box statistics with error bounds, for very large columns")
+    args = parser.parse_args(argv)
+
+    try:
+        files = find_files(args.paths, args.recursive)
+    except FileNotFoundError as e:
+        parser.error(str(e))
+    os.makedirs(args.output, exist_ok=True)
+    options = {
+        "output": args.output,
+        "format": args.format,
+        "pivots": args.pivot,
+        "graphs": args.graph,
+        "bins": args.bins,
+        "include_graph_data": args.include_graph_data,
+        "use_cache": args.use_cache,
+        "approximate": args.approximate,
+    }
+    start = time.perf_counter()
+    summary = run(files, options, args.workers)
+    elapsed = time.perf_counter() - start
+    with open(os.path.join(args.output, "summary.json"), "w") as f:
+        json.dump({"seconds": round(elapsed, 4), "workers": args.workers, "files": summary}, f, indent=2)
+    failed = sum(row["status"] != "ok" for row in summary)
+    print(f"Processed {len(summary)} file(s) in {elapsed:.2f}s, {failed} failed. Summary: "
+          f"{os.path.join(args.output, 'summary.json')}")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,210 @@
+"""
+Benchmark suite for logic.py.
+
+Generates synthetic datasets shaped like dummydata.csv and records wall time and
+peak traced memory for each logic function and graph class method. Times come
+from untraced runs; the peak from a separate run under tracemalloc, which counts
+this process only (create_pivot_table's peak is measured with parallel=False).
+
+    python benchmarks/bench_logic.py --sizes 1e3 1e4 1e5 --output bench.json
+    python benchmarks/bench_logic.py --sizes 1e5 --compare bench.json
+
+Variants:
+    base      the six dummydata.csv columns
+    wide      base plus 50 extra numeric columns
+    highcard  base with ~n/10 distinct products and ~1000 regions
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import subprocess
+import tracemalloc
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import logic
+import data_cache
+from result_cache import shared_cache
+
+DEFAULT_SIZES = [1e3, 1e4, 1e5, 1e6, 1e7]
+VARIANTS = ["base", "wide", "highcard"]
+WIDE_EXTRA_COLUMNS = 50
+
+def make_dataset(rows, variant="base", seed=0):
+    rng = np.random.default_rng(seed)
+    if variant == "highcard":
+        products = np.array([f"P{i}" for i in range(max(rows // 10, 1))])
+        regions = np.array([f"R{i}" for i in range(1000)])
+    else:
+        products = np.array(["A", "B", "C"])
+        regions = np.array(["North", "South", "East", "West"])
+    prices = rng.choice([8.99, 9.99, 12.99], size=rows)
+    quantity = rng.integers(100, 171, size=rows)
+    df = pd.DataFrame({
+        "Product": rng.choice(products, size=rows),
+        "Sales": rng.integers(1100, 2401, size=rows) // 50 * 50,
+        "Price": prices,
+        "Quantity": quantity,
+        "Region": rng.choice(regions, size=rows),
+        "Date": (np.datetime64("2025-01-01") + rng.integers(0, 365, size=rows)).astype(str),
+    })
+    if variant == "wide":
+        extra = rng.standard_normal((rows, WIDE_EXTRA_COLUMNS))
+        extra_df = pd.DataFrame(extra, columns=[f"Metric{i}" for i in range(WIDE_EXTRA_COLUMNS)])
+        df = pd.concat([df, extra_df], axis=1)
+    return df
+
+def measure(func, repeat=1, memory_func=None):
+    """
+    Return (best wall seconds, peak traced bytes, error or None).
+    Tracing slows every allocation, so the timed runs are untraced and the peak
+    comes from one extra traced run of memory_func (func by default). tracemalloc
+    only sees this process: pass a single-process memory_func for functions that
+    use worker processes.
+    """
+    best_time = None
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - start
+            best_time = elapsed if best_time is None else min(best_time, elapsed)
+        tracemalloc.start()
+        try:
+            (memory_func or func)()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    except Exception as e:
+        return None, None, f"{type(e).__name__}: {e}"
+    return best_time, peak, None
+
+def uncached(method):
+    # Graph methods are memoized; benchmark the underlying computation.
+    return getattr(method, "__wrapped__", method)
+
+def graph_cases(df):
+    cases = [
+        ("BarChartGraph", logic.BarChartGraph(df, "product")),
+        ("PieChartGraph", logic.PieChartGraph(df, "region")),
+        ("HistogramGraph", logic.HistogramGraph(df, "sales")),
+        ("LineChartGraph", logic.LineChartGraph(df, "sales")),
+        ("ScatterChartGraph", logic.ScatterChartGraph(df, "sales")),
+        ("BoxPlotGraph", logic.BoxPlotGraph(df, "sales")),
+        ("AreaChartGraph", logic.AreaChartGraph(df, "sales")),
+        ("BubbleChartGraph", logic.BubbleChartGraph(df, "price", "quantity", "sales")),
+    ]
+    for name, graph in cases:
+        yield f"{name}.prepare_data", lambda g=graph: uncached(type(g).prepare_data)(g)
+        # Some get_statistics implementations read the prepared data.
+        yield f"{name}.get_statistics", lambda g=graph: uncached(type(g).get_statistics)(g)
+
+def run_cases(rows, variant, workdir, repeat):
+    raw = make_dataset(rows, variant)
+    csv_path = os.path.join(workdir, f"{variant}_{rows}.csv")
+    raw.to_csv(csv_path, index=False)
+    cache_dir = os.path.join(workdir, "cache")
+    df = logic.normalize_dataframe(raw)
+
+    cases = [
+        ("load_csv", lambda: logic.load_csv(csv_path, use_cache=False)),
+        ("load_csv[cache write]", lambda: (data_cache.clear(cache_dir),
+                                           data_cache.store(df, csv_path, cache_dir=cache_dir))),
+        ("load_csv[cache hit]", lambda: data_cache.load(csv_path, cache_dir=cache_dir)),
+        ("normalize_dataframe", lambda: logic.normalize_dataframe(raw)),
+        ("normalize_dataframe[compact]", lambda: logic.normalize_dataframe(raw, compact=True)),
+        ("describe_data", lambda: logic.describe_data(df)),
+        ("correlation_matrix", lambda: (shared_cache.clear(), logic.correlation_matrix(df))),
+        ("create_pivot_table", lambda: logic.create_pivot_table(df, "product", "region", "sales")),
+        ("split_tables", lambda: logic.split_tables(df, "region")),
+    ]
+    # From parallel_agg's threshold the pivot runs in worker processes, whose memory
+    # tracemalloc cannot see; its peak is taken from the single-process path.
+    memory_funcs = {
+        "create_pivot_table": lambda: logic.create_pivot_table(df, "product", "region", "sales", parallel=False),
+    }
+    results = []
+    for name, func in list(cases) + list(graph_cases(df)):
+        if name.endswith(".get_statistics"):
+            # Run prepare_data first so statistics that depend on self.data are valid.
+            graph_name = name.split(".")[0]
+            for prep_name, prep in graph_cases(df):
+                if prep_name == f"{graph_name}.prepare_data":
+                    prep()
+        seconds, peak, error = measure(func, repeat, memory_funcs.get(name))
+        results.append({
+            "function": name,
+            "variant": variant,
+            "rows": rows,
+            "columns": raw.shape[1],
+            "seconds": seconds,
+            "peak_bytes": peak,
+            "error": error,
+        })
+        status = error or f"{seconds:.4f}s  {peak / 1e6:.1f} MB"
+        print(f"{variant:>9} {rows:>10,} {name:<34} {status}")
+    os.remove(csv_path)
+    return results
+
+def git_revision():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                             cwd=os.path.dirname(os.path.abspath(__file__)))
+        return out.stdout.strip() or None
+    except OSError:
+        return None
+
+def compare(results, baseline_path):
+    with open(baseline_path, "r") as f:
+        baseline = json.load(f)
+    old = {(r["function"], r["variant"], r["rows"]): r for r in baseline["results"]}
+    print(f"\nCompared with {baseline_path} ({baseline['meta'].get('git_revision')}):")
+    for r in results:
+        before = old.get((r["function"], r["variant"], r["rows"]))
+        if not before or not before["seconds"] or not r["seconds"]:
+            continue
+        ratio = r["seconds"] / before["seconds"]
+        print(f"{r['variant']:>9} {r['rows']:>10,} {r['function']:<34} "
+              f"{before['seconds']:.4f}s -> {r['seconds']:.4f}s  (x{ratio:.2f})")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark logic.py at increasing data sizes.")
+    parser.add_argument("--sizes", nargs="+", type=float, default=DEFAULT_SIZES, help="row counts, e.g. 1e3 1e5")
+    parser.add_argument("--variants", nargs="+", choices=VARIANTS, default=VARIANTS)
+    parser.add_argument("--repeat", type=int, default=3, help="runs per case; the fastest is kept")
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--compare", help="earlier results JSON to compare against")
+    args = parser.parse_args(argv)
+
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for rows in sorted(int(s) for s in args.sizes):
+            for variant in args.variants:
+                results.extend(run_cases(rows, variant, workdir, args.repeat))
+
+    report = {
+        "meta": {
+            "git_revision": git_revision(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nSaved {len(results)} results to {args.output}")
+    if args.compare:
+        compare(results, args.compare)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+import numpy as np
+import pandas as pd
+from result_cache import dataframe_token
+
+# Per-column facts computed once when a file is loaded and shared by every page,
+# so pages do not rescan the DataFrame for describe(), value_counts() or
+# numeric coercion on each render.
+
+TOP_K = 10
+MAX_CATEGORIES = 1000  # full value counts are kept up to this cardinality
+COERCE_SAMPLE = 1000
+
+class ColumnProfile:
+    def __init__(self, name):
+        self.name = name
+        self.kind = None  # "numeric", "bool", "datetime", "categorical" or "text"
+        self.dtype = None
+        self.count = 0
+        self.null_count = 0
+        self.cardinality = 0
+        self.min = None
+        self.max = None
+        self.mean = np.nan
+        self.std = np.nan
+        self.quartiles = (np.nan, np.nan, np.nan)
+        self.top_values = []  # [(value, count), ...] most frequent first
+        self.value_counts = None  # full counts when cardinality <= MAX_CATEGORIES
+        self.numeric_ratio = 0.0  # share of non-null values that pd.to_numeric accepts
+
+    @property
+    def is_numeric(self):
+        return self.kind == "numeric"
+
+    @property
+    def numeric_coercible(self):
+        return self.numeric_ratio > 0
+
+    def describe(self):
+        """This column's entry in DataFrame.describe(include="all")."""
+        if self.kind in ("numeric", "datetime"):
+            q1, median, q3 = self.quartiles
+            out = {"count": self.count, "mean": self.mean, "min": self.min,
+                   "25%": q1, "50%": median, "75%": q3, "max": self.max}
+            if self.kind == "numeric":
+                out["std"] = self.std
+            return out
+        top, freq = self.top_values[0] if self.top_values else (np.nan, np.nan)
+        return {"count": self.count, "unique": self.cardinality, "top": top, "freq": freq}
+
+class DatasetProfile:
+    def __init__(self, df_token, row_count, columns):
+        self.df_token = df_token
+        self.row_count = row_count
+        self.columns = columns  # column name -> ColumnProfile, in DataFrame order
+
+    def matches(self, df):
+        return df is not None and self.df_token == dataframe_token(df)
+
+    def column_names(self):
+        return list(self.columns)
+
+    def numeric_columns(self):
+        """Columns that are numeric or hold at least some numeric-looking text."""
+        return [name for name, col in self.columns.items() if col.is_numeric or col.numeric_coercible]
+
+    def category_columns(self, max_categories=MAX_CATEGORIES):
+        return [name for name, col in self.columns.items() if col.cardinality <= max_categories]
+
+    def describe_frame(self):
+        """Rebuild describe(include="all") from the stored profile without touching the data."""
+        if not self.columns:
+            return pd.DataFrame()
+        kinds = [col.kind for col in self.columns.values()]
+        rows = ["count"]
+        if any(kind not in ("numeric", "datetime") for kind in kinds):
+            rows += ["unique", "top", "freq"]
+        if "datetime" in kinds:
+            # describe() lists std last when datetime columns are present.
+            rows += ["mean", "min", "25%", "50%", "75%", "max", "std"]
+        else:
+            rows += ["mean", "std", "min", "25%", "50%", "75%", "max"]
+        out = pd.DataFrame(index=rows, columns=list(self.columns), dtype=object)
+        for name, col in self.columns.items():
+            for key, value in col.describe().items():
+                out.loc[key, name] = value
+            if col.kind == "numeric":
+                out[name] = out[name].astype(float)
+        return out
+
+def _profile_column(name, series):
+    col = ColumnProfile(name)
+    col.dtype = str(series.dtype)
+    col.count = int(series.count())
+    col.null_count = int(len(series) - col.count)
+    if pd.api.types.is_bool_dtype(series):
+        col.kind = "bool"
+    elif pd.api.types.is_numeric_dtype(series):
+        col.kind = "numeric"
+    elif pd.api.types.is_datetime64_any_dtype(series):
+        col.kind = "datetime"
+    elif isinstance(series.dtype, pd.CategoricalDtype):
+        col.kind = "categorical"
+    else:
+        col.kind = "text"
+
+    counts = series.value_counts(dropna=True)
+    col.cardinality = len(counts)
+    col.top_values = list(zip(counts.index[:TOP_K].tolist(), counts.values[:TOP_K].tolist()))
+    if col.cardinality <= MAX_CATEGORIES:
+        col.value_counts = counts
+    if col.kind == "text" and col.cardinality <= max(50, 0.5 * col.count):
+        col.kind = "categorical"
+
+    if col.kind == "numeric":
+        values = series.dropna().to_numpy(dtype=float)
+        col.numeric_ratio = 1.0
+        if len(values):
+            col.min, col.max = float(values.min()), float(values.max())
+            col.mean = float(values.mean())
+            col.std = float(values.std(ddof=1)) if len(values) > 1 else np.nan
+            col.quartiles = tuple(float(q) for q in np.percentile(values, [25, 50, 75]))
+    elif col.kind == "datetime":
+        values = series.dropna()
+        if len(values):
+            col.min, col.max = values.min(), values.max()
+            col.mean = values.mean()
+            col.quartiles = tuple(values.quantile([0.25, 0.5, 0.75]).tolist())
+    elif col.kind != "bool" and col.count:
+        sample = series.dropna()
+        if len(sample) > COERCE_SAMPLE:
+            sample = sample.sample(COERCE_SAMPLE, random_state=0)
+        col.numeric_ratio = float(pd.to_numeric(sample, errors="coerce").notna().mean())
+        if len(counts):
+            try:
+                col.min, col.max = counts.index.min(), counts.index.max()
+            except TypeError:
+                pass  # mixed types that cannot be ordered
+    return col
+
+def profile_dataframe(df):
+    columns = {name: _profile_column(name, df[name]) for name in df.columns}
+    return DatasetProfile(dataframe_token(df), len(df), columns)
+
+def profile_view(view):
+    """Profile of a logic.FilteredView's rows, gathering one column at a time."""
+    columns = {name: _profile_column(name, view.column(name)) for name in view.df.columns}
+    return DatasetProfile(None, len(view), columns)
+
+def active_view(window):
+    """window.data_filter if it applies to the loaded DataFrame, else None."""
+    view = getattr(window, "data_filter", None)
+    if view is None or view.df is not getattr(window, "df", None) or not view.active:
+        return None
+    return view
+
+def active_frame(window, columns=None):
+    """
+    The DataFrame pages should compute from: the filtered rows, or all of window.df.
+    With a filter, only `columns` are gathered, so pass the ones the computation reads.
+    """
+    view = active_view(window)
+    return view.frame(columns) if view is not None else getattr(window, "df", None)
+
+def sample_note(window):
+    """A short note such as "sample of 100,000 of ~12,000,000 rows" when window.df is a preview sample, else ""."""
+    df = getattr(window, "df", None)
+    info = df.attrs.get("sample") if df is not None else None
+    if not info:
+        return ""
+    return f"sample of {info['rows']:,} of ~{info['estimated_rows']:,} rows"
+
+def ensure_profile(window):
+    """
+    Return the profile for the data pages should show: window.profile for window.df,
+    or the active filter's own profile. Either is rebuilt if its DataFrame changed.
+    """
+    view = active_view(window)
+    if view is not None:
+        if view.profile is None:
+            view.profile = profile_view(view)
+        return view.profile
+    df = getattr(window, "df", None)
+    if df is None:
+        return None
+    profile = getattr(window, "profile", None)
+    if profile is None or not profile.matches(df):
+        profile = profile_dataframe(df)
+        window.profile = profile
+    return profile
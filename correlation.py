@@ -0,0 +1,119 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+
+# Pearson correlation for wide tables.
+# Columns are centred and scaled once into a float32 matrix; the k x k result is
+# built from (block x block) tiles computed on a thread pool, each tile summing
+# BLAS products over row chunks. NaNs are handled pairwise-complete (the same
+# rows DataFrame.corr() would use) with masked moment sums instead of dropping rows.
+
+BLOCK_SIZE = 256  # columns per tile side
+ROW_CHUNK = 65536  # rows per BLAS product; bounds the per-tile scratch memory
+
+def standardize(df, dtype=np.float32):
+    """
+    Return (Z, has_nan): the columns of df centred on their mean and divided by their
+    standard deviation, as a Fortran-ordered array so column blocks are contiguous.
+    Scaling only conditions the sums; pairwise means are recomputed from them.
+    """
+    n, k = df.shape
+    z = np.empty((n, k), dtype=dtype, order="F")
+    has_nan = False
+    for j in range(k):
+        col = df.iloc[:, j].to_numpy(dtype=np.float64, na_value=np.nan)
+        valid = ~np.isnan(col)
+        has_nan = has_nan or not valid.all()
+        if valid.any():
+            mean = col[valid].mean()
+            scale = col[valid].std()
+            z[:, j] = (col - mean) / (scale if scale > 0 else 1.0)
+        else:
+            z[:, j] = np.nan
+    return z, has_nan
+
+def _tile_complete(z, a, b):
+    """Correlations between column ranges a and b when there are no NaNs."""
+    za, zb = z[:, a], z[:, b]
+    cross = np.zeros((a.stop - a.start, b.stop - b.start))
+    sum_a = np.zeros(a.stop - a.start)
+    sum_b = np.zeros(b.stop - b.start)
+    sq_a = np.zeros(a.stop - a.start)
+    sq_b = np.zeros(b.stop - b.start)
+    for start in range(0, z.shape[0], ROW_CHUNK):
+        ca, cb = za[start:start + ROW_CHUNK], zb[start:start + ROW_CHUNK]
+        cross += ca.T @ cb
+        sum_a += ca.sum(axis=0, dtype=np.float64)
+        sum_b += cb.sum(axis=0, dtype=np.float64)
+        sq_a += np.einsum("ij,ij->j", ca, ca, dtype=np.float64)
+        sq_b += np.einsum("ij,ij->j", cb, cb, dtype=np.float64)
+    n = z.shape[0]
+    cov = cross - np.outer(sum_a, sum_b) / n
+    var_a = sq_a - sum_a ** 2 / n
+    var_b = sq_b - sum_b ** 2 / n
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return cov / np.sqrt(np.outer(var_a, var_b))
+
+def _tile_pairwise(z, a, b):
+    """Correlations between column ranges a and b over pairwise-complete rows."""
+    shape = (a.stop - a.start, b.stop - b.start)
+    count, sum_a, sum_b, sq_a, sq_b, cross = (np.zeros(shape) for _ in range(6))
+    for start in range(0, z.shape[0], ROW_CHUNK):
+        ca, cb = z[start:start + ROW_CHUNK, a], z[start:start + ROW_CHUNK, b]
+        ma, mb = ~np.isnan(ca), ~np.isnan(cb)
+        ca, cb = np.where(ma, ca, 0), np.where(mb, cb, 0)
+        ma, mb = ma.astype(z.dtype), mb.astype(z.dtype)
+        count += ma.T @ mb
+        sum_a += ca.T @ mb  # sum of column a over rows where column b is present
+        sum_b += ma.T @ cb
+        sq_a += (ca * ca).T @ mb
+        sq_b += ma.T @ (cb * cb)
+        cross += ca.T @ cb
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cov = cross - sum_a * sum_b / count
+        var_a = sq_a - sum_a ** 2 / count
+        var_b = sq_b - sum_b ** 2 / count
+        return cov / np.sqrt(var_a * var_b)
+
+def corr(df, block_size=BLOCK_SIZE, workers=None, dtype=np.float32):
+    """
+    Pearson correlation of every column of a numeric DataFrame, like df.corr().
+    float32 products agree with df.corr() to about 1e-5; pass dtype=np.float64 for
+    full precision at twice the memory.
+    """
+    columns = df.columns
+    k = len(columns)
+    z, has_nan = standardize(df, dtype)
+    tile = _tile_pairwise if has_nan else _tile_complete
+    blocks = [slice(start, min(start + block_size, k)) for start in range(0, k, block_size)]
+    pairs = [(a, b) for i, a in enumerate(blocks) for b in blocks[i:]]
+    result = np.empty((k, k))
+    # numpy releases the GIL inside the BLAS calls, so tiles run in parallel threads.
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1) as executor:
+        for (a, b), values in zip(pairs, executor.map(lambda pair: tile(z, *pair), pairs)):
+            result[a, b] = values
+            result[b, a] = values.T
+    np.clip(result, -1.0, 1.0, out=result)
+    # A column correlates perfectly with itself unless it is constant or empty.
+    diagonal = np.diagonal(result).copy()
+    np.fill_diagonal(result, np.where(np.isnan(diagonal), np.nan, 1.0))
+    return pd.DataFrame(result, index=columns, columns=columns)
+
+def top_pairs(matrix, k=20, absolute=True):
+    """
+    The k most strongly correlated distinct column pairs of a correlation matrix,
+    as a DataFrame with columns column_a, column_b and r, strongest first.
+    """
+    values = matrix.to_numpy()
+    rows, cols = np.triu_indices(len(values), k=1)
+    r = values[rows, cols]
+    strength = np.abs(r) if absolute else r.copy()
+    strength[np.isnan(strength)] = -np.inf
+    k = min(k, len(r))
+    if k == 0:
+        return pd.DataFrame(columns=["column_a", "column_b", "r"])
+    best = np.argpartition(-strength, k - 1)[:k]
+    best = best[np.argsort(-strength[best], kind="stable")]
+    names = matrix.columns
+    return pd.DataFrame({"column_a": names[rows[best]], "column_b": names[cols[best]], "r": r[best]})
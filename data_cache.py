@@ -0,0 +1,156 @@
+import os
+import json
+import shutil
+import hashlib
+import numpy as np
+import pandas as pd
+
+# Binary column cache for parsed CSV files.
+# Each entry is a folder of per-column .npy files plus a meta.json, keyed on the
+# source file's absolute path, size and mtime. Numeric and datetime columns are
+# memory-mapped copy-on-write on load, so a cached frame can be edited like a
+# freshly parsed one without the edits reaching the files; text columns are
+# stored as integer codes + categories.
+
+CACHE_DIR = os.environ.get(
+    "DATA_APP_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "minimalistic_data_analytics")
+)
+MAX_CACHE_BYTES = int(os.environ.get("DATA_APP_CACHE_MAX_BYTES", 4 * 1024 ** 3))
+
+_NATIVE_KINDS = "biufcmM"  # bool, int, uint, float, complex, timedelta, datetime
+# Part of every key; bump it when the entry layout changes so older entries are not read back.
+# 2: categorical columns keep their own category order.
+FORMAT_VERSION = 2
+
+def cache_key(file_path, variant=""):
+    # variant separates differently-processed copies of the same file (e.g. compact dtypes).
+    st = os.stat(file_path)
+    identity = f"{os.path.abspath(file_path)}|{st.st_size}|{st.st_mtime_ns}|{variant}|{FORMAT_VERSION}"
+    return hashlib.sha1(identity.encode("utf-8")).hexdigest()
+
+def _entry_dir(key, cache_dir):
+    return os.path.join(cache_dir, key)
+
+def _dir_size(path):
+    total = 0
+    for name in os.listdir(path):
+        try:
+            total += os.path.getsize(os.path.join(path, name))
+        except OSError:
+            pass
+    return total
+
+def contains(file_path, cache_dir=None, variant=""):
+    """True if file_path has a complete cache entry (without loading it)."""
+    try:
+        entry = _entry_dir(cache_key(file_path, variant), cache_dir or CACHE_DIR)
+    except OSError:
+        return False
+    return os.path.isfile(os.path.join(entry, "meta.json"))
+
+def load(file_path, cache_dir=None, variant=""):
+    """Return the cached DataFrame for file_path, or None on a miss."""
+    cache_dir = cache_dir or CACHE_DIR
+    try:
+        entry = _entry_dir(cache_key(file_path, variant), cache_dir)
+        meta_path = os.path.join(entry, "meta.json")
+        with open(meta_path, "r") as f:
+            meta = json.load(f)
+        columns = {}
+        for i, col in enumerate(meta["columns"]):
+            info = meta["storage"][i]
+            if info["kind"] == "array":
+                columns[col] = np.load(os.path.join(entry, f"{i}.npy"), mmap_mode="c")
+            else:
+                codes = np.load(os.path.join(entry, f"{i}.npy"), mmap_mode="c")
+                if info["dtype"] == "category":
+                    columns[col] = pd.Categorical.from_codes(codes, info["categories"],
+                                                             ordered=info.get("ordered", False))
+                    continue
+                # Code -1 marks a missing value; it indexes the trailing NaN.
+                categories = np.array(info["categories"] + [np.nan], dtype=object)
+                values = categories.take(codes)
+                series = pd.Series(values, copy=False)
+                if info["dtype"] != "object":
+                    series = series.astype(info["dtype"])
+                columns[col] = series
+        df = pd.DataFrame(columns, copy=False)
+        df.attrs.update(meta.get("attrs", {}))
+        # Touch the entry so eviction treats it as recently used.
+        os.utime(meta_path)
+        return df
+    except (OSError, ValueError, KeyError):
+        return None
+
+def store(df, file_path, cache_dir=None, max_bytes=None, variant=""):
+    """Write df as the cache entry for file_path. Failures are ignored; the cache is best-effort."""
+    cache_dir = cache_dir or CACHE_DIR
+    max_bytes = MAX_CACHE_BYTES if max_bytes is None else max_bytes
+    tmp_entry = None
+    try:
+        key = cache_key(file_path, variant)
+        entry = _entry_dir(key, cache_dir)
+        if os.path.exists(entry):
+            return
+        tmp_entry = f"{entry}.tmp-{os.getpid()}"
+        os.makedirs(tmp_entry, exist_ok=True)
+        storage = []
+        for i, col in enumerate(df.columns):
+            series = df[col]
+            target = os.path.join(tmp_entry, f"{i}.npy")
+            if isinstance(series.dtype, np.dtype) and series.dtype.kind in _NATIVE_KINDS:
+                np.save(target, series.to_numpy())
+                storage.append({"kind": "array"})
+            elif isinstance(series.dtype, pd.CategoricalDtype):
+                # The categories keep their own order, which comparisons and sorting depend on.
+                categories = series.cat.categories
+                np.save(target, series.cat.codes.to_numpy().astype(np.int32 if len(categories) < 2 ** 31 else np.int64))
+                storage.append({
+                    "kind": "codes",
+                    "dtype": "category",
+                    "categories": [u.item() if isinstance(u, np.generic) else u for u in categories],
+                    "ordered": bool(series.cat.ordered),
+                })
+            else:
+                codes, uniques = pd.factorize(series, use_na_sentinel=True)
+                np.save(target, codes.astype(np.int32 if len(uniques) < 2 ** 31 else np.int64))
+                storage.append({
+                    "kind": "codes",
+                    "dtype": str(series.dtype),
+                    "categories": [u.item() if isinstance(u, np.generic) else u for u in uniques],
+                })
+        meta = {"source": os.path.abspath(file_path), "columns": [str(c) for c in df.columns],
+                "storage": storage, "attrs": df.attrs}
+        with open(os.path.join(tmp_entry, "meta.json"), "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp_entry, entry)
+        evict(cache_dir, max_bytes, keep=key)
+    except (OSError, TypeError, ValueError):
+        if tmp_entry is not None:
+            shutil.rmtree(tmp_entry, ignore_errors=True)
+
+def evict(cache_dir=None, max_bytes=None, keep=None):
+    """Remove least recently used entries until the cache fits in max_bytes."""
+    cache_dir = cache_dir or CACHE_DIR
+    max_bytes = MAX_CACHE_BYTES if max_bytes is None else max_bytes
+    if not os.path.isdir(cache_dir):
+        return
+    entries = []
+    for name in os.listdir(cache_dir):
+        path = os.path.join(cache_dir, name)
+        meta_path = os.path.join(path, "meta.json")
+        if not os.path.isfile(meta_path):
+            continue
+        entries.append((os.path.getmtime(meta_path), name, path, _dir_size(path)))
+    total = sum(e[3] for e in entries)
+    for _, name, path, size in sorted(entries):
+        if total <= max_bytes:
+            break
+        if name == keep:
+            continue
+        shutil.rmtree(path, ignore_errors=True)
+        total -= size
+
+def clear(cache_dir=None):
+    shutil.rmtree(cache_dir or CACHE_DIR, ignore_errors=True)
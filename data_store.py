@@ -0,0 +1,125 @@
+from PySide6.QtCore import QObject, Signal
+
+# The data every page shows, held in one place. Each change (a new file, a new
+# filter, appended rows) bumps `version` and emits `changed`, so pages can tell
+# whether what they show is stale and redraw only then. A change never edits a
+# DataFrame in place: it builds a new snapshot, and pandas' copy-on-write keeps
+# the columns shared with the old one, so a snapshot handed to a worker thread
+# stays valid while the user moves on.
+# pandas and logic are imported on first use so the store can be built before
+# the Home screen paints.
+
+class DataSnapshot:
+    """The loaded data at one version. Treat it as read-only."""
+    __slots__ = ("version", "df", "profile", "data_filter", "source")
+
+    def __init__(self, version=0, df=None, profile=None, data_filter=None, source=None):
+        self.version = version
+        self.df = df  # the whole DataFrame, or None before a file is loaded
+        self.profile = profile  # column_profile.DatasetProfile for df, or None until built
+        self.data_filter = data_filter  # logic.FilteredView over df, or None for all rows
+        self.source = source  # path the data came from
+
+    def replace(self, **changes):
+        fields = {name: getattr(self, name) for name in self.__slots__}
+        fields.update(changes)
+        return DataSnapshot(**fields)
+
+class DataChange:
+    """
+    What one change did. kind is "file" (df replaced), "filter" (rows selected)
+    or "append" (rows added at the end); rows is the number of rows it added or selected.
+    """
+    def __init__(self, kind, version, description, rows=0):
+        self.kind = kind
+        self.version = version
+        self.description = description
+        self.rows = rows
+
+    def __repr__(self):
+        return f"DataChange({self.kind!r}, version={self.version}, {self.description!r})"
+
+class DataStore(QObject):
+    changed = Signal(object)  # DataChange
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._snapshot = DataSnapshot()
+
+    def snapshot(self):
+        """The current DataSnapshot; it is not affected by later changes."""
+        return self._snapshot
+
+    @property
+    def version(self):
+        return self._snapshot.version
+
+    @property
+    def df(self):
+        return self._snapshot.df
+
+    @property
+    def profile(self):
+        return self._snapshot.profile
+
+    @property
+    def data_filter(self):
+        return self._snapshot.data_filter
+
+    @property
+    def source(self):
+        return self._snapshot.source
+
+    def set_profile(self, profile):
+        """Keep a profile built later for the current DataFrame. It is derived data, so the version stays."""
+        if profile is None or profile.matches(self.df):
+            self._snapshot = self._snapshot.replace(profile=profile)
+
+    def set_data(self, df, profile=None, source=None, keep_filter=False):
+        """
+        Replace the data. With keep_filter the current filter conditions are applied
+        to the new DataFrame (dropped if they do not fit it), e.g. when the exact data
+        replaces a sample of the same file.
+        """
+        import result_cache
+        # Results computed from the previous DataFrame are no longer needed.
+        result_cache.clear_all()
+        view = self._refilter(df, self.data_filter) if keep_filter else None
+        rows = len(df) if df is not None else 0
+        self._commit("file", f"loaded {rows:,} rows from {source or 'memory'}", rows,
+                     df=df, profile=profile, data_filter=view, source=source)
+
+    def set_filter(self, conditions):
+        """Select the rows matching all conditions (all rows if there are none); returns the view or None."""
+        if self.df is None:
+            return None
+        import logic
+        view = logic.FilteredView(self.df, conditions) if conditions else None
+        description = f"filter {view.describe()}" if view is not None else "filter cleared"
+        self._commit("filter", description, len(view) if view is not None else len(self.df), data_filter=view)
+        return view
+
+    def append_rows(self, rows, source=None):
+        """Add the rows of a DataFrame with the same columns to the end; the filter is applied to them too."""
+        if self.df is None:
+            return self.set_data(rows, source=source)
+        if list(rows.columns) != list(self.df.columns):
+            raise ValueError("The appended data must have the same columns as the loaded data.")
+        import pandas as pd
+        df = pd.concat([self.df, rows], ignore_index=True)
+        # The profile is rebuilt for the longer DataFrame when a page next needs it.
+        self._commit("append", f"appended {len(rows):,} rows from {source or 'memory'}", len(rows),
+                     df=df, profile=None, data_filter=self._refilter(df, self.data_filter))
+
+    def _refilter(self, df, view):
+        if view is None or df is None:
+            return None
+        import logic
+        try:
+            return logic.FilteredView(df, view.conditions)
+        except Exception:
+            return None
+
+    def _commit(self, kind, description, rows, **changes):
+        self._snapshot = self._snapshot.replace(version=self.version + 1, **changes)
+        self.changed.emit(DataChange(kind, self.version, description, rows))
@@ -0,0 +1,143 @@
+import os
+import io
+import csv
+import json
+import hashlib
+
+# Persistent per-folder index of data files with cheap metadata (size, mtime,
+# header, estimated row count), so the Home page can list large folders without
+# reopening every file. Entries are reused while a file's size and mtime match.
+# Kept free of pandas/numpy so it can run before they are imported.
+
+INDEX_DIR = os.path.join(
+    os.environ.get("DATA_APP_CACHE_DIR",
+                   os.path.join(os.path.expanduser("~"), ".cache", "minimalistic_data_analytics")),
+    "file_index"
+)
+INDEX_VERSION = 1
+SNIFF_BYTES = 16 * 1024
+FILE_SUFFIXES = (".csv",)
+
+class FileInfo:
+    __slots__ = ("path", "size", "mtime_ns", "header", "estimated_rows", "exact_rows")
+
+    def __init__(self, path, size, mtime_ns, header=None, estimated_rows=None, exact_rows=False):
+        self.path = path
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.header = header  # list of column names; None until sniffed
+        self.estimated_rows = estimated_rows
+        self.exact_rows = exact_rows  # True when the whole file fitted in the sample
+
+    @property
+    def name(self):
+        return os.path.basename(self.path)
+
+    @property
+    def sniffed(self):
+        return self.header is not None
+
+    def to_list(self):
+        return [self.size, self.mtime_ns, self.header, self.estimated_rows, self.exact_rows]
+
+    @classmethod
+    def from_list(cls, path, values):
+        return cls(path, *values)
+
+def sniff(info, sample_bytes=SNIFF_BYTES):
+    """Fill in header and estimated_rows from the first sample_bytes of the file."""
+    try:
+        with open(info.path, "rb") as f:
+            sample = f.read(sample_bytes)
+    except OSError:
+        info.header, info.estimated_rows = [], None
+        return info
+    text = sample.decode("utf-8", errors="replace")
+    first_line, newline, rest = text.partition("\n")
+    try:
+        info.header = next(csv.reader(io.StringIO(first_line)), [])
+    except csv.Error:
+        info.header = []
+    info.header = [col.strip() for col in info.header]
+    if len(sample) >= info.size:
+        rows = rest.count("\n") + (1 if rest and not rest.endswith("\n") else 0)
+        info.estimated_rows, info.exact_rows = rows, True
+    else:
+        # Average the complete rows in the sample and extrapolate over the rest of the file.
+        complete = rest[:rest.rfind("\n") + 1]
+        sampled_rows = complete.count("\n")
+        header_bytes = len(first_line.encode("utf-8")) + len(newline)
+        row_bytes = len(complete.encode("utf-8")) / sampled_rows if sampled_rows else None
+        info.estimated_rows = int((info.size - header_bytes) / row_bytes) if row_bytes else None
+        info.exact_rows = False
+    return info
+
+def index_path(folder, index_dir=None):
+    digest = hashlib.sha1(os.path.abspath(folder).encode("utf-8")).hexdigest()
+    return os.path.join(index_dir or INDEX_DIR, f"{digest}.json")
+
+class FolderIndex:
+    def __init__(self, folder, index_dir=None):
+        self.folder = os.path.abspath(folder)
+        self.path = index_path(folder, index_dir)
+        self.entries = {}  # file name -> FileInfo
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "r") as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return
+        if stored.get("version") != INDEX_VERSION or stored.get("folder") != self.folder:
+            return
+        for name, values in stored.get("files", {}).items():
+            self.entries[name] = FileInfo.from_list(os.path.join(self.folder, name), values)
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({"version": INDEX_VERSION, "folder": self.folder,
+                       "files": {name: info.to_list() for name, info in self.entries.items()}}, f)
+        os.replace(tmp, self.path)
+
+    def list_files(self):
+        """
+        Stat the folder and return FileInfo objects sorted by name.
+        Entries whose size and mtime are unchanged keep their sniffed metadata.
+        """
+        current = {}
+        with os.scandir(self.folder) as it:
+            for entry in it:
+                if not entry.name.lower().endswith(FILE_SUFFIXES):
+                    continue
+                try:
+                    if not entry.is_file():
+                        continue
+                    st = entry.stat()
+                except OSError:
+                    continue
+                known = self.entries.get(entry.name)
+                if known is not None and known.size == st.st_size and known.mtime_ns == st.st_mtime_ns:
+                    current[entry.name] = known
+                else:
+                    current[entry.name] = FileInfo(entry.path, st.st_size, st.st_mtime_ns)
+        self.entries = current
+        return [current[name] for name in sorted(current)]
+
+    def sniff_missing(self, infos, batch_size=500, on_batch=None, is_cancelled=None):
+        """Sniff every entry without metadata, reporting each finished batch to on_batch(list)."""
+        batch = []
+        for info in infos:
+            if info.sniffed:
+                continue
+            if is_cancelled is not None and is_cancelled():
+                break
+            batch.append(sniff(info))
+            if len(batch) >= batch_size:
+                if on_batch is not None:
+                    on_batch(batch)
+                batch = []
+        if batch and on_batch is not None:
+            on_batch(batch)
@@ -0,0 +1,139 @@
+import re
+import json
+
+# Incremental reading of the {"meta": ..., "data": [...]} export envelope.
+# Values are decoded one at a time from a sliding text buffer, so memory stays
+# proportional to one record rather than the whole file.
+
+READ_SIZE = 1 << 20
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+class EnvelopeReader:
+    def __init__(self, f, read_size=READ_SIZE):
+        self.f = f
+        self.read_size = read_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+        self.batching = True
+
+    def _fill(self):
+        if self.eof:
+            return False
+        text = self.f.read(self.read_size)
+        if not text:
+            self.eof = True
+            return False
+        # Drop the consumed prefix so the buffer does not grow with the file.
+        self.buffer = self.buffer[self.pos:] + text
+        self.pos = 0
+        return True
+
+    def _peek(self):
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                raise ValueError("Unexpected end of JSON file.")
+
+    def _expect(self, char):
+        if self._peek() != char:
+            raise ValueError(f"Expected {char!r} at offset {self.pos} of the JSON buffer.")
+        self.pos += 1
+
+    def _value(self):
+        self._peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A number that ends exactly at the buffer edge may continue in the next read.
+            if end == len(self.buffer) and not self.eof and self._fill():
+                continue
+            self.pos = end
+            return value
+
+    def _record_batch(self):
+        """
+        Decode every complete record left in the buffer with one json.loads call.
+        The batch ends at the last "}," in the buffer; if that split is not a record
+        boundary the parse fails and batching is switched off for this file.
+        """
+        if not self.batching:
+            return None
+        end = self.buffer.rfind("},", self.pos)
+        if end <= self.pos:
+            return None
+        try:
+            records = json.loads("[" + self.buffer[self.pos:end + 1] + "]")
+        except ValueError:
+            self.batching = False
+            return None
+        self.pos = end + 1
+        return records
+
+    def iter_items(self):
+        """Yield ("meta", value) and ("record", dict) pairs in file order."""
+        self._expect("{")
+        if self._peek() == "}":
+            return
+        while True:
+            key = self._value()
+            self._expect(":")
+            if key == "data":
+                self._expect("[")
+                if self._peek() == "]":
+                    self.pos += 1
+                else:
+                    while True:
+                        self._peek()
+                        batch = self._record_batch()
+                        if batch is None:
+                            yield "record", self._value()
+                        else:
+                            for record in batch:
+                                yield "record", record
+                        if self._peek() == ",":
+                            self.pos += 1
+                            continue
+                        self._expect("]")
+                        break
+            else:
+                yield key, self._value()
+            if self._peek() == ",":
+                self.pos += 1
+                continue
+            self._expect("}")
+            return
+
+def iter_record_chunks(file_path, chunksize):
+    """Yield lists of at most chunksize records from an envelope JSON file."""
+    with open(file_path, "r") as f:
+        chunk = []
+        for kind, value in EnvelopeReader(f).iter_items():
+            if kind != "record":
+                continue
+            chunk.append(value)
+            if len(chunk) >= chunksize:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+def _default(value):
+    # Timestamps and numpy scalars that json cannot encode natively.
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
+
+def records_text(df):
+    """One JSON object per line for the rows of df, with full float precision."""
+    encode = json.JSONEncoder(default=_default).encode
+    return "\n".join(encode(record) for record in df.to_dict(orient="records"))
@@ -1,55 +1,674 @@
+import io
+import os
+import sys
+import warnings
+import functools
+from collections import OrderedDict
 import pandas as pd
 import json
 import numpy as np
-from scipy import stats
+import data_cache
+import json_stream
+import correlation
+import parallel_agg
+import sketches
+import profiler
+from result_cache import shared_cache, index_cache, dataframe_token
+
+def linregress(x, y):
+    # SciPy takes about a second to import, so it is loaded on the first regression.
+    from scipy import stats
+    return stats.linregress(x, y)
 
 # === FILE I/O & NORMALIZATION ===
 
-def load_csv(file_path):
-    df = pd.read_csv(file_path)
-    return normalize_dataframe(df)
+def load_csv(file_path, use_cache=True, compact=False):
+    variant = "compact" if compact else ""
+    if use_cache:
+        cached = data_cache.load(file_path, variant=variant)
+        if cached is not None:
+            return cached
+    df = normalize_dataframe(pd.read_csv(file_path), compact=compact, copy=False)
+    if use_cache:
+        data_cache.store(df, file_path, variant=variant)
+    return df
+
+class LoadCancelled(Exception):
+    """Raised when a chunked load is aborted by its caller."""
+
+def load_csv_chunked(file_path, chunksize=100_000, progress=None, is_cancelled=None, use_cache=True, compact=False):
+    """
+    Read a CSV in chunks so long loads can report progress and be aborted.
+    progress(rows_read, bytes_read, total_bytes) is called after each chunk and
+    is_cancelled() is polled between chunks; a True result raises LoadCancelled.
+    """
+    total_bytes = os.path.getsize(file_path)
+    variant = "compact" if compact else ""
+    if use_cache:
+        cached = data_cache.load(file_path, variant=variant)
+        if cached is not None:
+            if progress is not None:
+                progress(len(cached), total_bytes, total_bytes)
+            return cached
+    chunks = []
+    rows_read = 0
+    with open(file_path, "rb") as f:
+        for chunk in pd.read_csv(f, chunksize=chunksize):
+            if is_cancelled is not None and is_cancelled():
+                raise LoadCancelled(f"Loading {file_path} was cancelled.")
+            chunks.append(chunk)
+            rows_read += len(chunk)
+            if progress is not None:
+                progress(rows_read, min(f.tell(), total_bytes), total_bytes)
+    if not chunks:
+        df = pd.read_csv(file_path)
+    else:
+        df = pd.concat(chunks, ignore_index=True) if len(chunks) > 1 else chunks[0]
+    df = normalize_dataframe(df, compact=compact, copy=False)
+    if use_cache:
+        data_cache.store(df, file_path, variant=variant)
+    return df
+
+PREVIEW_MIN_BYTES = 64 * 1024 ** 2  # smaller files load quickly enough without a preview
+SAMPLE_ROWS = 100_000
+SAMPLE_BLOCKS = 512
+
+def wants_preview(file_path, compact=False):
+    """True when file_path is large and not already in the binary cache."""
+    if os.path.getsize(file_path) < PREVIEW_MIN_BYTES:
+        return False
+    return not data_cache.contains(file_path, variant="compact" if compact else "")
+
+def sample_csv(file_path, rows=SAMPLE_ROWS, blocks=SAMPLE_BLOCKS, seed=0, compact=False):
+    """
+    A random sample of about `rows` rows without reading the whole file.
+    The data is cut into `blocks` equal byte ranges and, in each, the rows starting in
+    a window at a random offset are read (stratified block sampling). The windows all
+    have the same size in bytes, so every row has the same chance of being picked
+    whatever its length. df.attrs["sample"] holds the sample size and an estimate of
+    the file's total row count. Rows with embedded line breaks may be split; the
+    sample is only a preview that the exact load replaces.
+    """
+    total_bytes = os.path.getsize(file_path)
+    rng = np.random.default_rng(seed)
+    pieces = []
+    with open(file_path, "rb") as f:
+        header = f.readline()
+        data_start = f.tell()
+        first_rows = f.readlines(1 << 16)
+        row_bytes = sum(map(len, first_rows)) / len(first_rows) if first_rows else 1
+        data_bytes = total_bytes - data_start
+        if rows * row_bytes >= data_bytes:
+            # The whole file is about the size of the sample.
+            blocks, window, starts = 1, data_bytes, [data_start]
+        else:
+            window = rows / blocks * row_bytes
+            bounds = np.linspace(data_start, total_bytes - window, blocks + 1)
+            starts = rng.uniform(bounds[:-1], bounds[1:]).astype(np.int64).tolist()
+        position = data_start
+        for start in starts:
+            start = max(start, position)
+            end = start + window
+            f.seek(start)
+            if start > data_start:
+                # Move to the first row starting at or after `start`.
+                f.seek(start - 1)
+                f.readline()
+            lines = []
+            while f.tell() < end:
+                line = f.readline()
+                if not line:
+                    break
+                lines.append(line)
+            position = max(f.tell(), int(end))
+            if lines and not lines[-1].endswith(b"\n"):
+                lines[-1] += b"\n"
+            pieces.extend(lines)
+    df = pd.read_csv(io.BytesIO(header + b"".join(pieces)), on_bad_lines="skip")
+    df = normalize_dataframe(df, compact=compact, copy=False)
+    sampled_bytes = window * blocks
+    estimated = int(len(df) * data_bytes / sampled_bytes) if sampled_bytes else 0
+    df.attrs["sample"] = {"rows": len(df), "estimated_rows": max(estimated, len(df)),
+                          "blocks": blocks, "file": file_path}
+    return df
+
+def sample_info(df):
+    """df.attrs["sample"] when df is a preview sample from sample_csv(), else None."""
+    return df.attrs.get("sample") if df is not None else None
 
-def load_json(file_path):
-    with open(file_path, "r") as f:
-        data = json.load(f)
-    df = pd.DataFrame(data["data"])
-    return normalize_dataframe(df)
+JSON_CHUNKSIZE = 50_000
+
+def load_json(file_path, chunksize=JSON_CHUNKSIZE):
+    # Records are decoded incrementally and turned into DataFrame chunks,
+    # so the raw JSON text and list of dicts never exist all at once.
+    chunks = [pd.DataFrame.from_records(records) for records in json_stream.iter_record_chunks(file_path, chunksize)]
+    if not chunks:
+        return normalize_dataframe(pd.DataFrame(), copy=False)
+    df = pd.concat(chunks, ignore_index=True) if len(chunks) > 1 else chunks[0]
+    return normalize_dataframe(df, copy=False)
+
+def load_ndjson(file_path, chunksize=JSON_CHUNKSIZE):
+    chunks = list(pd.read_json(file_path, lines=True, chunksize=chunksize,
+                               convert_dates=False, precise_float=True))
+    if not chunks:
+        return normalize_dataframe(pd.DataFrame(), copy=False)
+    df = pd.concat(chunks, ignore_index=True) if len(chunks) > 1 else chunks[0]
+    return normalize_dataframe(df, copy=False)
 
 def save_csv(df, file_path):
     df.to_csv(file_path, index=True)
     print("CSV saved.")
 
-def save_json(df, file_path):
-    json_data = {
-        "meta": {
-            "source": "Exported from Statistical Analysis App",
-            "columns": df.columns.tolist()
-        },
-        "data": df.to_dict(orient="records")
+def save_json(df, file_path, chunksize=JSON_CHUNKSIZE):
+    meta = {
+        "source": "Exported from Statistical Analysis App",
+        "columns": [str(col) for col in df.columns]
     }
     with open(file_path, "w") as f:
-        json.dump(json_data, f, indent=4)
+        f.write('{\n    "meta": ')
+        f.write(json.dumps(meta, indent=4).replace("\n", "\n    "))
+        f.write(',\n    "data": [')
+        first = True
+        for start in range(0, len(df), chunksize):
+            text = json_stream.records_text(df.iloc[start:start + chunksize])
+            f.write("\n        " if first else ",\n        ")
+            f.write(text.replace("\n", ",\n        "))
+            first = False
+        f.write("\n    ]\n}\n" if not first else "]\n}\n")
     print("JSON saved.")
 
-def normalize_dataframe(df):
-    df = df.copy()
+def save_ndjson(df, file_path, chunksize=JSON_CHUNKSIZE):
+    with open(file_path, "w") as f:
+        for start in range(0, len(df), chunksize):
+            f.write(json_stream.records_text(df.iloc[start:start + chunksize]))
+            f.write("\n")
+    print("NDJSON saved.")
+
+def normalize_dataframe(df, compact=False, copy=True):
+    """
+    Clean column names. Pass copy=False when the caller owns df and it may be changed in place.
+    With compact=True the dtypes are shrunk by compact_dtypes() and the memory used
+    before and after is recorded in df.attrs["memory_usage"].
+    """
+    if copy:
+        df = df.copy()
     df.columns = [col.strip().lower() for col in df.columns]
+    if compact:
+        before = int(df.memory_usage(deep=True).sum())
+        df = compact_dtypes(df)
+        after = int(df.memory_usage(deep=True).sum())
+        df.attrs["memory_usage"] = {"before": before, "after": after}
+    return df
+
+# Year-month-day dates with an optional time and UTC offset. Bare years, fractions such
+# as 1/2 and clock times are left as text: parsing them would invent a day or a year.
+DATE_PATTERN = r"\d{4}-\d{1,2}-\d{1,2}(?:[ T]\d{1,2}:\d{2}(?::\d{2}(?:\.\d+)?)?(?:Z|[+-]\d{2}:?\d{2})?)?"
+
+def _is_iso_dates(series):
+    values = series.dropna().astype(str).str.strip()
+    return not values.empty and bool(values.str.fullmatch(DATE_PATTERN).all())
+
+def _looks_like_dates(series, sample_size=100):
+    # A cheap check on the first values before the whole column is matched.
+    return _is_iso_dates(series.dropna().head(sample_size))
+
+def compact_dtypes(df, category_ratio=0.5):
+    """
+    Convert columns in place to smaller dtypes without losing information:
+    date-like strings -> datetime64, low-cardinality strings -> category,
+    integers and floats -> the smallest type that holds every value exactly.
+    """
+    for col in df.columns:
+        series = df[col]
+        if pd.api.types.is_bool_dtype(series):
+            continue
+        if pd.api.types.is_integer_dtype(series):
+            df[col] = pd.to_numeric(series, downcast="integer")
+        elif pd.api.types.is_float_dtype(series):
+            as_float32 = series.astype(np.float32)
+            if np.array_equal(as_float32.to_numpy(dtype=np.float64), series.to_numpy(), equal_nan=True):
+                df[col] = as_float32
+        elif pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series):
+            if _looks_like_dates(series) and _is_iso_dates(series):
+                with warnings.catch_warnings():
+                    warnings.simplefilter("ignore")
+                    parsed = pd.to_datetime(series.str.strip(), format="ISO8601", errors="coerce")
+                # Only keep the conversion if no value failed to parse (e.g. 2025-13-40).
+                if parsed.isna().sum() == series.isna().sum():
+                    df[col] = parsed
+                    continue
+            if len(series) > 0 and series.nunique() <= category_ratio * len(series):
+                df[col] = series.astype("category")
     return df
 
 def split_tables(df, table_identifier="table"):
+    """
+    Mapping of table id -> sub-table (a partitioned.PartitionedDataset). Sub-tables
+    are gathered when first accessed rather than copied up front.
+    """
+    import partitioned
     if table_identifier in df.columns:
-        return {tid: sub_df.reset_index(drop=True) for tid, sub_df in df.groupby(table_identifier)}
-    return {"default": df.copy()}
+        return partitioned.PartitionedDataset.from_column(df, table_identifier)
+    return partitioned.PartitionedDataset.from_frames({"default": df.copy})
+
+def _partitioned(df):
+    # partitioned.py imports this module, so the class is looked up only once it is loaded.
+    module = sys.modules.get("partitioned")
+    return module is not None and isinstance(df, module.PartitionedDataset)
 
 def describe_data(df):
+    if _partitioned(df):
+        return df.describe()
     return df.describe(include="all")
 
+WIDE_CORRELATION_COLUMNS = 64  # from this many numeric columns the blocked engine is used
+
 def correlation_matrix(df):
-    return df.select_dtypes(include=[np.number]).corr()
+    """
+    Pearson correlation of the numeric columns, cached per DataFrame so the heatmap
+    and statistics views share one matrix. Treat the result as read-only.
+    """
+    def compute():
+        numeric = df.select_dtypes(include=[np.number])
+        if numeric.shape[1] >= WIDE_CORRELATION_COLUMNS:
+            return correlation.corr(numeric)
+        return numeric.corr()
+    return shared_cache.get_or_compute(("correlation_matrix", dataframe_token(df)), compute)
 
-def create_pivot_table(df, index, columns, values, aggfunc='mean'):
+def top_correlations(df, k=20, absolute=True):
+    """The k most strongly correlated pairs of numeric columns (column_a, column_b, r)."""
+    return correlation.top_pairs(correlation_matrix(df), k, absolute)
+
+def create_pivot_table(df, index, columns, values, aggfunc='mean', parallel=None):
+    """
+    parallel=None uses the process pool for large frames, True forces it, False disables it.
+    The parallel path handles a single index/columns/values column.
+    """
+    if _partitioned(df):
+        return df.pivot_table(index, columns, values, aggfunc)
+    single = all(isinstance(name, str) for name in (index, columns, values))
+    if single and _use_parallel(df, parallel):
+        return parallel_agg.pivot_table(df, index, columns, values, aggfunc)
     return pd.pivot_table(df, index=index, columns=columns, values=values, aggfunc=aggfunc)
 
+def group_aggregate(df, group_col, target_col, aggs=("mean", "sum", "max", "min"), parallel=None):
+    """df.groupby(group_col)[target_col].agg(aggs).reset_index(), optionally across processes."""
+    if _partitioned(df):
+        return df.group_aggregate(group_col, target_col, aggs)
+    if _use_parallel(df, parallel):
+        return parallel_agg.group_stats(df, group_col, target_col, aggs)
+    return df.groupby(group_col)[target_col].agg(list(aggs)).reset_index()
+
+def _use_parallel(df, parallel):
+    if parallel is None:
+        return parallel_agg.should_parallelize(len(df))
+    return bool(parallel)
+
+# === DOWNSAMPLING FOR LINE/SCATTER RENDERING ===
+
+def decimate_minmax(x, y, max_points=2000, x_min=None, x_max=None):
+    """
+    Reduce (x, y) to at most max_points by keeping the min and max y of each bucket.
+    x must be sorted ascending. If x_min/x_max are given only that x-range is
+    decimated, so a zoomed view gets full detail from the original data.
+    Returns two numpy arrays in x order.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    if x_min is not None or x_max is not None:
+        lo = 0 if x_min is None else np.searchsorted(x, x_min, side="left")
+        hi = len(x) if x_max is None else np.searchsorted(x, x_max, side="right")
+        # Keep one neighbour on each side so lines run to the edge of the view.
+        lo, hi = max(lo - 1, 0), min(hi + 1, len(x))
+        x, y = x[lo:hi], y[lo:hi]
+    n = len(x)
+    if n <= max_points or max_points < 2:
+        return x, y
+    size = int(np.ceil(n / (max_points // 2)))
+    buckets = int(np.ceil(n / size))
+    padded = np.pad(y, (0, buckets * size - n), mode="edge").reshape(buckets, size)
+    offsets = np.arange(buckets) * size
+    i_min = np.minimum(offsets + padded.argmin(axis=1), n - 1)
+    i_max = np.minimum(offsets + padded.argmax(axis=1), n - 1)
+    idx = np.unique(np.concatenate([i_min, i_max, [0, n - 1]]))
+    return x[idx], y[idx]
+
+# === HISTOGRAM INDEX ===
+
+class HistogramIndex:
+    """
+    A numeric column sorted once, so histograms for any bin count or range are
+    answered by binary search in O(bins * log n) instead of a pass over the data.
+    Counts match np.histogram: bins are half-open except the last, which is closed.
+    """
+    def __init__(self, values):
+        values = np.asarray(values, dtype=float)
+        self.sorted = np.sort(values[~np.isnan(values)])
+
+    def __len__(self):
+        return len(self.sorted)
+
+    def __sizeof__(self):
+        # Lets the cache budget see the sorted array, not just the wrapper object.
+        return object.__sizeof__(self) + self.sorted.nbytes
+
+    @property
+    def min(self):
+        return self.sorted[0] if len(self.sorted) else np.nan
+
+    @property
+    def max(self):
+        return self.sorted[-1] if len(self.sorted) else np.nan
+
+    def histogram(self, bins=10, range=None):
+        if range is None:
+            lo, hi = (self.min, self.max) if len(self.sorted) else (0.0, 1.0)
+        else:
+            lo, hi = float(range[0]), float(range[1])
+        if lo == hi:
+            lo, hi = lo - 0.5, hi + 0.5
+        edges = np.linspace(lo, hi, int(bins) + 1)
+        positions = np.searchsorted(self.sorted, edges, side="left")
+        positions[-1] = np.searchsorted(self.sorted, edges[-1], side="right")
+        return np.diff(positions), edges
+
+    def median(self):
+        n = len(self.sorted)
+        if n == 0:
+            return np.nan
+        mid = n // 2
+        return float(self.sorted[mid]) if n % 2 else float((self.sorted[mid - 1] + self.sorted[mid]) / 2)
+
+def histogram_index(df, column, get_values=None):
+    """
+    Sorted-values index for df[column], built once per DataFrame and column.
+    get_values() can supply the numeric values, e.g. after coercing a text column.
+    """
+    if get_values is None:
+        get_values = lambda: df[column].dropna().to_numpy(dtype=float)
+    key = ("histogram_index", dataframe_token(df), column)
+    return index_cache.get_or_compute(key, lambda: HistogramIndex(get_values()))
+
+# === CATEGORY AGGREGATION FOR PIE CHARTS ===
+
+PIE_AGGREGATIONS = ["sum", "mean", "count", "min", "max"]
+
+def aggregate_categories(df, column, value_column=None, aggfunc="sum", merge_map=None, top_n=None,
+                         other_label="Other"):
+    """
+    Aggregate value_column per category of column (row counts when value_column is None).
+    merge_map ({"new label": ["old", ...]}) combines categories before aggregating, and
+    everything beyond the top_n largest slices is collapsed into other_label.
+    Returns {"labels": [...], "values": [...]} largest first, with other_label last.
+    """
+    if aggfunc not in PIE_AGGREGATIONS:
+        raise ValueError(f"Unsupported aggregation {aggfunc!r}; use one of {PIE_AGGREGATIONS}.")
+    codes, uniques = pd.factorize(df[column])
+    labels = pd.Index(uniques).astype(str)
+    if merge_map:
+        # Point each merged category at its new label's group, then renumber the groups.
+        group_labels = labels.append(pd.Index([str(new) for new in merge_map]))
+        target = np.arange(len(labels))
+        for offset, members in enumerate(merge_map.values()):
+            found = labels.get_indexer([str(member) for member in members])
+            target[found[found >= 0]] = len(labels) + offset
+        used, target = np.unique(target, return_inverse=True)
+        labels = group_labels[used]
+        codes = np.where(codes >= 0, target[np.maximum(codes, 0)], -1)
+    if value_column is None:
+        values = np.ones(len(codes))
+        aggfunc = "sum" if aggfunc in ("sum", "count") else aggfunc
+    else:
+        values = pd.to_numeric(df[value_column], errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+    keep = (codes >= 0) & ~np.isnan(values)
+    # sum/count/min/max per group are enough to compute any supported aggregation,
+    # for single categories and for the combined "Other" slice alike.
+    parts = pd.Series(values[keep]).groupby(codes[keep]).agg(["sum", "count", "min", "max"])
+    group_labels = labels[parts.index.to_numpy()]
+
+    def finish(sums, counts, mins, maxs):
+        if aggfunc == "mean":
+            return sums / counts
+        return {"sum": sums, "count": counts, "min": mins, "max": maxs}[aggfunc]
+
+    result = np.asarray(finish(parts["sum"].to_numpy(), parts["count"].to_numpy(dtype=float),
+                               parts["min"].to_numpy(), parts["max"].to_numpy()), dtype=float)
+    order = np.argsort(-result, kind="stable")
+    out_labels = group_labels[order].tolist()
+    out_values = result[order].tolist()
+    if top_n is not None and len(order) > top_n:
+        tail = parts.iloc[order[top_n:]]
+        other = finish(tail["sum"].sum(), float(tail["count"].sum()), tail["min"].min(), tail["max"].max())
+        out_labels = out_labels[:top_n] + [other_label]
+        out_values = out_values[:top_n] + [float(other)]
+    return {"labels": out_labels, "values": out_values}
+
+# === FILTER ENGINE ===
+
+FILTER_OPERATORS = ["==", "!=", "in", ">", ">=", "<", "<=", "between"]
+
+class CategoryIndex:
+    """
+    Inverted index for a text or categorical column: the rows of each distinct value
+    are stored contiguously, with values in the string order of their labels so that
+    value ranges (e.g. ISO date strings) are contiguous runs as well. Categorical
+    columns are ordered the same way, not by their category order.
+    """
+    def __init__(self, series):
+        codes, uniques = pd.factorize(series)
+        labels = pd.Index(uniques).astype(str)
+        # Relabel the codes so code order is the labels' string order.
+        order = np.argsort(labels.to_numpy(dtype=object), kind="stable")
+        rank = np.empty(len(order), dtype=np.int64)
+        rank[order] = np.arange(len(order))
+        self.labels = labels[order]
+        present = codes >= 0
+        codes = np.where(present, rank[np.maximum(codes, 0)], -1)
+        self.rows = np.flatnonzero(present)[np.argsort(codes[present], kind="stable")]
+        self.offsets = np.concatenate([[0], np.cumsum(np.bincount(codes[present], minlength=len(uniques)))])
+
+    def __sizeof__(self):
+        return self.rows.nbytes + self.offsets.nbytes
+
+    def _code_rows(self, start, stop):
+        return self.rows[self.offsets[start]:self.offsets[stop]]
+
+    def equal_rows(self, values):
+        codes = self.labels.get_indexer([str(v) for v in values])
+        codes = np.unique(codes[codes >= 0])
+        return np.concatenate([self._code_rows(c, c + 1) for c in codes]) if len(codes) else np.empty(0, dtype=np.int64)
+
+    def range_rows(self, low=None, high=None, low_inclusive=True, high_inclusive=True):
+        start = 0 if low is None else self.labels.searchsorted(str(low), "left" if low_inclusive else "right")
+        stop = len(self.labels) if high is None else self.labels.searchsorted(str(high), "right" if high_inclusive else "left")
+        return self._code_rows(start, max(start, stop))
+
+class SortedIndex:
+    """Sorted values of a numeric or datetime column with their row positions; missing values are left out."""
+    def __init__(self, series):
+        self.is_datetime = pd.api.types.is_datetime64_any_dtype(series)
+        self.tz = getattr(series.dt, "tz", None) if self.is_datetime else None
+        if self.is_datetime:
+            if self.tz is not None:
+                series = series.dt.tz_convert("UTC").dt.tz_localize(None)
+            values = series.to_numpy()
+            self.unit = values.dtype  # datetime64 resolution varies, so bounds are converted to it
+            values = values.view("int64")
+            present = ~series.isna().to_numpy()
+        else:
+            values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+            present = ~np.isnan(values)
+        rows = np.flatnonzero(present)
+        order = np.argsort(values[rows], kind="stable")
+        self.values = values[rows][order]
+        self.rows = rows[order]
+
+    def __sizeof__(self):
+        return self.values.nbytes + self.rows.nbytes
+
+    def _key(self, value):
+        if self.is_datetime:
+            stamp = pd.Timestamp(value)
+            if self.tz is not None:
+                stamp = (stamp.tz_localize(self.tz) if stamp.tz is None else stamp).tz_convert("UTC").tz_localize(None)
+            return stamp.to_datetime64().astype(self.unit).view("int64")
+        return float(value)
+
+    def equal_rows(self, values):
+        # Values that parse to the same key (e.g. "9.99" and "9.990") select their rows once.
+        keys = np.unique([self._key(v) for v in values])
+        parts = [self.rows[np.searchsorted(self.values, key, "left"):np.searchsorted(self.values, key, "right")]
+                 for key in keys]
+        return np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+
+    def range_rows(self, low=None, high=None, low_inclusive=True, high_inclusive=True):
+        start = 0 if low is None else np.searchsorted(self.values, self._key(low), "left" if low_inclusive else "right")
+        stop = len(self.values) if high is None else np.searchsorted(self.values, self._key(high), "right" if high_inclusive else "left")
+        return self.rows[start:max(start, stop)]
+
+def column_index(df, column):
+    """The lazily built filter index for a column, cached per DataFrame."""
+    def build():
+        series = df[column]
+        if (pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series)) \
+                or pd.api.types.is_datetime64_any_dtype(series):
+            return SortedIndex(series)
+        return CategoryIndex(series)
+    return index_cache.get_or_compute(("filter_index", dataframe_token(df), column), build)
+
+def condition_rows(df, condition):
+    """Row positions (unsorted) matching one (column, operator, value) condition."""
+    column, op, value = condition
+    index = column_index(df, column)
+    if op in ("==", "!=", "in"):
+        values = value if isinstance(value, (list, tuple)) else [value]
+        rows = index.equal_rows(values)
+        if op == "!=":
+            keep = np.ones(len(df), dtype=bool)
+            keep[rows] = False
+            rows = np.flatnonzero(keep)
+        return rows
+    if op == "between":
+        low, high = value
+        return index.range_rows(low, high)
+    if op in (">", ">="):
+        return index.range_rows(low=value, low_inclusive=op == ">=")
+    if op in ("<", "<="):
+        return index.range_rows(high=value, high_inclusive=op == "<=")
+    raise ValueError(f"Unsupported filter operator {op!r}; use one of {FILTER_OPERATORS}.")
+
+def resolve_filter(df, conditions):
+    """
+    Sorted row positions matching every condition, or None when there are no conditions.
+    Each condition is answered from its column index; the smallest match set is
+    then narrowed by the others, so no column is scanned.
+    """
+    if not conditions:
+        return None
+    matches = sorted((condition_rows(df, condition) for condition in conditions), key=len)
+    rows = np.sort(matches[0])
+    for other in matches[1:]:
+        if not len(rows):
+            break
+        # Each match set lists a row at most once; the result comes back sorted.
+        rows = np.intersect1d(rows, other, assume_unique=True)
+    return rows
+
+class FilteredView:
+    """
+    A filter over a DataFrame. rows holds the matching row positions; the DataFrame
+    itself is never copied. frame(columns) gathers the selected rows of just the
+    columns a computation needs, and the last few gathers are shared by every page.
+    """
+    MAX_FRAMES = 4
+
+    def __init__(self, df, conditions):
+        self.df = df
+        self.conditions = list(conditions)
+        self.rows = resolve_filter(df, self.conditions)
+        self.profile = None  # column_profile of the selected rows, built on demand
+        self._frames = OrderedDict()  # tuple of columns -> gathered DataFrame
+
+    def __len__(self):
+        return len(self.df) if self.rows is None else len(self.rows)
+
+    @property
+    def active(self):
+        return self.rows is not None
+
+    def column(self, name):
+        """The selected rows of one column, gathered without caching."""
+        series = self.df[name]
+        return series if self.rows is None else series.take(self.rows)
+
+    def frame(self, columns=None):
+        """The selected rows of `columns` (every column if None) as a DataFrame."""
+        if self.rows is None:
+            return self.df
+        columns = tuple(dict.fromkeys(columns)) if columns is not None else tuple(self.df.columns)
+        frame = self._frames.get(columns)
+        if frame is None:
+            frame = self.df[list(columns)].take(self.rows)
+            self._frames[columns] = frame
+            if len(self._frames) > self.MAX_FRAMES:
+                self._frames.popitem(last=False)
+        self._frames.move_to_end(columns)
+        return frame
+
+    def describe(self):
+        return " and ".join(f"{column} {op} {value}" for column, op, value in self.conditions)
+
+# === APPROXIMATE STATISTICS ===
+
+def quantile_sketch(df, column):
+    """sketches.QuantileSketch of a numeric column, built once per DataFrame and column."""
+    def build():
+        return sketches.QuantileSketch().update(df[column].to_numpy(dtype=float, na_value=np.nan))
+    return index_cache.get_or_compute(("quantile_sketch", dataframe_token(df), column), build)
+
+def moment_sketch(df, column):
+    """sketches.MomentSketch of a numeric column, built once per DataFrame and column."""
+    def build():
+        return sketches.MomentSketch().update(df[column].to_numpy(dtype=float, na_value=np.nan))
+    return index_cache.get_or_compute(("moment_sketch", dataframe_token(df), column), build)
+
+def category_sketch(df, column):
+    """(HyperLogLog, FrequentItems) of a column, filled in one value_counts pass per chunk."""
+    def build():
+        distinct, frequent = sketches.HyperLogLog(), sketches.FrequentItems()
+        for chunk in sketches.iter_chunks(df[column]):
+            counts = chunk.value_counts(sort=False)
+            distinct.update_distinct(counts.index[counts.to_numpy() > 0])
+            frequent.update_counts(counts, int(counts.sum()))
+        return distinct, frequent
+    return index_cache.get_or_compute(("category_sketch", dataframe_token(df), column), build)
+
+# === RESULT CACHING FOR GRAPH CLASSES ===
+
+def _shallow_copy(value):
+    # Each caller gets its own container, so changing a returned dict, list or
+    # DataFrame does not change what later cache hits return.
+    if isinstance(value, (dict, list)):
+        return value.copy()
+    if isinstance(value, (pd.Series, pd.DataFrame)):
+        return value.copy(deep=False)
+    return value
+
+def cached_graph_method(method):
+    """
+    Memoize a graph's prepare_data/get_statistics in the shared LRU cache.
+    The key is the dataframe token plus the graph's cache_key_params(), so a new
+    DataFrame or changed parameters (bins, range, merge map...) compute afresh.
+    """
+    @functools.wraps(method)
+    def wrapper(self):
+        key = (f"{type(self).__name__}.{method.__name__}", dataframe_token(self.df)) + self.cache_key_params()
+        result = _shallow_copy(shared_cache.get_or_compute(key, lambda: method(self)))
+        if method.__name__ == "prepare_data":
+            self.data = result
+        return result
+    return wrapper
+
 # === BASE GRAPH CLASS WITH AXIS CUSTOMIZATION ===
 
 class BaseGraph:
@@ -62,10 +681,19 @@ class BaseGraph:
         self.y_label = None
         self.x_range = None  # Tuple (min, max)
         self.y_range = None
+        # Graphs that support it answer from sketches, with error bounds, when True.
+        self.approximate = False
 
     def prepare_data(self):
         raise NotImplementedError("Subclasses must implement prepare_data.")
 
+    def cache_key_params(self):
+        """Parameters that change the result of prepare_data/get_statistics."""
+        return (self.column, self.approximate)
+
+    def set_approximate(self, approximate=True):
+        self.approximate = approximate
+
     def set_x_label(self, label):
         self.x_label = label
 
@@ -95,6 +723,7 @@ class BaseGraph:
 # === GRAPH CLASSES ===
 
 class BarChartGraph(BaseGraph):
+    @cached_graph_method
     def prepare_data(self):
         counts = self.df[self.column].value_counts()
         self.data = {"categories": list(map(str, counts.index)),
@@ -107,36 +736,56 @@ class BarChartGraph(BaseGraph):
                     "y": {"min": 0, "max": max(self.data["counts"])}}
         return None
 
+    @cached_graph_method
     def get_statistics(self):
         # Frequency distribution summary: mode and number of unique items.
+        if self.approximate:
+            # unique is within unique_error (relative); the mode's true count is
+            # between mode_count and mode_count + mode_count_error.
+            distinct, frequent = category_sketch(self.df, self.column)
+            items, count, _ = frequent.mode()
+            return {
+                "unique": int(round(distinct.estimate())),
+                "unique_error": distinct.relative_error(),
+                "mode": items,
+                "mode_count": count,
+                "mode_count_error": frequent.error
+            }
         col_data = self.df[self.column].dropna()
+        mode = col_data.mode()
         return {
             "unique": col_data.nunique(),
-            "mode": col_data.mode().tolist() if not col_data.mode().empty else None
+            "mode": mode.tolist() if not mode.empty else None
         }
 
 class PieChartGraph(BaseGraph):
-    def __init__(self, df, column):
+    def __init__(self, df, column, value_column=None, aggfunc="sum", top_n=None):
         super().__init__(df, column)
         self.merge_map = None  # Example: { "vegetable": ["carrot", "potato"] }
+        self.value_column = value_column  # None counts rows per category
+        self.aggfunc = aggfunc
+        self.top_n = top_n  # slices beyond the top_n largest are combined into "Other"
 
     def set_merge_map(self, merge_map):
         self.merge_map = merge_map
 
-    def prepare_data(self):
-        counts = self.df[self.column].value_counts()
-        data = {"labels": list(map(str, counts.index)),
-                "values": counts.values.tolist()}
+    def set_aggregation(self, value_column, aggfunc="sum"):
+        self.value_column = value_column
+        self.aggfunc = aggfunc
+
+    def set_top_n(self, top_n):
+        self.top_n = top_n
+
+    def cache_key_params(self):
+        merge_key = None
         if self.merge_map:
-            merged = {}
-            for label, value in zip(data["labels"], data["values"]):
-                merged[label] = merged.get(label, 0) + value
-            for new_label, group in self.merge_map.items():
-                merged_value = sum(merged.pop(lbl, 0) for lbl in group)
-                if merged_value > 0:
-                    merged[new_label] = merged_value
-            data = {"labels": list(merged.keys()), "values": list(merged.values())}
-        self.data = data
+            merge_key = tuple((label, tuple(group)) for label, group in self.merge_map.items())
+        return super().cache_key_params() + (merge_key, self.value_column, self.aggfunc, self.top_n)
+
+    @cached_graph_method
+    def prepare_data(self):
+        self.data = aggregate_categories(self.df, self.column, self.value_column, self.aggfunc,
+                                         self.merge_map, self.top_n)
         return self.data
 
     def get_statistics(self):
@@ -161,12 +810,16 @@ class HistogramGraph(BaseGraph):
         self.range_min = range_min
         self.range_max = range_max
 
+    def cache_key_params(self):
+        return super().cache_key_params() + (self.bins, self.range_min, self.range_max)
+
+    @cached_graph_method
     def prepare_data(self):
-        values = self.df[self.column].dropna().values
         hrange = None
         if self.range_min is not None and self.range_max is not None:
             hrange = (self.range_min, self.range_max)
-        counts, bin_edges = np.histogram(values, bins=self.bins, range=hrange)
+        # Re-binning reads the cached sorted column instead of rescanning it.
+        counts, bin_edges = histogram_index(self.df, self.column).histogram(self.bins, hrange)
         bins_labels = [f"{bin_edges[i]:.1f}-{bin_edges[i+1]:.1f}" for i in range(len(bin_edges)-1)]
         self.data = {"bins": bins_labels, "counts": counts.tolist()}
         return self.data
@@ -184,16 +837,21 @@ class HistogramGraph(BaseGraph):
                     "y": {"min": 0, "max": max(self.data["counts"])}}        
         return None
 
+    @cached_graph_method
     def get_statistics(self):
+        if self.approximate:
+            # Mean, std and skew come from mergeable moment sums (exact up to rounding); the
+            # median is within median_rank_error (a fraction of the rows) of the true rank.
+            moments = moment_sketch(self.df, self.column)
+            sketch = quantile_sketch(self.df, self.column)
+            return {"mean": moments.mean if moments.n else np.nan, "median": sketch.quantile(0.5),
+                    "median_rank_error": sketch.rank_error(), "std": moments.std(), "skew": moments.skew()}
         col = self.df[self.column].dropna()
-        return {
-            "mean": col.mean(),
-            "median": col.median(),
-            "std": col.std(),
-            "skew": col.skew()
-        }
+        return {"mean": col.mean(), "median": histogram_index(self.df, self.column).median(),
+                "std": col.std(), "skew": col.skew()}
 
 class LineChartGraph(BaseGraph):
+    @cached_graph_method
     def prepare_data(self):
         self.data = {"x": list(range(len(self.df[self.column]))),
                      "y": self.df[self.column].tolist()}
@@ -205,12 +863,14 @@ class LineChartGraph(BaseGraph):
                     "y": {"min": min(self.data["y"]), "max": max(self.data["y"])}}
         return None
 
+    @cached_graph_method
     def get_statistics(self):
         y_series = self.df[self.column].dropna()
-        reg = stats.linregress(range(len(y_series)), y_series)
+        reg = linregress(range(len(y_series)), y_series)
         return {"slope": reg.slope, "intercept": reg.intercept, "r_value": reg.rvalue}
 
 class ScatterChartGraph(BaseGraph):
+    @cached_graph_method
     def prepare_data(self):
         self.data = {"x": list(range(len(self.df[self.column]))),
                      "y": self.df[self.column].tolist()}
@@ -222,24 +882,38 @@ class ScatterChartGraph(BaseGraph):
                     "y": {"min": min(self.data["y"]), "max": max(self.data["y"])}}
         return None
 
+    @cached_graph_method
     def get_statistics(self):
         y_series = self.df[self.column].dropna()
         if len(y_series) > 1:
-            reg = stats.linregress(range(len(y_series)), y_series)
+            reg = linregress(range(len(y_series)), y_series)
             return {"slope": reg.slope, "r_value": reg.rvalue}
         return {}
 
 class BoxPlotGraph(BaseGraph):
+    @cached_graph_method
     def prepare_data(self):
+        if self.approximate:
+            sketch = quantile_sketch(self.df, self.column)
+            if sketch.n == 0:
+                self.data = {}
+            else:
+                q1, median, q3 = sketch.quantile([0.25, 0.5, 0.75])
+                # Quartiles are within rank_error (a fraction of the rows) of their true rank.
+                self.data = {"min": float(sketch.min), "q1": q1, "median": median, "q3": q3,
+                             "max": float(sketch.max), "rank_error": sketch.rank_error()}
+            return self.data
         values = self.df[self.column].dropna().values
         if len(values) == 0:
             self.data = {}
         else:
+            # One selection pass for all three quartiles.
+            q1, median, q3 = np.percentile(values, [25, 50, 75])
             self.data = {
                 "min": float(np.min(values)),
-                "q1": float(np.percentile(values, 25)),
-                "median": float(np.median(values)),
-                "q3": float(np.percentile(values, 75)),
+                "q1": float(q1),
+                "median": float(median),
+                "q3": float(q3),
                 "max": float(np.max(values))
             }
         return self.data
@@ -248,6 +922,7 @@ class BoxPlotGraph(BaseGraph):
         return self.data
 
 class AreaChartGraph(BaseGraph):
+    @cached_graph_method
     def prepare_data(self):
         x_vals = list(range(len(self.df[self.column])))
         self.data = {"x": x_vals,
@@ -261,6 +936,7 @@ class AreaChartGraph(BaseGraph):
                     "y": {"min": min(self.data["y"]), "max": max(self.data["y"])}}
         return None
 
+    @cached_graph_method
     def get_statistics(self):
         y_series = self.df[self.column].dropna()
         return {"area": np.trapz(y_series, dx=1)}
@@ -282,6 +958,9 @@ class BubbleChartGraph:
     def set_size_scale(self, scale):
         self.size_scale = scale
 
+    def cache_key_params(self):
+        return (self.x_column, self.y_column, self.size_column, self.size_scale)
+
     def set_x_label(self, label):
         self.x_label = label
 
@@ -294,6 +973,7 @@ class BubbleChartGraph:
     def set_y_range(self, min_val, max_val):
         self.y_range = (min_val, max_val)
 
+    @cached_graph_method
     def prepare_data(self):
         x = self.df[self.x_column].tolist()
         y = self.df[self.y_column].tolist()
@@ -307,12 +987,13 @@ class BubbleChartGraph:
                     "y": {"min": min(self.data["y"]), "max": max(self.data["y"])}}
         return None
 
+    @cached_graph_method
     def get_statistics(self):
         # Simple correlation as an example.
         x_series = self.df[self.x_column].dropna()
         y_series = self.df[self.y_column].dropna()
         if len(x_series) > 1 and len(y_series) > 1:
-            reg = stats.linregress(x_series, y_series)
+            reg = linregress(x_series, y_series)
             return {"slope": reg.slope, "r_value": reg.rvalue}
         return {}
 
@@ -347,7 +1028,10 @@ class AxisNormalizer:
 # === ADVANCED STATISTICAL FUNCTIONS ===
 
 def perform_regression(x, y):
-    return stats.linregress(x, y)
+    return linregress(x, y)
 
 def compute_heatmap_data(df):
-    return correlation_matrix(df)
\ No newline at end of file
+    return correlation_matrix(df)
+
+# Public functions and graph methods are timed while profiling is switched on.
+profiler.register_module(sys.modules[__name__])
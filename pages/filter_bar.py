@@ -0,0 +1,102 @@
+from PySide6.QtWidgets import (
+    QWidget, QHBoxLayout, QLabel, QComboBox, QLineEdit, QPushButton, QApplication, QMessageBox
+)
+from PySide6.QtCore import Qt
+
+# Same list as logic.FILTER_OPERATORS; repeated so the bar can be built before logic is imported.
+OPERATORS = ["==", "!=", "in", ">", ">=", "<", "<=", "between"]
+
+class FilterBar(QWidget):
+    """
+    Row filter shared by the Statistics, Graphs and Table pages.
+    Conditions are combined with "and"; "in" takes comma-separated values and
+    "between" takes "low, high" (both inclusive).
+    """
+    def __init__(self, window, parent=None):
+        super().__init__(parent)
+        self.window = window
+        self.conditions = []
+        self.init_ui()
+        window.store.changed.connect(self.on_data_changed)
+
+    def init_ui(self):
+        self.setStyleSheet("""
+            QWidget { background-color: #000000; color: #00FF00; font-family: Consolas, monospace; }
+            QComboBox, QLineEdit { border: 1px solid #00FF00; padding: 2px; }
+            QPushButton { border: 1px solid #00FF00; padding: 2px 10px; }
+            QPushButton:hover { background-color: #005500; }
+        """)
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(8, 2, 8, 2)
+        layout.addWidget(QLabel("Filter:"))
+        self.combo_column = QComboBox()
+        self.combo_column.setMinimumWidth(120)
+        layout.addWidget(self.combo_column)
+        self.combo_op = QComboBox()
+        self.combo_op.addItems(OPERATORS)
+        layout.addWidget(self.combo_op)
+        self.edit_value = QLineEdit()
+        self.edit_value.setPlaceholderText("value  (in: a, b, c   between: low, high)")
+        self.edit_value.returnPressed.connect(self.add_condition)
+        layout.addWidget(self.edit_value, 1)
+        self.btn_add = QPushButton("Add")
+        self.btn_add.clicked.connect(self.add_condition)
+        layout.addWidget(self.btn_add)
+        self.btn_clear = QPushButton("Clear")
+        self.btn_clear.clicked.connect(self.clear)
+        layout.addWidget(self.btn_clear)
+        self.status = QLabel("")
+        layout.addWidget(self.status, 2)
+        self.setEnabled(False)
+
+    def on_data_changed(self, change):
+        store = self.window.store
+        if change.kind == "file":
+            self.set_columns(list(store.df.columns) if store.df is not None else [])
+        # The store may keep or drop the filter (e.g. when rows are appended), so show what it holds.
+        view = store.data_filter
+        self.conditions = list(view.conditions) if view is not None else []
+        if view is None:
+            self.status.setText("")
+        else:
+            self.status.setText(f"{view.describe()}  ({len(view):,} of {len(view.df):,} rows)")
+
+    def set_columns(self, columns):
+        self.combo_column.clear()
+        self.combo_column.addItems([str(col) for col in columns])
+        self.setEnabled(bool(columns))
+
+    def parse_value(self, op, text):
+        parts = [part.strip() for part in text.split(",")]
+        if op == "in":
+            return [part for part in parts if part]
+        if op == "between":
+            if len(parts) != 2:
+                raise ValueError("between needs two values: low, high")
+            return tuple(parts)
+        return text.strip()
+
+    def add_condition(self):
+        column = self.combo_column.currentText()
+        op = self.combo_op.currentText()
+        if not column or not self.edit_value.text().strip():
+            return
+        try:
+            condition = (column, op, self.parse_value(op, self.edit_value.text()))
+            self.apply(self.conditions + [condition])
+        except Exception as e:
+            QMessageBox.warning(self, "Invalid Filter", str(e))
+            return
+        self.edit_value.clear()
+
+    def clear(self):
+        self.apply([])
+
+    def apply(self, conditions):
+        # Building a column's index can take a moment on large files the first time.
+        QApplication.setOverrideCursor(Qt.WaitCursor)
+        try:
+            # The status and self.conditions follow through on_data_changed.
+            self.window.set_filter(conditions)
+        finally:
+            QApplication.restoreOverrideCursor()
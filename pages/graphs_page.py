@@ -2,45 +2,95 @@ import numpy as np
 import pandas as pd
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QFormLayout, QComboBox, QPushButton, 
-    QHBoxLayout, QLabel
+    QHBoxLayout, QLabel, QSpinBox
 )
 from PySide6.QtCharts import (
     QChart, QChartView, QBarSeries, QBarSet, QBarCategoryAxis, 
     QLineSeries, QScatterSeries, QPieSeries, QValueAxis
 )
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QPointF
 from PySide6.QtGui import QPainter
+import logic
+import profiler
+import column_profile
+from result_cache import shared_cache, dataframe_token
 
-def get_bar_data(df, column):
-    counts = df[column].value_counts()
-    return {"categories": list(map(str, counts.index)), "counts": counts.values.tolist()}
+# Above this many points, line/scatter data is decimated before drawing.
+MAX_RENDER_POINTS = 2000
+# Charts with more bars, slices or points than this are updated without animation.
+ANIMATION_MAX_POINTS = 500
+PIE_ROW_COUNT = "(row count)"  # value column choice that counts rows per category
+STATISTICS_MODES = ["Off", "Exact", "Approximate"]
+
+def format_statistics(stats):
+    """One line of graph statistics; approximate values show their error bound."""
+    parts = []
+    if "unique" in stats:
+        if "unique_error" in stats:
+            parts.append(f"Unique: ≈{stats['unique']:,} (±{stats['unique_error']:.1%})")
+        else:
+            parts.append(f"Unique: {stats['unique']:,}")
+    if stats.get("mode"):
+        mode = ", ".join(map(str, stats["mode"][:3]))
+        if "mode_count" in stats:
+            error = stats["mode_count_error"]
+            count = f"{stats['mode_count']:,}" if not error else f"{stats['mode_count']:,} to {stats['mode_count'] + error:,}"
+            mode += f" ({count} rows)"
+        parts.append(f"Mode: {mode}")
+    for key in ("mean", "median", "std", "skew"):
+        if key in stats:
+            text = f"{key.capitalize()}: {stats[key]:.4g}"
+            if key == "median" and "median_rank_error" in stats:
+                text = f"Median: ≈{stats['median']:.4g} (rank ±{stats['median_rank_error']:.2%})"
+            parts.append(text)
+    return "   ".join(parts)
 
-def get_pie_data(df, column):
-    counts = df[column].value_counts()
-    return {"labels": list(map(str, counts.index)), "values": counts.values.tolist()}
+def get_numeric_values(df, column, profile=None):
+    """Numeric values of a column, skipping the coercion pass when the profile already knows the answer."""
+    col = profile.columns.get(column) if profile is not None else None
+    if col is not None and col.is_numeric:
+        return df[column].dropna().to_numpy(dtype=float)
+    if col is not None and not col.numeric_coercible:
+        return np.empty(0)
+    return pd.to_numeric(df[column].dropna(), errors='coerce').dropna().to_numpy(dtype=float)
+
+def get_bar_data(df, column, profile=None):
+    col = profile.columns.get(column) if profile is not None else None
+    if col is not None and col.value_counts is not None:
+        counts = col.value_counts
+    else:
+        counts = df[column].value_counts()
+    return {"categories": list(map(str, counts.index)), "counts": counts.values.tolist()}
 
-def get_histogram_data(df, column, bins=10):
-    # Convert to numeric (drop non-numeric)
-    numeric_series = pd.to_numeric(df[column].dropna(), errors='coerce').dropna()
-    values = numeric_series.values
-    if values.size == 0:
+def get_histogram_data(df, column, bins=10, profile=None):
+    # Convert to numeric (drop non-numeric) once; the sorted index is reused for every bin count.
+    index = logic.histogram_index(df, column, lambda: get_numeric_values(df, column, profile))
+    if len(index) == 0:
         return {"bins": [], "counts": []}
-    counts, bin_edges = np.histogram(values, bins=bins)
+    counts, bin_edges = index.histogram(bins)
     labels = [f"{bin_edges[i]:.1f}-{bin_edges[i+1]:.1f}" for i in range(len(bin_edges)-1)]
     return {"bins": labels, "counts": counts.tolist()}
 
-def get_line_data(df, column):
-    numeric_series = pd.to_numeric(df[column].dropna(), errors='coerce').dropna().tolist()
-    return {"x": list(range(len(numeric_series))), "y": numeric_series}
+def get_line_data(df, column, profile=None):
+    # Returned as numpy arrays so large columns can be decimated without Python lists.
+    y = get_numeric_values(df, column, profile)
+    return {"x": np.arange(len(y), dtype=float), "y": y}
 
-def get_scatter_data(df, column):
-    numeric_series = pd.to_numeric(df[column].dropna(), errors='coerce').dropna().tolist()
-    return {"x": list(range(len(numeric_series))), "y": numeric_series}
+def get_scatter_data(df, column, profile=None):
+    y = get_numeric_values(df, column, profile)
+    return {"x": np.arange(len(y), dtype=float), "y": y}
 
 class GraphsPage(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.parent = parent
+        # Full-resolution data behind the current Line/Scatter chart, used to re-decimate on zoom.
+        self.xy_series = None
+        self.xy_data = None
+        self.pool = {}  # graph type -> {"series": ..., "axes": [(axis, alignment), ...]}
+        self.shown_type = None  # graph type whose series and axes are on the chart
+        self.shown_graph = None  # graph type last generated, even if it had no data
+        self.shown_version = None  # DataStore version the columns and chart were built from
         self.init_ui()
         # Connect graph type change to update axis controls.
         self.combo_graph_type.currentIndexChanged.connect(self.update_axis_controls)
@@ -78,6 +128,31 @@ class GraphsPage(QWidget):
         self.label_column_y = QLabel("Y-Axis Column:")
         self.form_layout.addRow(self.label_column_y, self.combo_column_y)
 
+        # Histogram bin count; changes redraw immediately from the cached sorted column.
+        self.spin_bins = QSpinBox()
+        self.spin_bins.setRange(1, 500)
+        self.spin_bins.setValue(10)
+        self.label_bins = QLabel("Bins:")
+        self.form_layout.addRow(self.label_bins, self.spin_bins)
+        self.spin_bins.valueChanged.connect(self.on_bins_changed)
+
+        # Pie aggregation and how many slices to keep before the rest become "Other".
+        self.combo_pie_agg = QComboBox()
+        self.combo_pie_agg.addItems(logic.PIE_AGGREGATIONS)
+        self.label_pie_agg = QLabel("Aggregation:")
+        self.form_layout.addRow(self.label_pie_agg, self.combo_pie_agg)
+        self.spin_top_n = QSpinBox()
+        self.spin_top_n.setRange(1, 100)
+        self.spin_top_n.setValue(10)
+        self.label_top_n = QLabel("Top Slices:")
+        self.form_layout.addRow(self.label_top_n, self.spin_top_n)
+
+        # Column statistics under Bar and Histogram charts; Approximate uses sketches with error bounds.
+        self.combo_statistics = QComboBox()
+        self.combo_statistics.addItems(STATISTICS_MODES)
+        self.label_statistics = QLabel("Statistics:")
+        self.form_layout.addRow(self.label_statistics, self.combo_statistics)
+
         layout.addLayout(self.form_layout)
 
         btn_layout = QHBoxLayout()
@@ -86,10 +161,14 @@ class GraphsPage(QWidget):
         btn_layout.addWidget(self.btn_generate)
         layout.addLayout(btn_layout)
 
-        self.chart_container = QWidget()
-        self.chart_layout = QVBoxLayout()
-        self.chart_container.setLayout(self.chart_layout)
-        layout.addWidget(self.chart_container)
+        # One chart and view for the page's lifetime; see graph_objects().
+        self.chart = QChart()
+        self.chart_view = QChartView(self.chart)
+        self.chart_view.setRenderHint(QPainter.Antialiasing)
+        layout.addWidget(self.chart_view)
+        self.stats_label = QLabel("")
+        self.stats_label.setWordWrap(True)
+        layout.addWidget(self.stats_label)
 
         self.setLayout(layout)
         # Initially update axis controls based on the default graph type.
@@ -102,7 +181,18 @@ class GraphsPage(QWidget):
         For Line Chart and Scatter Chart, show both column selections.
         """
         graph_type = self.combo_graph_type.currentText()
-        if graph_type in ["Bar Chart", "Histogram", "Pie Chart"]:
+        self.label_bins.setVisible(graph_type == "Histogram")
+        self.spin_bins.setVisible(graph_type == "Histogram")
+        for widget in (self.label_pie_agg, self.combo_pie_agg, self.label_top_n, self.spin_top_n):
+            widget.setVisible(graph_type == "Pie Chart")
+        for widget in (self.label_statistics, self.combo_statistics):
+            widget.setVisible(graph_type in ["Bar Chart", "Histogram"])
+        if graph_type == "Pie Chart":
+            self.label_column_x.setText("Category:")
+            self.label_column_y.setText("Value Column:")
+            self.label_column_y.show()
+            self.combo_column_y.show()
+        elif graph_type in ["Bar Chart", "Histogram"]:
             # Hide Y-Axis column controls
             self.label_column_y.hide()
             self.combo_column_y.hide()
@@ -111,46 +201,129 @@ class GraphsPage(QWidget):
                 self.label_column_x.setText("Category:")
             elif graph_type == "Histogram":
                 self.label_column_x.setText("Numeric Column:")
-            elif graph_type == "Pie Chart":
-                self.label_column_x.setText("Category:")
         else:
             # Show both controls for graphs requiring two axes.
+            self.label_column_y.setText("Y-Axis Column:")
             self.label_column_y.show()
             self.combo_column_y.show()
             self.label_column_x.setText("X-Axis Column:")
+        self.update_columns()
+
+    def refresh_data(self):
+        """Offer the new data's columns and redraw the graph on screen from it."""
+        self.shown_version = self.parent.store.version
+        self.update_columns()
+        if self.shown_graph is not None and self.parent.df is not None:
+            self.generate_graph()
 
     def update_columns(self):
-        if self.parent.df is not None:
-            cols = list(self.parent.df.columns)
-            self.combo_column_x.clear()
-            self.combo_column_y.clear()
-            self.combo_column_x.addItems(cols)
-            self.combo_column_y.addItems(cols)
-
-    def clear_chart_view(self):
-        if self.chart_container.layout().count() > 0:
-            old_widget = self.chart_container.layout().itemAt(0).widget()
-            if old_widget:
-                self.chart_container.layout().removeWidget(old_widget)
-                old_widget.deleteLater()
+        # Only offer columns that suit the graph type, using the shared column profile.
+        profile = column_profile.ensure_profile(self.parent)
+        if profile is None:
+            return
+        graph_type = self.combo_graph_type.currentText()
+        y_cols = profile.numeric_columns()
+        if graph_type == "Histogram":
+            x_cols = profile.numeric_columns()
+        elif graph_type == "Bar Chart":
+            x_cols = profile.category_columns()
+        elif graph_type == "Pie Chart":
+            # Any column works: slices beyond the top N are combined into "Other".
+            x_cols = profile.column_names()
+            y_cols = [PIE_ROW_COUNT] + y_cols
+        else:
+            x_cols = profile.column_names()
+        self.set_combo_items(self.combo_column_x, x_cols)
+        self.set_combo_items(self.combo_column_y, y_cols)
+
+    def set_combo_items(self, combo, items):
+        current = combo.currentText()
+        combo.clear()
+        combo.addItems(items)
+        if current in items:
+            combo.setCurrentText(current)
 
+    def graph_objects(self, graph_type):
+        """The series and axes for graph_type, created on first use and reused afterwards."""
+        if graph_type not in self.pool:
+            objects = {}
+            if graph_type in ["Bar Chart", "Histogram"]:
+                objects["bar_set"] = QBarSet("Count" if graph_type == "Bar Chart" else "Frequency")
+                objects["series"] = QBarSeries()
+                objects["series"].append(objects["bar_set"])
+                objects["axes"] = [(QBarCategoryAxis(), Qt.AlignBottom), (QValueAxis(), Qt.AlignLeft)]
+            elif graph_type == "Pie Chart":
+                objects["series"] = QPieSeries()
+                objects["axes"] = []
+            else:
+                objects["series"] = QLineSeries() if graph_type == "Line Chart" else QScatterSeries()
+                objects["axes"] = [(QValueAxis(), Qt.AlignBottom), (QValueAxis(), Qt.AlignLeft)]
+                # Zooming re-decimates the visible x-range.
+                objects["axes"][0][0].rangeChanged.connect(self.set_xy_points)
+            self.pool[graph_type] = objects
+        return self.pool[graph_type]
+
+    def show_graph_objects(self, graph_type):
+        """Put graph_type's series and axes on the chart (None shows an empty chart)."""
+        if graph_type == self.shown_type:
+            return
+        if self.shown_type is not None:
+            objects = self.pool[self.shown_type]
+            self.chart.removeSeries(objects["series"])
+            for axis, _ in objects["axes"]:
+                self.chart.removeAxis(axis)
+        self.shown_type = graph_type
+        if graph_type is None:
+            return
+        objects = self.graph_objects(graph_type)
+        self.chart.addSeries(objects["series"])
+        for axis, alignment in objects["axes"]:
+            self.chart.addAxis(axis, alignment)
+            objects["series"].attachAxis(axis)
+        self.chart.legend().setAlignment(Qt.AlignBottom if graph_type == "Pie Chart" else Qt.AlignTop)
+        is_xy = graph_type in ["Line Chart", "Scatter Chart"]
+        # Drag to zoom into an x-range; right-click zooms back out.
+        self.chart_view.setRubberBand(QChartView.HorizontalRubberBand if is_xy else QChartView.NoRubberBand)
+
+    def set_animated(self, points):
+        # Animating thousands of points costs more than it shows.
+        self.chart.setAnimationOptions(QChart.SeriesAnimations if points <= ANIMATION_MAX_POINTS
+                                       else QChart.NoAnimation)
+
+    def set_bar_data(self, graph_type, categories, counts):
+        objects = self.graph_objects(graph_type)
+        self.set_animated(len(counts))
+        bar_set = objects["bar_set"]
+        bar_set.remove(0, bar_set.count())
+        bar_set.append(counts)
+        axis_x, axis_y = objects["axes"][0][0], objects["axes"][1][0]
+        axis_x.setCategories(categories)
+        if counts:
+            axis_y.setRange(0, max(counts) * 1.1)
+        self.show_graph_objects(graph_type)
+
+    @profiler.traced("GraphsPage.generate_graph")
     def generate_graph(self):
         if self.parent.df is None:
             return
-        self.clear_chart_view()
         graph_type = self.combo_graph_type.currentText()
         # For one-axis graphs, use combo_column_x only.
         # For two-axis graphs, use both.
-        if graph_type in ["Bar Chart", "Histogram", "Pie Chart"]:
+        if graph_type in ["Bar Chart", "Histogram"]:
             x_col = self.combo_column_x.currentText()
             y_col = None
         else:
             x_col = self.combo_column_x.currentText()
             y_col = self.combo_column_y.currentText()
-        df = self.parent.df
+        # The active filter's rows (of the columns drawn), or the whole DataFrame.
+        df = column_profile.active_frame(self.parent, [col for col in (x_col, y_col) if col and col != PIE_ROW_COUNT])
+        profile = column_profile.ensure_profile(self.parent)
+        profiler.annotate(graph=graph_type, rows=len(df))
 
-        chart = QChart()
-        chart.setAnimationOptions(QChart.SeriesAnimations)
+        # The chart, series and axes are reused; only their data and ranges change.
+        chart = self.chart
+        self.xy_data = None
+        chart.zoomReset()
         # Set chart title depending on the selected graph and axes.
         if y_col:
             chart.setTitle(f"{graph_type} ({x_col} vs {y_col})")
@@ -158,75 +331,92 @@ class GraphsPage(QWidget):
             chart.setTitle(f"{graph_type} ({x_col})")
 
         if graph_type == "Bar Chart":
-            data = get_bar_data(df, x_col)
+            data = self.cached_data("bar", df, x_col, lambda df, col: get_bar_data(df, col, profile))
             # In a bar chart, the chosen column is used for category,
             # and we use a default value for the bars. Here, we simply use the counts.
-            bar_set = QBarSet("Count")
-            bar_set.append(data["counts"])
-            series = QBarSeries()
-            series.append(bar_set)
-            chart.addSeries(series)
-            axis_x = QBarCategoryAxis()
-            axis_x.append(data["categories"])
-            chart.addAxis(axis_x, Qt.AlignBottom)
-            series.attachAxis(axis_x)
-            axis_y = QValueAxis()
-            if data["counts"]:
-                axis_y.setRange(0, max(data["counts"]) * 1.1)
-            chart.addAxis(axis_y, Qt.AlignLeft)
-            series.attachAxis(axis_y)
+            self.set_bar_data(graph_type, data["categories"], data["counts"])
 
         elif graph_type == "Histogram":
-            data = get_histogram_data(df, x_col, bins=10)
+            data = get_histogram_data(df, x_col, bins=self.spin_bins.value(), profile=profile)
             if not data["bins"]:
                 chart.setTitle(f"Histogram for {x_col} - No Numeric Data Found")
+                self.show_graph_objects(None)
             else:
-                bar_set = QBarSet("Frequency")
-                bar_set.append(data["counts"])
-                series = QBarSeries()
-                series.append(bar_set)
-                chart.addSeries(series)
-                axis_x = QBarCategoryAxis()
-                axis_x.append(data["bins"])
-                chart.addAxis(axis_x, Qt.AlignBottom)
-                series.attachAxis(axis_x)
-                axis_y = QValueAxis()
-                axis_y.setRange(0, max(data["counts"]) * 1.1)
-                chart.addAxis(axis_y, Qt.AlignLeft)
-                series.attachAxis(axis_y)
+                self.set_bar_data(graph_type, data["bins"], data["counts"])
 
         elif graph_type == "Pie Chart":
-            grouped = df.groupby(x_col).sum().reset_index()  # For simplicity, summing all numeric columns.
-            # Use x_col as category and use the sum for the first numeric column found.
-            numeric_cols = [col for col in grouped.columns if pd.api.types.is_numeric_dtype(grouped[col]) and col != x_col]
-            if not numeric_cols:
-                chart.setTitle(f"Pie Chart for {x_col} - No Numeric Data Found")
+            value_col = None if y_col == PIE_ROW_COUNT else y_col
+            aggfunc = self.combo_pie_agg.currentText() if value_col else "count"
+            graph = logic.PieChartGraph(df, x_col, value_col, aggfunc, top_n=self.spin_top_n.value())
+            data = graph.prepare_data()
+            chart.setTitle(f"Pie Chart ({x_col}, {aggfunc} of {value_col})" if value_col
+                           else f"Pie Chart ({x_col}, row count)")
+            # Slices cannot show negative or missing totals.
+            slices = [(label, value) for label, value in zip(data["labels"], data["values"]) if value > 0]
+            if not slices:
+                chart.setTitle(f"Pie Chart for {x_col} - No Positive Values Found")
+                self.show_graph_objects(None)
             else:
-                target = numeric_cols[0]
-                labels = list(grouped[x_col].astype(str))
-                values = list(grouped[target])
-                series = QPieSeries()
-                for label, value in zip(labels, values):
+                series = self.graph_objects(graph_type)["series"]
+                self.set_animated(len(slices))
+                series.clear()
+                for label, value in slices:
                     series.append(label, value)
-                chart.addSeries(series)
-                chart.legend().setAlignment(Qt.AlignBottom)
-
-        elif graph_type == "Line Chart":
-            data = get_line_data(df, y_col)
-            series = QLineSeries()
-            for x, y in zip(data["x"], data["y"]):
-                series.append(x, y)
-            chart.addSeries(series)
-            chart.createDefaultAxes()
-
-        elif graph_type == "Scatter Chart":
-            data = get_scatter_data(df, y_col)
-            series = QScatterSeries()
-            for x, y in zip(data["x"], data["y"]):
-                series.append(x, y)
-            chart.addSeries(series)
-            chart.createDefaultAxes()
-
-        self.chart_view = QChartView(chart)
-        self.chart_view.setRenderHint(QPainter.Antialiasing)
-        self.chart_layout.addWidget(self.chart_view)
\ No newline at end of file
+                self.show_graph_objects(graph_type)
+
+        elif graph_type in ["Line Chart", "Scatter Chart"]:
+            if graph_type == "Line Chart":
+                data = self.cached_data("line", df, y_col, lambda df, col: get_line_data(df, col, profile))
+            else:
+                data = self.cached_data("scatter", df, y_col, lambda df, col: get_scatter_data(df, col, profile))
+            objects = self.graph_objects(graph_type)
+            self.set_animated(len(data["y"]))
+            self.xy_series = objects["series"]
+            axis_x, axis_y = objects["axes"][0][0], objects["axes"][1][0]
+            if len(data["y"]):
+                # Setting the x-range re-decimates through rangeChanged once xy_data is set.
+                axis_y.setRange(data["y"].min(), data["y"].max())
+            self.xy_data = data
+            if len(data["y"]) and (axis_x.min(), axis_x.max()) != (data["x"][0], data["x"][-1]):
+                axis_x.setRange(data["x"][0], data["x"][-1])
+            else:
+                self.set_xy_points()
+            self.show_graph_objects(graph_type)
+        self.shown_graph = graph_type
+        note = column_profile.sample_note(self.parent)
+        if note:
+            chart.setTitle(f"{chart.title()}  [{note}]")
+        self.update_statistics(graph_type, df, x_col)
+
+    def update_statistics(self, graph_type, df, column):
+        mode = self.combo_statistics.currentText()
+        if mode == "Off" or graph_type not in ["Bar Chart", "Histogram"]:
+            self.stats_label.setText("")
+            return
+        graph_class = logic.BarChartGraph if graph_type == "Bar Chart" else logic.HistogramGraph
+        graph = graph_class(df, column)
+        graph.set_approximate(mode == "Approximate")
+        note = column_profile.sample_note(self.parent)
+        try:
+            text = format_statistics(graph.get_statistics())
+            self.stats_label.setText(f"{text}  [{note}]" if note else text)
+        except Exception as e:
+            self.stats_label.setText(f"Statistics unavailable: {e}")
+
+    def on_bins_changed(self):
+        # Only redraw a histogram that is already on screen.
+        if self.shown_graph == "Histogram" and self.combo_graph_type.currentText() == "Histogram":
+            self.generate_graph()
+
+    def cached_data(self, kind, df, column, func):
+        """Reuse chart data already built for this DataFrame and column."""
+        key = (f"graphs_page.{kind}", dataframe_token(df), column)
+        return shared_cache.get_or_compute(key, lambda: func(df, column))
+
+    def set_xy_points(self, x_min=None, x_max=None):
+        """Push the decimated points for the visible x-range into the current series in one call."""
+        if self.xy_series is None or self.xy_data is None:
+            return
+        xs, ys = logic.decimate_minmax(self.xy_data["x"], self.xy_data["y"],
+                                       max_points=MAX_RENDER_POINTS, x_min=x_min, x_max=x_max)
+        self.xy_series.replace([QPointF(x, y) for x, y in zip(xs.tolist(), ys.tolist())])
\ No newline at end of file
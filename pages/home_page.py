@@ -1,20 +1,219 @@
 import os
-import glob
-import pandas as pd
+import threading
 from PySide6.QtWidgets import (
-    QWidget, QVBoxLayout, QLabel, QListWidget, QPushButton,
-    QFileDialog, QMessageBox, QHBoxLayout
+    QWidget, QVBoxLayout, QLabel, QListView, QPushButton,
+    QFileDialog, QMessageBox, QHBoxLayout, QProgressBar, QCheckBox
 )
-from PySide6.QtCore import Qt
-import logic  # Your module for data I/O and normalization
+from PySide6.QtCore import (
+    Qt, QThread, Signal, QTimer, QAbstractListModel, QModelIndex, QFileSystemWatcher, QCoreApplication
+)
+import file_index
+import profiler
+
+class CsvLoadWorker(QThread):
+    """
+    Loads a CSV off the GUI thread in chunks.
+    The DataFrame is only handed back through `loaded` once the whole file is read.
+    With preview=True a large file first emits a random sample through `sampled`.
+    """
+    progress = Signal("qlonglong", "qlonglong", "qlonglong")  # rows read, bytes read, total bytes
+    sampled = Signal(object, object)  # sample DataFrame, its column profile
+    loaded = Signal(object, object)  # DataFrame, column profile
+    failed = Signal(str)
+    cancelled = Signal()
+
+    def __init__(self, file_path, chunksize=100_000, compact=False, preview=False, parent=None):
+        super().__init__(parent)
+        self.file_path = file_path
+        self.chunksize = chunksize
+        self.compact = compact
+        self.preview = preview
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    def report_progress(self, rows, bytes_read, total_bytes):
+        self.progress.emit(rows, bytes_read, total_bytes)
+
+    def run(self):
+        # Imported here so pandas is not loaded before the Home screen paints.
+        import logic
+        import column_profile
+        if self.preview:
+            self.emit_sample(logic, column_profile)
+        try:
+            with profiler.span("CsvLoadWorker.load", path=self.file_path):
+                df = logic.load_csv_chunked(
+                    self.file_path,
+                    chunksize=self.chunksize,
+                    progress=self.report_progress,
+                    is_cancelled=self._cancel_event.is_set,
+                    compact=self.compact,
+                )
+                # Profiling here keeps the full-column scans off the GUI thread.
+                profile = column_profile.profile_dataframe(df)
+                profiler.annotate(rows=len(df), columns=len(df.columns))
+        except logic.LoadCancelled:
+            self.cancelled.emit()
+        except Exception as e:
+            self.failed.emit(str(e))
+        else:
+            self.loaded.emit(df, profile)
+
+    def emit_sample(self, logic, column_profile):
+        try:
+            if not logic.wants_preview(self.file_path, self.compact):
+                return
+            with profiler.span("CsvLoadWorker.sample", path=self.file_path):
+                sample = logic.sample_csv(self.file_path, compact=self.compact)
+                profile = column_profile.profile_dataframe(sample)
+        except Exception:
+            # The preview is optional; the full load below reports any real problem.
+            return
+        self.sampled.emit(sample, profile)
+
+class DatasetWorker(QThread):
+    """Opens a folder of same-schema CSVs as a partitioned dataset and gathers its partition statistics."""
+    progress = Signal(int, int)  # partitions scanned, partitions to scan
+    loaded = Signal(object)  # partitioned.PartitionedDataset
+    failed = Signal(str)
+    cancelled = Signal()
+
+    def __init__(self, folder, parent=None):
+        super().__init__(parent)
+        self.folder = folder
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    def run(self):
+        import partitioned
+        try:
+            dataset = partitioned.PartitionedDataset.from_folder(self.folder)
+            # Files seen in an earlier session reuse their saved statistics and are not reopened.
+            dataset.compute_statistics(progress=self.progress.emit, is_cancelled=self._cancel_event.is_set)
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        if self._cancel_event.is_set():
+            self.cancelled.emit()
+        else:
+            self.loaded.emit(dataset)
+
+class FolderScanWorker(QThread):
+    """
+    Lists a folder from its persistent index, then sniffs new or changed files.
+    `listed` carries every FileInfo straight away; `sniffed` carries metadata as it arrives.
+    """
+    listed = Signal(object)  # [FileInfo, ...] sorted by name
+    sniffed = Signal(object)  # [FileInfo, ...] whose metadata was just filled in
+    failed = Signal(str)
+
+    def __init__(self, folder, parent=None):
+        super().__init__(parent)
+        self.folder = folder
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    def run(self):
+        try:
+            index = file_index.FolderIndex(self.folder)
+            infos = index.list_files()
+            self.listed.emit(infos)
+            index.sniff_missing(infos, on_batch=lambda batch: self.sniffed.emit(list(batch)),
+                                is_cancelled=self._cancel_event.is_set)
+            index.save()
+        except Exception as e:
+            self.failed.emit(str(e))
+
+def format_size(size):
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+class FileListModel(QAbstractListModel):
+    """
+    File entries for the Home page list. Rows are exposed in FETCH_SIZE steps
+    through canFetchMore/fetchMore, so the view only creates what is scrolled to.
+    """
+    FETCH_SIZE = 1000
+    PathRole = Qt.UserRole
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.infos = []
+        self.rows_by_path = {}
+        self.loaded = 0
+
+    def set_files(self, infos):
+        self.beginResetModel()
+        self.infos = infos
+        self.rows_by_path = {info.path: row for row, info in enumerate(infos)}
+        self.loaded = min(len(infos), self.FETCH_SIZE)
+        self.endResetModel()
+
+    def update_files(self, infos):
+        rows = [self.rows_by_path[info.path] for info in infos
+                if self.rows_by_path.get(info.path, self.loaded) < self.loaded]
+        if rows:
+            self.dataChanged.emit(self.index(min(rows)), self.index(max(rows)))
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.loaded
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self.loaded < len(self.infos)
+
+    def fetchMore(self, parent=QModelIndex()):
+        count = min(self.FETCH_SIZE, len(self.infos) - self.loaded)
+        self.beginInsertRows(QModelIndex(), self.loaded, self.loaded + count - 1)
+        self.loaded += count
+        self.endInsertRows()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        info = self.infos[index.row()]
+        if role == Qt.DisplayRole:
+            details = [format_size(info.size)]
+            if info.sniffed:
+                if info.estimated_rows is not None:
+                    details.append(f"{'' if info.exact_rows else '~'}{info.estimated_rows:,} rows")
+                details.append(f"{len(info.header)} columns")
+            return f"{info.name}    ({', '.join(details)})"
+        if role == Qt.ToolTipRole:
+            header = ", ".join(info.header) if info.sniffed else "reading header..."
+            return f"{info.path}\n{header}"
+        if role == self.PathRole:
+            return info.path
+        return None
 
 class HomePage(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.parent = parent
         self.default_folder = os.path.join(os.getcwd(), "data")
+        self.load_worker = None
+        self.scan_worker = None
+        self.rescan_pending = False
+        self.preview_note = ""
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self.on_directory_changed)
+        # Bursts of file system events (e.g. a copy of many files) trigger one rescan.
+        self.rescan_timer = QTimer(self)
+        self.rescan_timer.setSingleShot(True)
+        self.rescan_timer.setInterval(500)
+        self.rescan_timer.timeout.connect(self.start_scan)
+        if QCoreApplication.instance() is not None:
+            QCoreApplication.instance().aboutToQuit.connect(self.stop_scan)
         self.init_ui()
-        self.load_csv_file_list(self.default_folder)
+        # Scan the folder after the window is shown rather than while building it.
+        QTimer.singleShot(0, lambda: self.load_csv_file_list(self.default_folder))
 
     def init_ui(self):
         # Fallout theme: black background, bright green text, monospace font.
@@ -26,7 +225,7 @@ class HomePage(QWidget):
             QLabel { 
                 color: #00FF00; 
             }
-            QListWidget { 
+            QListView { 
                 background-color: #000000; 
                 color: #00FF00; 
                 border: 1px solid #00FF00; 
@@ -41,6 +240,16 @@ class HomePage(QWidget):
             QPushButton:hover { 
                 background-color: #005500; 
             }
+            QCheckBox { 
+                color: #00FF00; 
+            }
+            QProgressBar { 
+                border: 1px solid #00FF00; 
+                height: 10px; 
+            }
+            QProgressBar::chunk { 
+                background-color: #00FF00; 
+            }
         """)
 
         layout = QVBoxLayout()
@@ -56,53 +265,225 @@ class HomePage(QWidget):
         instruction.setAlignment(Qt.AlignCenter)
         layout.addWidget(instruction)
 
-        self.file_list = QListWidget()
+        self.file_model = FileListModel(self)
+        self.file_list = QListView()
+        self.file_list.setModel(self.file_model)
+        self.file_list.setUniformItemSizes(True)
+        self.file_list.doubleClicked.connect(lambda _index: self.load_selected_file())
         layout.addWidget(self.file_list)
 
+        self.list_status = QLabel("")
+        layout.addWidget(self.list_status)
+
         btn_layout = QHBoxLayout()
         self.btn_refresh = QPushButton("Refresh File List")
         self.btn_refresh.clicked.connect(lambda: self.load_csv_file_list(self.default_folder))
         self.btn_browse = QPushButton("Browse Folder")
         self.btn_browse.clicked.connect(self.browse_folder)
+        # Every file in the folder as one dataset, for statistics without loading them all at once.
+        self.btn_dataset = QPushButton("Open Folder as Dataset")
+        self.btn_dataset.clicked.connect(self.open_folder_dataset)
         btn_layout.addWidget(self.btn_refresh)
         btn_layout.addWidget(self.btn_browse)
+        btn_layout.addWidget(self.btn_dataset)
         layout.addLayout(btn_layout)
 
+        self.check_compact = QCheckBox("Compact memory mode (smaller dtypes, parsed dates)")
+        layout.addWidget(self.check_compact)
+
+        # Large files show a random sample on the Statistics and Graphs pages while the rest loads.
+        self.check_preview = QCheckBox("Preview a sample while large files load")
+        self.check_preview.setChecked(True)
+        layout.addWidget(self.check_preview)
+
+        load_layout = QHBoxLayout()
         self.btn_load = QPushButton("Load Selected File")
         self.btn_load.clicked.connect(self.load_selected_file)
-        layout.addWidget(self.btn_load)
+        # Adds the file's rows to the loaded data, e.g. the next day's export of the same table.
+        self.btn_append = QPushButton("Append Selected File")
+        self.btn_append.clicked.connect(lambda: self.load_selected_file(append=True))
+        load_layout.addWidget(self.btn_load)
+        load_layout.addWidget(self.btn_append)
+        layout.addLayout(load_layout)
+
+        progress_layout = QHBoxLayout()
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 1000)
+        self.progress_bar.setTextVisible(False)
+        self.progress_label = QLabel("")
+        self.btn_cancel = QPushButton("Cancel")
+        self.btn_cancel.clicked.connect(self.cancel_loading)
+        progress_layout.addWidget(self.progress_bar)
+        progress_layout.addWidget(self.progress_label)
+        progress_layout.addWidget(self.btn_cancel)
+        layout.addLayout(progress_layout)
+        self.set_loading(False)
 
         self.setLayout(layout)
 
     def load_csv_file_list(self, folder):
-        self.file_list.clear()
-        self.default_folder = folder
         if not os.path.exists(folder):
             os.makedirs(folder)
-        csv_files = glob.glob(os.path.join(folder, "*.csv"))
-        if not csv_files:
-            self.file_list.addItem("No CSV files found in the folder.")
+        if self.watcher.directories():
+            self.watcher.removePaths(self.watcher.directories())
+        self.watcher.addPath(folder)
+        self.default_folder = folder
+        self.file_model.set_files([])
+        self.start_scan()
+
+    def start_scan(self):
+        if self.scan_worker is not None:
+            # Let the running scan stop and start again from the current folder.
+            self.rescan_pending = True
+            self.scan_worker.cancel()
+            return
+        self.rescan_pending = False
+        self.list_status.setText("Scanning folder...")
+        self.scan_worker = FolderScanWorker(self.default_folder, parent=self)
+        self.scan_worker.listed.connect(self.on_files_listed)
+        self.scan_worker.sniffed.connect(self.file_model.update_files)
+        self.scan_worker.failed.connect(lambda message: self.list_status.setText(f"Could not scan folder: {message}"))
+        self.scan_worker.finished.connect(self.on_scan_finished)
+        self.scan_worker.start()
+
+    def on_files_listed(self, infos):
+        if self.rescan_pending:
+            return
+        self.file_model.set_files(infos)
+        if infos:
+            self.list_status.setText(f"{len(infos):,} CSV files in {self.default_folder}")
         else:
-            for file in csv_files:
-                self.file_list.addItem(file)
+            self.list_status.setText("No CSV files found in the folder.")
+
+    def on_scan_finished(self):
+        self.scan_worker.deleteLater()
+        self.scan_worker = None
+        if self.rescan_pending:
+            self.start_scan()
+
+    def stop_scan(self):
+        if self.scan_worker is not None:
+            self.rescan_pending = False
+            self.scan_worker.cancel()
+            self.scan_worker.wait()
+
+    def on_directory_changed(self, _path):
+        self.rescan_timer.start()
 
     def browse_folder(self):
         folder = QFileDialog.getExistingDirectory(self, "Select CSV Folder", os.getcwd())
         if folder:
             self.load_csv_file_list(folder)
 
-    def load_selected_file(self):
-        selected_item = self.file_list.currentItem()
-        if not selected_item:
+    def load_selected_file(self, append=False):
+        selected = self.file_list.currentIndex()
+        if not selected.isValid():
             QMessageBox.warning(self, "No Selection", "Please select a CSV file from the list.")
             return
-        file_path = selected_item.text()
+        file_path = selected.data(FileListModel.PathRole)
         if not os.path.isfile(file_path):
             QMessageBox.critical(self, "Invalid File", "The selected item is not a valid file.")
             return
+        if self.load_worker is not None:
+            return
+        if append and self.parent.df is None:
+            append = False
+        self.load_worker = CsvLoadWorker(file_path, compact=self.check_compact.isChecked(),
+                                         preview=self.check_preview.isChecked() and not append, parent=self)
+        self.load_worker.progress.connect(self.on_load_progress)
+        self.load_worker.sampled.connect(lambda df, profile: self.on_sample_loaded(file_path, df, profile))
+        if append:
+            self.load_worker.loaded.connect(lambda df, _profile: self.on_append_finished(file_path, df))
+        else:
+            self.load_worker.loaded.connect(lambda df, profile: self.on_load_finished(file_path, df, profile))
+        self.load_worker.failed.connect(self.on_load_failed)
+        self.load_worker.cancelled.connect(self.on_load_cancelled)
+        self.load_worker.finished.connect(self.on_worker_finished)
+        self.set_loading(True)
+        self.load_worker.start()
+
+    def open_folder_dataset(self):
+        if self.load_worker is not None:
+            return
+        self.load_worker = DatasetWorker(self.default_folder, parent=self)
+        self.load_worker.progress.connect(self.on_dataset_progress)
+        self.load_worker.loaded.connect(self.on_dataset_loaded)
+        self.load_worker.failed.connect(self.on_load_failed)
+        self.load_worker.cancelled.connect(self.on_load_cancelled)
+        self.load_worker.finished.connect(self.on_worker_finished)
+        self.set_loading(True)
+        self.load_worker.start()
+
+    def on_dataset_progress(self, done, total):
+        self.progress_bar.setValue(int(done * 1000 / total) if total else 1000)
+        self.progress_label.setText(f"Reading partition statistics: {done:,} / {total:,} files")
+
+    def on_dataset_loaded(self, dataset):
+        self.parent.show_page("stats")
+        self.parent.page("stats").show_dataset(dataset)
+
+    def cancel_loading(self):
+        if self.load_worker is not None:
+            self.progress_label.setText("Cancelling...")
+            self.load_worker.cancel()
+
+    def set_loading(self, loading):
+        self.btn_load.setEnabled(not loading)
+        self.btn_append.setEnabled(not loading)
+        self.btn_dataset.setEnabled(not loading)
+        self.btn_cancel.setVisible(loading)
+        self.progress_bar.setVisible(loading)
+        self.progress_label.setVisible(loading)
+        if loading:
+            self.preview_note = ""
+            self.progress_bar.setValue(0)
+            self.progress_label.setText("Loading...")
+
+    def on_load_progress(self, rows, bytes_read, total_bytes):
+        if total_bytes > 0:
+            self.progress_bar.setValue(int(bytes_read * 1000 / total_bytes))
+        self.progress_label.setText(f"{rows:,} rows, {bytes_read / 1e6:.1f} / {total_bytes / 1e6:.1f} MB"
+                                    + self.preview_note)
+
+    def on_sample_loaded(self, file_path, df, profile):
+        self.parent.store.set_data(df, profile, source=file_path)
+        self.preview_note = f" (previewing {df.attrs['sample']['rows']:,} sampled rows)"
+        self.progress_label.setText("Loading the full file" + self.preview_note)
+
+    def on_load_finished(self, file_path, df, profile):
+        import logic
+        store = self.parent.store
+        # The exact data replaces a sample preview of the same file and keeps its filter.
+        replaces_sample = store.source == file_path and logic.sample_info(store.df) is not None
+        store.set_data(df, profile, source=file_path, keep_filter=replaces_sample)
+        message = f"Data loaded successfully from:\n{file_path}"
+        usage = df.attrs.get("memory_usage")
+        if usage:
+            message += f"\n\nMemory: {usage['before'] / 1e6:.1f} MB -> {usage['after'] / 1e6:.1f} MB"
+        QMessageBox.information(self, "File Loaded", message)
+
+    def on_append_finished(self, file_path, df):
         try:
-            df = logic.load_csv(file_path)
-            self.parent.df = df
-            QMessageBox.information(self, "File Loaded", f"Data loaded successfully from:\n{file_path}")
-        except Exception as e:
-            QMessageBox.critical(self, "Loading Error", f"An error occurred:\n{e}")
\ No newline at end of file
+            self.parent.store.append_rows(df, source=file_path)
+        except ValueError as e:
+            QMessageBox.warning(self, "Cannot Append", str(e))
+            return
+        QMessageBox.information(self, "Rows Appended",
+                                f"Appended {len(df):,} rows from:\n{file_path}\n\n{len(self.parent.df):,} rows loaded in total.")
+
+    def on_load_failed(self, message):
+        if self.preview_note:
+            message += "\n\nThe sample preview stays loaded."
+        QMessageBox.critical(self, "Loading Error", f"An error occurred:\n{message}")
+
+    def on_load_cancelled(self):
+        if self.preview_note:
+            QMessageBox.information(self, "Loading Cancelled",
+                                    "The full file was not loaded; the sample preview stays loaded.")
+        else:
+            QMessageBox.information(self, "Loading Cancelled", "The file was not loaded.")
+
+    def on_worker_finished(self):
+        self.load_worker.deleteLater()
+        self.load_worker = None
+        self.set_loading(False)
\ No newline at end of file
@@ -0,0 +1,106 @@
+import os
+from PySide6.QtWidgets import (
+    QWidget, QVBoxLayout, QLabel, QPushButton, QHBoxLayout, QCheckBox,
+    QTableWidget, QTableWidgetItem, QHeaderView, QFileDialog, QMessageBox
+)
+from PySide6.QtCore import Qt
+import profiler
+
+COLUMNS = ["Name", "Calls", "Total ms", "Mean ms", "Max ms", "Rows", "Memory Δ MB"]
+
+class PerfPage(QWidget):
+    """Timings recorded by profiler.py, summed per function or page action."""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.parent = parent
+        self.init_ui()
+
+    def init_ui(self):
+        self.setStyleSheet("""
+            QWidget { background-color: #000000; font-family: Consolas, monospace; }
+            QLabel, QCheckBox { color: #00FF00; }
+            QTableWidget { background-color: #000000; color: #00FF00; border: 1px solid #00FF00; gridline-color: #00FF00; }
+            QHeaderView::section { background-color: #000000; color: #00FF00; }
+            QPushButton { background-color: #000000; color: #00FF00; padding: 6px 12px; border: 1px solid #00FF00; border-radius: 4px; }
+            QPushButton:hover { background-color: #005500; }
+        """)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(20, 20, 20, 20)
+        layout.setSpacing(15)
+
+        title = QLabel("Performance")
+        title.setAlignment(Qt.AlignCenter)
+        title.setStyleSheet("font-size: 22px; font-weight: bold;")
+        layout.addWidget(title)
+
+        top_layout = QHBoxLayout()
+        self.check_record = QCheckBox("Record timings")
+        self.check_record.setChecked(profiler.enabled())
+        self.check_record.toggled.connect(self.set_recording)
+        top_layout.addWidget(self.check_record)
+        self.btn_refresh = QPushButton("Refresh")
+        self.btn_refresh.clicked.connect(self.refresh)
+        top_layout.addWidget(self.btn_refresh)
+        self.btn_clear = QPushButton("Clear")
+        self.btn_clear.clicked.connect(self.clear)
+        top_layout.addWidget(self.btn_clear)
+        self.btn_export = QPushButton("Export Trace...")
+        self.btn_export.clicked.connect(self.export_trace)
+        top_layout.addWidget(self.btn_export)
+        layout.addLayout(top_layout)
+
+        self.status = QLabel("")
+        layout.addWidget(self.status)
+
+        self.table = QTableWidget(0, len(COLUMNS))
+        self.table.setHorizontalHeaderLabels(COLUMNS)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        layout.addWidget(self.table)
+        self.refresh()
+
+    def set_recording(self, on):
+        if on:
+            # Loads pandas through logic if it has not been imported yet.
+            import logic  # noqa: F401
+            profiler.enable()
+        else:
+            profiler.disable()
+        self.refresh()
+
+    def refresh(self):
+        rows = profiler.summary()
+        self.table.setSortingEnabled(False)
+        self.table.setRowCount(len(rows))
+        for i, entry in enumerate(rows):
+            mem = entry["mem_delta"] / 1e6
+            values = [entry["name"], entry["calls"], round(entry["total_ms"], 2), round(entry["mean_ms"], 2),
+                      round(entry["max_ms"], 2), entry["rows"] if entry["rows"] is not None else "", round(mem, 1)]
+            for j, value in enumerate(values):
+                item = QTableWidgetItem()
+                # Numbers are stored as data so column sorting is numeric.
+                item.setData(Qt.DisplayRole, value)
+                if j:
+                    item.setTextAlignment(int(Qt.AlignRight | Qt.AlignVCenter))
+                self.table.setItem(i, j, item)
+        self.table.setSortingEnabled(True)
+        state = "Recording" if profiler.enabled() else "Not recording"
+        self.status.setText(f"{state}. {len(profiler.events()):,} spans recorded.")
+
+    def clear(self):
+        profiler.clear()
+        self.refresh()
+
+    def export_trace(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Export Trace", os.path.join(os.getcwd(), "trace.json"),
+                                              "Chrome Trace (*.json)")
+        if not path:
+            return
+        try:
+            profiler.export_trace(path)
+        except OSError as e:
+            QMessageBox.warning(self, "Export Failed", str(e))
+            return
+        QMessageBox.information(self, "Trace Exported",
+                                f"Saved {len(profiler.events()):,} spans to:\n{path}\n\n"
+                                "Open it in chrome://tracing or ui.perfetto.dev.")
@@ -1,15 +1,44 @@
+import os
 import pandas as pd
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QLabel, QComboBox, QPushButton,
-    QTextEdit, QHBoxLayout, QTableWidget, QTableWidgetItem
+    QTextEdit, QHBoxLayout, QTableWidget, QTableWidgetItem, QFileDialog
 )
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QThread, Signal
+import logic
+import parallel_agg
+import streaming_stats
+import column_profile
+import profiler
+
+class StatsWorker(QThread):
+    """Runs one statistics function off the GUI thread."""
+    done = Signal(object)
+    failed = Signal(str)
+
+    def __init__(self, func, *args, parent=None):
+        super().__init__(parent)
+        self.func = func
+        self.args = args
+
+    def run(self):
+        try:
+            result = self.func(*self.args)
+        except Exception as e:
+            self.failed.emit(str(e))
+        else:
+            self.done.emit(result)
 
 class StatsPage(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.parent = parent
-        self.df = None
+        self.shown_version = None  # DataStore version the summary was built from
+        # CSV path when stats are streamed from disk instead of the loaded DataFrame.
+        self.stream_path = None
+        # partitioned.PartitionedDataset opened from the Home page, used instead of the DataFrame.
+        self.dataset = None
+        self.worker = None
         self.init_ui()
 
     def init_ui(self):
@@ -30,9 +59,15 @@ class StatsPage(QWidget):
         layout.addWidget(title)
 
         # Add a Refresh Stats button at the top
+        top_layout = QHBoxLayout()
         self.btn_refresh = QPushButton("Refresh Stats")
         self.btn_refresh.clicked.connect(self.update_stats_view)
-        layout.addWidget(self.btn_refresh)
+        top_layout.addWidget(self.btn_refresh)
+        # Streams a CSV in chunks for files too large to load into memory.
+        self.btn_stream = QPushButton("Stream Stats From File")
+        self.btn_stream.clicked.connect(self.stream_stats_from_file)
+        top_layout.addWidget(self.btn_stream)
+        layout.addLayout(top_layout)
 
         self.stats_summary = QTextEdit()
         self.stats_summary.setReadOnly(True)
@@ -57,14 +92,27 @@ class StatsPage(QWidget):
         # Initially update view (if data available)
         self.update_stats_view()
 
+    def refresh_data(self):
+        self.update_stats_view()
+
+    @profiler.traced("StatsPage.update_stats_view")
     def update_stats_view(self):
+        self.shown_version = self.parent.store.version
         # Debug: print parent's df details.
         if self.parent.df is not None:
             print("StatsPage: Data loaded. DataFrame shape:", self.parent.df.shape)
-            self.df = self.parent.df
-            desc = self.df.describe(include="all")
-            self.stats_summary.setPlainText(desc.to_string())
-            columns = list(self.df.columns)
+            self.stream_path = None
+            self.dataset = None
+            # The profile is computed once per loaded file (or filter) and already holds describe().
+            profile = column_profile.ensure_profile(self.parent)
+            desc = profile.describe_frame()
+            header = column_profile.sample_note(self.parent)
+            header = f"Preview from a {header}; exact results replace it when loading finishes.\n" if header else ""
+            view = column_profile.active_view(self.parent)
+            if view is not None:
+                header += f"Filter: {view.describe()} ({len(view):,} of {len(self.parent.df):,} rows)\n"
+            self.stats_summary.setPlainText(header + "\n" + desc.to_string() if header else desc.to_string())
+            columns = profile.column_names()
             self.combo_group.clear()
             self.combo_target.clear()
             self.combo_group.addItems(columns)
@@ -73,17 +121,92 @@ class StatsPage(QWidget):
             print("StatsPage: No data loaded (self.parent.df is None)")
             self.stats_summary.setPlainText("No data loaded.")
 
-    def compute_group_stats(self):
-        if self.df is None:
+    def stream_stats_from_file(self):
+        if self.worker is not None:
+            return
+        file_path, _ = QFileDialog.getOpenFileName(self, "Select CSV File", os.getcwd(), "CSV Files (*.csv)")
+        if not file_path:
+            return
+        try:
+            header = streaming_stats.read_header(file_path)
+        except Exception as e:
+            self.stats_summary.setPlainText(f"Error: {e}")
+            return
+        self.stream_path = file_path
+        self.dataset = None
+        self.combo_group.clear()
+        self.combo_target.clear()
+        self.combo_group.addItems(header)
+        self.combo_target.addItems(header)
+        self.stats_summary.setPlainText(f"Streaming statistics from {file_path}...")
+        self.run_in_background(streaming_stats.describe_csv, (file_path,),
+                               lambda desc: self.stats_summary.setPlainText(
+                                   f"Streamed from {file_path}\n\n{desc.to_string()}"))
+
+    def show_dataset(self, dataset):
+        """Describe every partition of a dataset, loading them one at a time."""
+        if self.worker is not None:
             return
+        self.stream_path = None
+        self.dataset = dataset
+        self.combo_group.clear()
+        self.combo_target.clear()
+        self.combo_group.addItems(dataset.columns)
+        self.combo_target.addItems(dataset.columns)
+        header = f"Dataset of {len(dataset):,} files ({dataset.num_rows or 0:,} rows)"
+        self.stats_summary.setPlainText(f"{header}\n\nComputing statistics...")
+        self.run_in_background(logic.describe_data, (dataset,),
+                               lambda desc: self.stats_summary.setPlainText(f"{header}\n\n{desc.to_string()}"))
+
+    def run_in_background(self, func, args, on_done):
+        self.worker = StatsWorker(func, *args, parent=self)
+        self.worker.done.connect(on_done)
+        self.worker.failed.connect(lambda message: self.stats_summary.setPlainText(f"Error: {message}"))
+        self.worker.finished.connect(self.on_worker_finished)
+        self.btn_stream.setEnabled(False)
+        self.btn_compute.setEnabled(False)
+        self.worker.start()
+
+    def on_worker_finished(self):
+        self.worker.deleteLater()
+        self.worker = None
+        self.btn_stream.setEnabled(True)
+        self.btn_compute.setEnabled(True)
+
+    @profiler.traced("StatsPage.compute_group_stats")
+    def compute_group_stats(self):
         group_col = self.combo_group.currentText()
         target_col = self.combo_target.currentText()
+        if self.stream_path is not None:
+            if self.worker is None:
+                self.run_in_background(streaming_stats.group_stats_csv,
+                                       (self.stream_path, group_col, target_col), self.populate_table)
+            return
+        if self.dataset is not None:
+            if self.worker is None:
+                self.run_in_background(logic.group_aggregate, (self.dataset, group_col, target_col), self.populate_table)
+            return
+        df = column_profile.active_frame(self.parent, [group_col, target_col])
+        if df is None:
+            return
+        if parallel_agg.should_parallelize(len(df)):
+            # Large frames are aggregated across worker processes, off the UI thread.
+            if self.worker is None:
+                version = self.parent.store.version
+                self.run_in_background(logic.group_aggregate, (df, group_col, target_col),
+                                       lambda table: self.populate_current(table, version))
+            return
         try:
-            group_stats = self.df.groupby(group_col)[target_col].agg(["mean", "sum", "max", "min"]).reset_index()
+            group_stats = logic.group_aggregate(df, group_col, target_col, parallel=False)
             self.populate_table(group_stats)
         except Exception as e:
             self.stats_summary.setPlainText(f"Error: {e}")
 
+    def populate_current(self, df_table, version):
+        # Results for data that has since been replaced or filtered differently are dropped.
+        if version == self.parent.store.version:
+            self.populate_table(df_table)
+
     def populate_table(self, df_table: pd.DataFrame):
         self.stats_table.clear()
         self.stats_table.setRowCount(len(df_table))
@@ -1,19 +1,215 @@
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QTableWidget, QTableWidgetItem, QLabel, QPushButton
-from PySide6.QtCore import Qt
+import numpy as np
+import pandas as pd
+import column_profile
+import profiler
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QTableView, QHeaderView, QLabel, QApplication
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+def _compact(ranks, distinct):
+    # Small integer keys let numpy use its radix sort for stable argsorts.
+    for dtype in (np.uint8, np.uint16, np.uint32):
+        if distinct < np.iinfo(dtype).max:
+            return ranks.astype(dtype)
+    return ranks
+
+def sort_ranks(series):
+    """
+    Dense ranks of a column in its native order (numbers numerically, text
+    lexicographically, categoricals by category order); missing values get the
+    largest rank. Returns (ranks, missing mask, distinct count, ascending permutation or None).
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes = series.cat.codes.to_numpy()
+        missing = codes < 0
+        distinct = len(series.cat.categories)
+        return _compact(np.where(missing, distinct, codes), distinct), missing, distinct, None
+    if pd.api.types.is_numeric_dtype(series) or pd.api.types.is_datetime64_any_dtype(series):
+        missing = series.isna().to_numpy()
+        if pd.api.types.is_datetime64_any_dtype(series):
+            # asi8 is the epoch value (UTC for tz-aware columns), so it also orders tz-aware dates.
+            values = series.array.asi8
+        elif pd.api.types.is_bool_dtype(series):
+            values = series.to_numpy(dtype=np.uint8, na_value=0)
+        elif series.dtype.kind in "iu":
+            # Nullable Int64 columns hold pd.NA; missing rows are left out of the order anyway.
+            values = series.to_numpy(dtype=getattr(series.dtype, "numpy_dtype", series.dtype), na_value=0)
+            if len(values) and 0 <= int(values.max()) - int(values.min()) < 65536:
+                values = (values - values.min()).astype(np.uint16)
+        else:
+            values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+        present = np.flatnonzero(~missing)
+        order = present[np.argsort(values[present], kind="stable")]
+        ordered = values[order]
+        dense = np.zeros(len(order), dtype=np.int64)
+        if len(order) > 1:
+            np.cumsum(ordered[1:] != ordered[:-1], out=dense[1:])
+        distinct = int(dense[-1]) + 1 if len(order) else 0
+        ranks = np.full(len(values), distinct, dtype=np.int64)
+        ranks[order] = dense
+        return _compact(ranks, distinct), missing, distinct, np.concatenate([order, np.flatnonzero(missing)])
+    try:
+        codes, uniques = pd.factorize(series, sort=True)
+    except TypeError:
+        # Mixed types that cannot be compared are ordered by their text.
+        codes, uniques = pd.factorize(series.astype(str).where(series.notna()), sort=True)
+    missing = codes < 0
+    return _compact(np.where(missing, len(uniques), codes), len(uniques)), missing, len(uniques), None
+
+def _cell_values(series):
+    """
+    What a table cell reads its value from, without copying the column. Plain numpy
+    columns give their array; the rest keep their pandas array, whose items print
+    the way pandas shows them (Timestamps, Int64 values and <NA>, labels of categoricals).
+    """
+    if isinstance(series.dtype, np.dtype) and series.dtype.kind in "biufcO":
+        return series.to_numpy()
+    return series.array
+
+class DataFrameModel(QAbstractTableModel):
+    """
+    Read-only table model over a DataFrame.
+    Keeps a reference to each column's array and only formats a cell when the
+    view asks for it, so the cost does not grow with the number of rows.
+    """
+    def __init__(self, df=None, parent=None):
+        super().__init__(parent)
+        self.set_dataframe(df)
+
+    def set_dataframe(self, df, profile=None, rows=None):
+        """rows (sorted row positions) limits the table to a filtered view without copying df."""
+        self.beginResetModel()
+        if df is not getattr(self, "df", None):
+            # Sort ranks and full-frame permutations stay valid while the DataFrame is the same.
+            self._ranks = {}  # column -> sort_ranks() result
+            self._perms = {}  # tuple of sort keys -> row permutation over all rows
+        self.df = df
+        self._rows = rows
+        # Numeric columns are right-aligned; the kinds come from the shared profile.
+        self._numeric = []
+        if df is not None and profile is not None:
+            self._numeric = [profile.columns[col].is_numeric for col in df.columns]
+        if df is None:
+            self._columns = []
+            self._arrays = []
+            self._row_count = 0
+        else:
+            self._columns = [str(col) for col in df.columns]
+            self._arrays = [_cell_values(df[col]) for col in df.columns]
+            self._row_count = len(df) if rows is None else len(rows)
+        self._order = rows  # Row positions shown, in display order; None means all rows in file order.
+        self._sort_keys = []  # [(column, ascending), ...] primary key first
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._row_count
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._columns)
+
+    def source_row(self, row):
+        return row if self._order is None else int(self._order[row])
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.TextAlignmentRole:
+            if self._numeric and self._numeric[index.column()]:
+                return int(Qt.AlignRight | Qt.AlignVCenter)
+            return None
+        if role != Qt.DisplayRole:
+            return None
+        return str(self._arrays[index.column()][self.source_row(index.row())])
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            label = self._columns[section]
+            if len(self._sort_keys) > 1:
+                for position, (column, ascending) in enumerate(self._sort_keys, 1):
+                    if column == section:
+                        label += f" [{position}{'▲' if ascending else '▼'}]"
+            return label
+        return str(self.source_row(section))
+
+    def sort_keys(self):
+        return list(self._sort_keys)
+
+    def _column_ranks(self, column):
+        if column not in self._ranks:
+            self._ranks[column] = sort_ranks(self.df.iloc[:, column])
+        return self._ranks[column]
+
+    def _sort_key(self, column, ascending):
+        ranks, missing, distinct, _ = self._column_ranks(column)
+        if ascending:
+            return ranks
+        # Reverse the ranks of present values; missing values keep the largest rank.
+        return np.where(missing, distinct, distinct - 1 - ranks.astype(np.int64)).astype(ranks.dtype)
+
+    def permutation(self, keys):
+        """Stable row order for [(column, ascending), ...]; cached per key list."""
+        keys = tuple(keys)
+        if keys not in self._perms:
+            if len(keys) == 1 and keys[0][1] and self._column_ranks(keys[0][0])[3] is not None:
+                perm = self._column_ranks(keys[0][0])[3]
+            elif len(keys) == 1:
+                perm = np.argsort(self._sort_key(*keys[0]), kind="stable")
+            else:
+                perm = self._multi_key_permutation(keys)
+            self._perms[keys] = np.ascontiguousarray(perm)
+        return self._perms[keys]
+
+    def _multi_key_permutation(self, keys):
+        sizes = [self._column_ranks(column)[2] + 1 for column, _ in keys]
+        if np.prod(sizes, dtype=float) < 2 ** 62:
+            # Fold the keys into one integer so a single stable argsort does the work.
+            combined = np.zeros(len(self.df), dtype=np.int64)
+            for (column, ascending), size in zip(keys, sizes):
+                combined *= size
+                combined += self._sort_key(column, ascending)
+            return np.argsort(_compact(combined, int(np.prod(sizes, dtype=float))), kind="stable")
+        # lexsort is stable and treats its last key as the primary one.
+        return np.lexsort([self._sort_key(column, ascending) for column, ascending in reversed(keys)])
+
+    @profiler.traced("DataFrameModel.sort_by")
+    def sort_by(self, keys):
+        """Show rows ordered by several columns; an empty list restores file order."""
+        if self.df is None:
+            return
+        keys = [(column, bool(ascending)) for column, ascending in keys if 0 <= column < len(self._columns)]
+        self.layoutAboutToBeChanged.emit()
+        self._sort_keys = keys
+        order = self.permutation(keys) if keys else None
+        if self._rows is not None:
+            if order is None:
+                order = self._rows
+            else:
+                # Keep the filtered rows, in sorted order.
+                selected = np.zeros(len(self.df), dtype=bool)
+                selected[self._rows] = True
+                order = order[selected[order]]
+        self._order = order
+        self.layoutChanged.emit()
+        self.headerDataChanged.emit(Qt.Horizontal, 0, max(len(self._columns) - 1, 0))
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        if self.df is None or not 0 <= column < len(self._columns):
+            return
+        self.sort_by([(column, order == Qt.AscendingOrder)])
 
 class TablePage(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.parent = parent  # Reference to MainWindow
+        self.shown_version = None  # DataStore version the model was built from
         self.init_ui()
 
     def init_ui(self):
         self.setStyleSheet("""
             QWidget { background-color: #000000; color: #00FF00; font-family: Consolas, monospace; }
-            QTableWidget { background-color: #000000; color: #00FF00; gridline-color: #00FF00; }
+            QTableView { background-color: #000000; color: #00FF00; gridline-color: #00FF00; }
             QHeaderView::section { background-color: #000000; color: #00FF00; }
-            QPushButton { background-color: #000000; color: #00FF00; border: 1px solid #00FF00; padding: 6px; }
-            QPushButton:hover { background-color: #005500; }
         """)
         layout = QVBoxLayout(self)
         layout.setContentsMargins(20, 20, 20, 20)
@@ -22,22 +218,52 @@ class TablePage(QWidget):
         title.setStyleSheet("font-size: 22px; font-weight: bold;")
         layout.addWidget(title)
 
-        self.table = QTableWidget()
-        self.table.setSortingEnabled(True)
+        self.model = DataFrameModel()
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        # Fixed row heights stop the view from measuring every row up front.
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
+        # Header clicks sort through on_header_clicked; Shift+click adds a secondary key.
+        header = self.table.horizontalHeader()
+        header.setSortIndicatorShown(True)
+        header.setSectionsClickable(True)
+        header.sectionClicked.connect(self.on_header_clicked)
+        # Keep file order until the user clicks a header.
+        header.setSortIndicator(-1, Qt.AscendingOrder)
         layout.addWidget(self.table)
 
-        self.btn_refresh = QPushButton("Refresh Table")
-        self.btn_refresh.clicked.connect(self.update_table)
-        layout.addWidget(self.btn_refresh)
+    def refresh_data(self):
+        self.update_table()
 
+    @profiler.traced("TablePage.update_table")
     def update_table(self):
+        self.shown_version = self.parent.store.version
         if self.parent.df is None:
             return
-        df = self.parent.df
-        self.table.clear()
-        self.table.setRowCount(len(df))
-        self.table.setColumnCount(len(df.columns))
-        self.table.setHorizontalHeaderLabels(list(df.columns))
-        for i, row in df.iterrows():
-            for j, col in enumerate(df.columns):
-                self.table.setItem(i, j, QTableWidgetItem(str(row[col])))
\ No newline at end of file
+        view = column_profile.active_view(self.parent)
+        profiler.annotate(rows=len(self.parent.df) if view is None else len(view))
+        if view is None:
+            self.model.set_dataframe(self.parent.df, column_profile.ensure_profile(self.parent))
+        else:
+            # Column kinds are the same for a filter, so the whole-file profile is enough here.
+            profile = self.parent.profile if self.parent.profile is not None and self.parent.profile.matches(self.parent.df) else None
+            self.model.set_dataframe(self.parent.df, profile, rows=view.rows)
+        self.table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+
+    def on_header_clicked(self, section):
+        keys = self.model.sort_keys()
+        current = dict(keys)
+        if QApplication.keyboardModifiers() & Qt.ShiftModifier and keys:
+            # Add the column as the next key, or flip it if it is already a key.
+            if section in current:
+                keys = [(column, not ascending if column == section else ascending) for column, ascending in keys]
+            else:
+                keys.append((section, True))
+        elif keys and keys[0][0] == section and len(keys) == 1:
+            keys = [(section, not keys[0][1])]
+        else:
+            keys = [(section, True)]
+        self.model.sort_by(keys)
+        primary, ascending = keys[0]
+        self.table.horizontalHeader().setSortIndicator(primary, Qt.AscendingOrder if ascending else Qt.DescendingOrder)
@@ -0,0 +1,180 @@
+import os
+import atexit
+import multiprocessing
+from multiprocessing import shared_memory
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+
+# Grouped aggregation across a process pool.
+# Group keys are factorized to integer codes in the parent; codes and target values
+# are placed in shared memory, so workers read them without pickled copies.
+# Decomposable aggregations (sum, count, mean, min, max) are computed as per-slice
+# partials and merged; anything else (median, std, nunique...) is computed by
+# giving each worker a disjoint set of whole groups.
+
+PARALLEL_MIN_ROWS = 2_000_000
+DECOMPOSABLE = {"sum", "count", "size", "mean", "min", "max"}
+
+_executor = None
+_executor_workers = 0
+
+def default_workers():
+    return os.cpu_count() or 1
+
+def should_parallelize(row_count, workers=None):
+    return row_count >= PARALLEL_MIN_ROWS and (workers or default_workers()) > 1
+
+def _get_executor(workers):
+    global _executor, _executor_workers
+    if _executor is None or _executor_workers != workers:
+        if _executor is not None:
+            _executor.shutdown()
+        # spawn avoids forking a process that may be running Qt threads.
+        _executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        _executor_workers = workers
+    return _executor
+
+@atexit.register
+def _shutdown_executor():
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+
+class _SharedArray:
+    """A numpy array copied into a named shared memory block."""
+    def __init__(self, array):
+        array = np.ascontiguousarray(array)
+        self.shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        self.spec = (self.shm.name, array.shape, array.dtype.str)
+        np.ndarray(array.shape, dtype=array.dtype, buffer=self.shm.buf)[:] = array
+
+    def release(self):
+        self.shm.close()
+        self.shm.unlink()
+
+def _attach(spec):
+    name, shape, dtype = spec
+    # Spawned workers share the parent's resource tracker, which unlinks the block
+    # if the parent dies before release().
+    shm = shared_memory.SharedMemory(name=name)
+    return shm, np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+
+def _agg_name(agg):
+    return agg if isinstance(agg, str) else getattr(agg, "__name__", str(agg))
+
+def _partial_worker(codes_spec, values_spec, start, stop):
+    """size/sum/count/min/max per group code for rows [start, stop)."""
+    codes_shm, codes = _attach(codes_spec)
+    values_shm, values = _attach(values_spec)
+    try:
+        c = codes[start:stop]
+        v = values[start:stop]
+        keyed = c >= 0
+        sizes = np.bincount(c[keyed])
+        if v.dtype.kind == "f":
+            keyed &= ~np.isnan(v)
+        grouped = pd.Series(v[keyed]).groupby(c[keyed]).agg(["sum", "count", "min", "max"])
+        part = {col: grouped[col].to_numpy() for col in grouped.columns}
+        return sizes, grouped.index.to_numpy(), part
+    finally:
+        del codes, values
+        codes_shm.close()
+        values_shm.close()
+
+def _group_partition_worker(codes_spec, values_spec, part, parts, aggs):
+    """Full aggregations for every group whose code % parts == part."""
+    codes_shm, codes = _attach(codes_spec)
+    values_shm, values = _attach(values_spec)
+    try:
+        mask = (codes >= 0) & (codes % parts == part)
+        result = pd.Series(values[mask]).groupby(codes[mask]).agg(list(aggs))
+        return result
+    finally:
+        del codes, values
+        codes_shm.close()
+        values_shm.close()
+
+def _merge_partials(partials, ngroups, dtype):
+    sums = np.zeros(ngroups, dtype=np.int64 if dtype.kind in "iub" else np.float64)
+    sizes = np.zeros(ngroups, dtype=np.int64)
+    counts = np.zeros(ngroups, dtype=np.int64)
+    mins = np.full(ngroups, np.nan)
+    maxs = np.full(ngroups, np.nan)
+    for part_sizes, index, part in partials:
+        sizes[:len(part_sizes)] += part_sizes
+        sums[index] += part["sum"]
+        counts[index] += part["count"]
+        mins[index] = np.fmin(mins[index], part["min"])
+        maxs[index] = np.fmax(maxs[index], part["max"])
+    return sizes, sums, counts, mins, maxs
+
+def aggregate_codes(codes, ngroups, values, aggs, workers=None):
+    """
+    Aggregate values by integer group codes (-1 = missing key) in worker processes.
+    Returns a DataFrame indexed 0..ngroups-1 with one column per aggregation.
+    Aggregations are pandas names (or picklable callables).
+    """
+    workers = workers or default_workers()
+    values = np.asarray(values)
+    if values.dtype.kind == "b":
+        values = values.astype(np.int64)
+    shared_codes = _SharedArray(np.asarray(codes, dtype=np.int64))
+    shared_values = _SharedArray(values)
+    try:
+        executor = _get_executor(workers)
+        out = {}
+        decomposable = [a for a in aggs if isinstance(a, str) and a in DECOMPOSABLE]
+        others = [a for a in aggs if a not in decomposable]
+        if decomposable:
+            bounds = np.linspace(0, len(values), workers + 1).astype(int)
+            futures = [executor.submit(_partial_worker, shared_codes.spec, shared_values.spec,
+                                       int(bounds[i]), int(bounds[i + 1]))
+                       for i in range(workers) if bounds[i + 1] > bounds[i]]
+            sizes, sums, counts, mins, maxs = _merge_partials([f.result() for f in futures], ngroups, values.dtype)
+            merged = {
+                "sum": sums,
+                "count": counts,
+                "size": sizes,
+                "mean": sums / np.where(counts > 0, counts, np.nan),
+                "min": mins,
+                "max": maxs,
+            }
+            for agg in decomposable:
+                column = merged[agg]
+                if agg in ("min", "max") and values.dtype.kind in "iu" and not np.isnan(column).any():
+                    column = column.astype(values.dtype)
+                out[agg] = column
+        if others:
+            futures = [executor.submit(_group_partition_worker, shared_codes.spec, shared_values.spec,
+                                       part, workers, tuple(others))
+                       for part in range(workers)]
+            combined = pd.concat([f.result() for f in futures]).reindex(range(ngroups))
+            for agg in others:
+                out[_agg_name(agg)] = combined[_agg_name(agg)].to_numpy()
+        return pd.DataFrame({_agg_name(agg): out[_agg_name(agg)] for agg in aggs})
+    finally:
+        shared_codes.release()
+        shared_values.release()
+
+def group_stats(df, group_col, target_col, aggs=("mean", "sum", "max", "min"), workers=None):
+    """Parallel df.groupby(group_col)[target_col].agg(aggs).reset_index()."""
+    codes, uniques = pd.factorize(df[group_col], sort=True)
+    result = aggregate_codes(codes, len(uniques), df[target_col].to_numpy(), list(aggs), workers)
+    result.insert(0, group_col, np.asarray(uniques))
+    return result
+
+def pivot_table(df, index, columns, values, aggfunc="mean", workers=None):
+    """Parallel pd.pivot_table for a single index, columns and values column."""
+    row_codes, row_keys = pd.factorize(df[index], sort=True)
+    col_codes, col_keys = pd.factorize(df[columns], sort=True)
+    combined = np.where((row_codes >= 0) & (col_codes >= 0),
+                        row_codes.astype(np.int64) * len(col_keys) + col_codes, -1)
+    ngroups = len(row_keys) * len(col_keys)
+    aggs = [aggfunc] if aggfunc == "size" else [aggfunc, "size"]
+    result = aggregate_codes(combined, ngroups, df[values].to_numpy(), aggs, workers)
+    # Combinations with no rows are missing in pivot_table, not zero.
+    cells = np.where(result["size"].to_numpy() > 0, result[_agg_name(aggfunc)].to_numpy(dtype=float), np.nan)
+    table = pd.DataFrame(cells.reshape(len(row_keys), len(col_keys)),
+                         index=pd.Index(row_keys, name=index),
+                         columns=pd.Index(col_keys, name=columns))
+    return table.dropna(how="all").dropna(axis=1, how="all")
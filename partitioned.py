@@ -0,0 +1,343 @@
+import os
+import json
+import hashlib
+from collections import OrderedDict
+from collections.abc import Mapping
+import numpy as np
+import pandas as pd
+import logic
+import file_index
+import streaming_stats
+
+# A dataset split into partitions (a folder of same-schema CSVs, or the groups of
+# a "table" column) that are only loaded when touched. Each partition keeps
+# per-column min/max statistics, so a filter skips partitions it cannot match, and
+# statistics over the union are combined partition by partition instead of
+# concatenating everything. Folder statistics persist next to the file index, keyed
+# on each file's size and mtime, so pruning works without reopening the files.
+
+STATS_DIR = os.path.join(os.path.dirname(file_index.INDEX_DIR), "partition_stats")
+STATS_VERSION = 1
+MAX_LOADED = 4  # partitions kept in memory at once
+PARTIAL_AGGS = {"sum", "count", "mean", "min", "max"}  # combinable from per-partition partials
+
+class SchemaMismatch(ValueError):
+    """Raised when the files of a folder do not share one header."""
+
+def _kind(series):
+    # The same split as the filter engine: numbers and dates compare by value, the rest as text.
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return "time"
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        return "number"
+    return "text"
+
+def _jsonable_bound(kind, value):
+    if value is None or pd.isna(value):
+        return None
+    if kind == "time":
+        return pd.Timestamp(value).isoformat()
+    if kind == "number":
+        return float(value)
+    return str(value)
+
+def column_stats(series):
+    """[kind, min, max, missing count] for one column; min/max are None when every value is missing."""
+    kind = _kind(series)
+    missing = int(series.isna().sum())
+    present = series.dropna()
+    if not len(present):
+        return [kind, None, None, missing]
+    if kind == "text":
+        labels = pd.Index(pd.unique(present.astype(str))).sort_values()
+        return [kind, labels[0], labels[-1], missing]
+    return [kind, _jsonable_bound(kind, present.min()), _jsonable_bound(kind, present.max()), missing]
+
+def frame_stats(df):
+    return {str(col): column_stats(df[col]) for col in df.columns}
+
+def grouped_stats(df, codes, count, columns=None):
+    """frame_stats() of each of `count` row groups given by codes (for `columns`, default all), one groupby per column."""
+    stats = [{} for _ in range(count)]
+    present_rows = codes >= 0
+    group = codes[present_rows]
+    for col in (df.columns if columns is None else columns):
+        series = df[col]
+        kind = _kind(series)
+        values = series[present_rows].reset_index(drop=True)
+        missing = np.bincount(group, weights=values.isna().to_numpy(), minlength=count).astype(int)
+        if kind == "text":
+            # Min/max of the sorted label codes gives the text min/max.
+            label_codes, labels = pd.factorize(values.astype(str).where(values.notna()), sort=True)
+            values = pd.Series(np.where(label_codes >= 0, label_codes, np.nan))
+            bound = lambda v: None if pd.isna(v) else str(labels[int(v)])
+        else:
+            bound = lambda v: _jsonable_bound(kind, v)
+        bounds = values.groupby(group).agg(["min", "max"]).reindex(range(count))
+        for group_stats, low, high, gaps in zip(stats, bounds["min"].tolist(), bounds["max"].tolist(), missing.tolist()):
+            group_stats[str(col)] = [kind, bound(low), bound(high), gaps]
+    return stats
+
+def _coerce(kind, bound, value):
+    if kind == "number":
+        return float(value)
+    if kind == "time":
+        stamp = pd.Timestamp(value)
+        if bound.tz is not None and stamp.tz is None:
+            stamp = stamp.tz_localize(bound.tz)
+        return stamp
+    return str(value)
+
+def may_match(stats, condition):
+    """False only when a (column, operator, value) condition cannot match any row with these statistics."""
+    column, op, value = condition
+    if column not in stats:
+        return True
+    kind, low, high, missing = stats[column]
+    if op == "!=":
+        # Missing values count as "not equal", as in the filter engine.
+        if missing or low is None:
+            return bool(missing)
+    elif low is None:
+        return False
+    if kind == "time":
+        low, high = pd.Timestamp(low), pd.Timestamp(high)
+    try:
+        if op == "between":
+            lower, upper = (_coerce(kind, low, v) for v in value)
+            return high >= lower and low <= upper
+        values = [_coerce(kind, low, v) for v in (value if isinstance(value, (list, tuple)) else [value])]
+    except (TypeError, ValueError):
+        return True
+    if op in ("==", "in"):
+        return any(low <= v <= high for v in values)
+    if op == "!=":
+        return not (low == high == values[0])
+    v = values[0]
+    return {">": high > v, ">=": high >= v, "<": low < v, "<=": low <= v}.get(op, True)
+
+class Partition:
+    __slots__ = ("name", "loader", "rows", "stats", "signature")
+
+    def __init__(self, name, loader, rows=None, stats=None, signature=None):
+        self.name = name
+        self.loader = loader  # () -> DataFrame
+        self.rows = rows
+        self.stats = stats  # column -> [kind, min, max, missing]; None until known
+        self.signature = signature  # (size, mtime_ns) for file partitions
+
+    def may_match(self, conditions):
+        return self.stats is None or all(may_match(self.stats, condition) for condition in conditions)
+
+def stats_path(folder, stats_dir=None):
+    digest = hashlib.sha1(os.path.abspath(folder).encode("utf-8")).hexdigest()
+    return os.path.join(stats_dir or STATS_DIR, f"{digest}.json")
+
+class PartitionedDataset(Mapping):
+    """
+    Read-only mapping of partition name -> DataFrame, loading each partition on
+    access and keeping at most MAX_LOADED of them in memory.
+    """
+    def __init__(self, partitions, columns=None, stats_file=None):
+        self.partitions = OrderedDict((p.name, p) for p in partitions)
+        self.columns = columns
+        self.stats_file = stats_file  # where folder statistics are saved, or None
+        self._loaded = OrderedDict()
+        self._groups = None  # (DataFrame, group codes) for from_column datasets
+
+    @classmethod
+    def from_folder(cls, folder, stats_dir=None):
+        """Every CSV in folder as one partition; all files must have the same header."""
+        infos = file_index.FolderIndex(folder).list_files()
+        if not infos:
+            raise FileNotFoundError(f"No CSV files in {folder}.")
+        header = None
+        for info in infos:
+            file_index.sniff(info)
+            if header is None:
+                header = info.header
+            elif info.header != header:
+                raise SchemaMismatch(f"{info.name} has columns {info.header}, expected {header}.")
+        path = stats_path(folder, stats_dir)
+        stored = {}
+        try:
+            with open(path, "r") as f:
+                saved = json.load(f)
+            if saved.get("version") == STATS_VERSION:
+                stored = saved.get("files", {})
+        except (OSError, ValueError):
+            pass
+        partitions = []
+        for info in infos:
+            signature = (info.size, info.mtime_ns)
+            rows, stats = None, None
+            known = stored.get(info.name)
+            if known is not None and tuple(known[0]) == signature:
+                rows, stats = known[1], known[2]
+            partitions.append(Partition(info.name, lambda p=info.path: logic.load_csv(p),
+                                        rows=rows, stats=stats, signature=signature))
+        columns = streaming_stats.read_header(infos[0].path)
+        return cls(partitions, columns, stats_file=path)
+
+    @classmethod
+    def from_column(cls, df, column="table"):
+        """
+        The row groups of df[column] as partitions, gathered only when accessed.
+        A column's per-group statistics are computed the first time a filter on it prunes.
+        """
+        codes, names = pd.factorize(df[column], sort=True)
+        present = np.flatnonzero(codes >= 0)
+        order = present[np.argsort(codes[present], kind="stable")]
+        bounds = np.concatenate([[0], np.cumsum(np.bincount(codes[present], minlength=len(names)))])
+        partitions = []
+        for i, name in enumerate(names):
+            rows = order[bounds[i]:bounds[i + 1]]
+            partitions.append(Partition(name, lambda rows=rows: df.take(rows).reset_index(drop=True),
+                                        rows=len(rows), stats={}))
+        dataset = cls(partitions, list(df.columns))
+        dataset._groups = (df, codes)
+        return dataset
+
+    @classmethod
+    def from_frames(cls, frames):
+        """Wrap DataFrames already in memory (name -> DataFrame or loader callable)."""
+        partitions = [Partition(name, frame if callable(frame) else (lambda frame=frame: frame))
+                      for name, frame in frames.items()]
+        return cls(partitions)
+
+    def __getitem__(self, name):
+        if name in self._loaded:
+            self._loaded.move_to_end(name)
+            return self._loaded[name]
+        partition = self.partitions[name]
+        df = partition.loader()
+        if partition.stats is None:
+            partition.rows, partition.stats = len(df), frame_stats(df)
+        if self.columns is None:
+            self.columns = list(df.columns)
+        self._loaded[name] = df
+        while len(self._loaded) > MAX_LOADED:
+            self._loaded.popitem(last=False)
+        return df
+
+    def __iter__(self):
+        return iter(self.partitions)
+
+    def __len__(self):
+        return len(self.partitions)
+
+    @property
+    def num_rows(self):
+        """Total rows, or None while some partition has not been counted."""
+        counts = [p.rows for p in self.partitions.values()]
+        return None if None in counts else sum(counts)
+
+    def prune(self, conditions=None):
+        """Names of the partitions that may hold rows matching every condition."""
+        conditions = conditions or []
+        if self._groups is not None:
+            self._add_group_stats([condition[0] for condition in conditions])
+        return [name for name, p in self.partitions.items() if p.may_match(conditions)]
+
+    def _add_group_stats(self, columns):
+        df, codes = self._groups
+        partitions = list(self.partitions.values())
+        known = partitions[0].stats if partitions else {}
+        columns = [col for col in dict.fromkeys(columns) if col in df.columns and str(col) not in known]
+        if columns:
+            for partition, stats in zip(partitions, grouped_stats(df, codes, len(partitions), columns)):
+                partition.stats.update(stats)
+
+    def frames(self, conditions=None, columns=None):
+        """Yield (name, DataFrame) for each partition that is not pruned, filtered and projected."""
+        for name in self.prune(conditions):
+            df = self[name]
+            rows = logic.resolve_filter(df, conditions)
+            if rows is not None:
+                if not len(rows):
+                    continue
+                df = df.take(rows)
+            yield name, (df if columns is None else df[list(columns)])
+
+    def compute_statistics(self, progress=None, is_cancelled=None):
+        """Load every partition without statistics once, then save them for the next session."""
+        missing = [name for name, p in self.partitions.items() if p.stats is None]
+        for done, name in enumerate(missing, 1):
+            if is_cancelled is not None and is_cancelled():
+                break
+            partition = self.partitions[name]
+            df = partition.loader()
+            partition.rows, partition.stats = len(df), frame_stats(df)
+            if self.columns is None:
+                self.columns = list(df.columns)
+            if progress is not None:
+                progress(done, len(missing))
+        self.save_statistics()
+
+    def save_statistics(self):
+        if self.stats_file is None:
+            return
+        files = {name: [list(p.signature), p.rows, p.stats] for name, p in self.partitions.items()
+                 if p.stats is not None and p.signature is not None}
+        os.makedirs(os.path.dirname(self.stats_file), exist_ok=True)
+        tmp = f"{self.stats_file}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({"version": STATS_VERSION, "files": files}, f)
+        os.replace(tmp, self.stats_file)
+
+    def to_frame(self, conditions=None, columns=None):
+        """Concatenate the matching rows of every partition; only use when a DataFrame is needed."""
+        parts = [df for _, df in self.frames(conditions, columns)]
+        if not parts:
+            return pd.DataFrame(columns=columns if columns is not None else self.columns)
+        return pd.concat(parts, ignore_index=True)
+
+    def describe(self, conditions=None):
+        """describe(include="all") over the union; quartiles are sampled above 100,000 values."""
+        describer = streaming_stats.StreamingDescriber()
+        for _, df in self.frames(conditions):
+            describer.update(df)
+        return describer.result()
+
+    def _partials(self, keys, target, conditions):
+        # size counts every row of a cell, count only the non-missing values.
+        partials = [df.groupby(keys)[target].agg(["sum", "count", "min", "max", "size"])
+                    for _, df in self.frames(conditions, columns=list(keys) + [target])]
+        if not partials:
+            return None
+        combined = pd.concat(partials)
+        return combined.groupby(level=list(range(len(keys)))).agg(
+            {"sum": "sum", "count": "sum", "min": "min", "max": "max", "size": "sum"})
+
+    @staticmethod
+    def _finish(partials, agg):
+        if agg == "mean":
+            return partials["sum"] / partials["count"].where(partials["count"] > 0)
+        return partials[agg]
+
+    def group_aggregate(self, group_col, target_col, aggs=("mean", "sum", "max", "min"), conditions=None):
+        """Same result as logic.group_aggregate on the concatenated partitions."""
+        if not set(aggs) <= PARTIAL_AGGS:
+            df = self.to_frame(conditions, columns=[group_col, target_col])
+            return logic.group_aggregate(df, group_col, target_col, aggs, parallel=False)
+        partials = self._partials([group_col], target_col, conditions)
+        if partials is None:
+            return pd.DataFrame(columns=[group_col] + list(aggs))
+        out = pd.DataFrame({agg: self._finish(partials, agg) for agg in aggs})
+        out.index.name = group_col
+        return out.reset_index()
+
+    def pivot_table(self, index, columns, values, aggfunc="mean", conditions=None):
+        """Same result as logic.create_pivot_table on the concatenated partitions."""
+        if not (isinstance(aggfunc, str) and aggfunc in PARTIAL_AGGS
+                and all(isinstance(name, str) for name in (index, columns, values))):
+            df = self.to_frame(conditions)
+            return logic.create_pivot_table(df, index, columns, values, aggfunc, parallel=False)
+        partials = self._partials([index, columns], values, conditions)
+        if partials is None:
+            return pd.DataFrame()
+        result = self._finish(partials, aggfunc)
+        # Only cells without rows are empty; as in pivot_table, a cell whose values are all
+        # missing has sum and count 0 and a missing mean, min and max.
+        result = result.where(partials["size"] > 0).unstack(columns)
+        return result.dropna(axis=1, how="all").dropna(axis=0, how="all")
@@ -0,0 +1,231 @@
+import os
+import sys
+import json
+import time
+import inspect
+import functools
+import threading
+from collections import deque
+
+# Opt-in timing of logic functions, graph preparation and page actions.
+# While recording is off, span() hands back a shared no-op context and the
+# logic module runs its original, unwrapped functions, so the cost is one flag
+# check per page action. Spans record wall time, the thread, row counts and the
+# change in process resident memory (approximate: every thread shares it), and
+# export as Chrome trace-event JSON (open in chrome://tracing or ui.perfetto.dev).
+# Enable with --profile, DATA_APP_PROFILE=1, or DATA_APP_PROFILE=<trace.json> to
+# also write the trace on exit. Kept free of pandas/Qt so it can load at startup.
+
+MAX_EVENTS = 100_000
+GRAPH_METHODS = ("prepare_data", "get_statistics")
+
+_enabled = False
+_epoch_ns = time.perf_counter_ns()
+_events = deque(maxlen=MAX_EVENTS)
+_thread_names = {}  # thread id -> name, for the trace's thread labels
+_local = threading.local()
+_modules = []  # modules registered for instrumentation
+_patched = []  # (owner, attribute, original) while recording
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NULL_SPAN = _NullSpan()
+
+try:
+    _PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+except (AttributeError, ValueError, OSError):
+    _PAGE_SIZE = None
+
+def resident_bytes():
+    """Current resident set size of the process, or None where it cannot be read cheaply."""
+    if _PAGE_SIZE is None:
+        return None
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return None
+
+def row_count(obj):
+    """Rows in a DataFrame/Series/array, or None for anything else."""
+    shape = getattr(obj, "shape", None)
+    if isinstance(shape, tuple) and shape:
+        return shape[0]
+    return None
+
+class Span:
+    __slots__ = ("name", "category", "args", "start", "rss")
+
+    def __init__(self, name, category, args):
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def __enter__(self):
+        stack = getattr(_local, "stack", None)
+        if stack is None:
+            stack = _local.stack = []
+        stack.append(self)
+        self.rss = resident_bytes()
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter_ns()
+        _local.stack.pop()
+        rss = resident_bytes()
+        if rss is not None and self.rss is not None:
+            self.args["mem_delta"] = rss - self.rss
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        thread = threading.current_thread()
+        _thread_names[thread.ident] = thread.name
+        _events.append({
+            "name": self.name, "cat": self.category, "ph": "X",
+            "ts": (self.start - _epoch_ns) / 1000, "dur": (end - self.start) / 1000,
+            "pid": os.getpid(), "tid": thread.ident, "args": self.args,
+        })
+        return False
+
+def span(name, category="app", **args):
+    """Context manager timing a block; a no-op while recording is off."""
+    if not _enabled:
+        return _NULL_SPAN
+    return Span(name, category, args)
+
+def annotate(**args):
+    """Attach values (such as rows=...) to the innermost open span on this thread."""
+    if not _enabled:
+        return
+    stack = getattr(_local, "stack", None)
+    if stack:
+        stack[-1].args.update(args)
+
+def traced(name, category="app"):
+    """Decorator form of span() for page methods and slots."""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with Span(name, category, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+def _instrumented(func, name, category, method=False):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if method:
+            rows = row_count(getattr(args[0], "df", None)) if args else None
+            label = f"{type(args[0]).__name__}.{name}" if args else name
+        else:
+            rows = next((r for r in map(row_count, args) if r is not None), None)
+            label = name
+        current = Span(label, category, {} if rows is None else {"rows": rows})
+        with current:
+            result = func(*args, **kwargs)
+            out_rows = row_count(result)
+            if out_rows is not None:
+                current.args["result_rows"] = out_rows
+            return result
+    wrapper.__wrapped__ = func
+    return wrapper
+
+def _instrument(module):
+    """Wrap the module's public functions and its graph classes' prepare_data/get_statistics."""
+    category = module.__name__
+    for attr, value in list(vars(module).items()):
+        if attr.startswith("_") or getattr(value, "__module__", None) != module.__name__:
+            continue
+        if inspect.isfunction(value):
+            _patched.append((module, attr, value))
+            setattr(module, attr, _instrumented(value, attr, category))
+        elif inspect.isclass(value):
+            for method in GRAPH_METHODS:
+                original = value.__dict__.get(method)
+                if inspect.isfunction(original):
+                    _patched.append((value, method, original))
+                    setattr(value, method, _instrumented(original, method, category, method=True))
+
+def register_module(module):
+    """Have module instrumented whenever recording is on (now, or once enabled)."""
+    if module not in _modules:
+        _modules.append(module)
+        if _enabled:
+            _instrument(module)
+
+def enabled():
+    return _enabled
+
+def enable():
+    global _enabled
+    if _enabled:
+        return
+    _enabled = True
+    for module in _modules:
+        _instrument(module)
+
+def disable():
+    global _enabled
+    _enabled = False
+    # Restore the original functions so nothing is left on the hot path.
+    while _patched:
+        owner, attr, original = _patched.pop()
+        setattr(owner, attr, original)
+
+def clear():
+    _events.clear()
+
+def events():
+    return list(_events)
+
+def summary():
+    """
+    Per-name totals as a list of dicts (name, calls, total_ms, mean_ms, max_ms,
+    rows, mem_delta), slowest total first. rows is the largest input row count seen.
+    """
+    totals = {}
+    for event in list(_events):
+        entry = totals.get(event["name"])
+        if entry is None:
+            entry = totals[event["name"]] = {"name": event["name"], "calls": 0, "total_ms": 0.0,
+                                             "max_ms": 0.0, "rows": None, "mem_delta": 0}
+        ms = event["dur"] / 1000
+        entry["calls"] += 1
+        entry["total_ms"] += ms
+        entry["max_ms"] = max(entry["max_ms"], ms)
+        rows = event["args"].get("rows")
+        if rows is not None:
+            entry["rows"] = rows if entry["rows"] is None else max(entry["rows"], rows)
+        entry["mem_delta"] += event["args"].get("mem_delta", 0)
+    for entry in totals.values():
+        entry["mean_ms"] = entry["total_ms"] / entry["calls"]
+    return sorted(totals.values(), key=lambda entry: entry["total_ms"], reverse=True)
+
+def export_trace(path):
+    """Write the recorded spans as Chrome trace-event JSON."""
+    pid = os.getpid()
+    meta = [{"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+            for tid, name in list(_thread_names.items())]
+    tmp = f"{path}.{pid}.tmp"
+    with open(tmp, "w") as f:
+        json.dump({"traceEvents": meta + events(), "displayTimeUnit": "ms"}, f, default=str)
+    os.replace(tmp, path)
+    return path
+
+def enable_from_environment(argv=None):
+    """
+    Turn recording on for --profile or DATA_APP_PROFILE. Returns the trace path to
+    write on exit when DATA_APP_PROFILE names a .json file, otherwise None.
+    """
+    argv = sys.argv if argv is None else argv
+    setting = os.environ.get("DATA_APP_PROFILE", "")
+    if "--profile" in argv or setting not in ("", "0"):
+        enable()
+    return setting if setting.lower().endswith(".json") else None
@@ -0,0 +1,109 @@
+import sys
+import weakref
+import itertools
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+
+# Memoization for results derived from a DataFrame (graph data, statistics).
+# Keys start with a dataframe token, so results for a frame are dropped together
+# when a new file replaces it. Frames are treated as immutable once loaded.
+
+_token_counter = itertools.count(1)
+_df_tokens = {}  # id(df) -> (weakref to df, token)
+_caches = weakref.WeakSet()  # every ResultCache, so a dead frame is purged from all of them
+
+def dataframe_token(df):
+    """Return an integer that identifies df for as long as it is alive."""
+    key = id(df)
+    entry = _df_tokens.get(key)
+    if entry is not None and entry[0]() is df:
+        return entry[1]
+    token = next(_token_counter)
+
+    def forget(_ref, key=key, token=token):
+        current = _df_tokens.get(key)
+        if current is not None and current[1] == token:
+            del _df_tokens[key]
+        for cache in list(_caches):
+            cache.invalidate(token)
+
+    _df_tokens[key] = (weakref.ref(df, forget), token)
+    return token
+
+def estimate_size(obj):
+    """Rough size in bytes; long lists are estimated from a sample of their items."""
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(index=True).sum())
+    if isinstance(obj, pd.Series):
+        return int(obj.memory_usage(index=True))
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(estimate_size(k) + estimate_size(v) for k, v in obj.items())
+    if isinstance(obj, (list, tuple)):
+        if not obj:
+            return sys.getsizeof(obj)
+        sample = obj[:100]
+        per_item = sum(estimate_size(item) for item in sample) / len(sample)
+        return sys.getsizeof(obj) + int(per_item * len(obj))
+    return sys.getsizeof(obj)
+
+class ResultCache:
+    """LRU cache bounded by entry count and estimated bytes."""
+    def __init__(self, max_entries=128, max_bytes=256 * 1024 ** 2):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()  # key -> (value, size)
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        _caches.add(self)
+
+    def get_or_compute(self, key, compute):
+        """
+        Return the cached value for key, computing and storing it on a miss.
+        Keys are tuples whose second item is the dataframe token.
+        """
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return self.entries[key][0]
+            self.misses += 1
+        value = compute()
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            return value
+        with self.lock:
+            if key in self.entries:
+                self.total_bytes -= self.entries.pop(key)[1]
+            self.entries[key] = (value, size)
+            self.total_bytes += size
+            while self.entries and (len(self.entries) > self.max_entries or self.total_bytes > self.max_bytes):
+                _, (_, old_size) = self.entries.popitem(last=False)
+                self.total_bytes -= old_size
+        return value
+
+    def invalidate(self, token):
+        """Drop every entry computed from the frame with this token."""
+        with self.lock:
+            for key in [k for k in self.entries if len(k) > 1 and k[1] == token]:
+                self.total_bytes -= self.entries.pop(key)[1]
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.total_bytes = 0
+
+def clear_all():
+    """Empty every cache, e.g. when a new file replaces the loaded data."""
+    for cache in list(_caches):
+        cache.clear()
+
+shared_cache = ResultCache()
+# Large per-column structures (sorted values for histograms) get their own budget
+# so they do not push every small result out of shared_cache.
+index_cache = ResultCache(max_entries=8, max_bytes=2 * 1024 ** 3)
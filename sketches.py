@@ -0,0 +1,288 @@
+import numpy as np
+import pandas as pd
+
+# Mergeable sketches for approximate statistics over very large columns.
+# Each one is updated chunk by chunk with numpy/pandas operations, can be merged
+# with another sketch of the same kind (e.g. built on another partition), and
+# reports an error bound next to its estimate:
+#   QuantileSketch  KLL-style compactors; quantiles within a rank error
+#   HyperLogLog     distinct counts within a relative error
+#   FrequentItems   Misra-Gries summary; mode and heavy hitters with a count bound
+#   MomentSketch    count, mean and central moments; std and skew (exact up to rounding)
+
+CHUNK_SIZE = 1_000_000  # values per update step, bounds scratch memory
+CONFIDENCE_Z = 2.576  # quoted bounds hold with about 99% probability
+
+def iter_chunks(values, chunk_size=CHUNK_SIZE):
+    for start in range(0, len(values), chunk_size):
+        yield values[start:start + chunk_size]
+
+class QuantileSketch:
+    """
+    Levels of buffers where an item on level h stands for 2**h input values. A full
+    level sorts blocks of k items and promotes every other item (random offset) to
+    the next level, so memory stays O(k log n). Each compaction moves any rank by at
+    most 2**h, with zero mean; both the worst case and the variance are tracked.
+    Fewer than 2k values are kept exactly.
+    """
+    def __init__(self, k=2048, seed=0):
+        self.k = k - k % 2
+        self.levels = [np.empty(0)]
+        self.n = 0
+        self.min = np.nan
+        self.max = np.nan
+        self.max_rank_error = 0.0  # worst case, in values
+        self.rank_variance = 0.0
+        self.rng = np.random.default_rng(seed)
+
+    def __sizeof__(self):
+        return object.__sizeof__(self) + sum(level.nbytes for level in self.levels)
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float)
+        for chunk in iter_chunks(values[~np.isnan(values)]):
+            if not len(chunk):
+                continue
+            self.n += len(chunk)
+            self.min = np.nanmin([self.min, chunk.min()])
+            self.max = np.nanmax([self.max, chunk.max()])
+            self.levels[0] = np.concatenate([self.levels[0], chunk])
+            self._compress()
+        return self
+
+    def merge(self, other):
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for h, level in enumerate(other.levels):
+            self.levels[h] = np.concatenate([self.levels[h], level])
+        self.n += other.n
+        self.min = np.nanmin([self.min, other.min])
+        self.max = np.nanmax([self.max, other.max])
+        self.max_rank_error += other.max_rank_error
+        self.rank_variance += other.rank_variance
+        self._compress()
+        return self
+
+    def _compress(self):
+        k = self.k
+        h = 0
+        while h < len(self.levels):
+            level = self.levels[h]
+            if len(level) >= 2 * k:
+                blocks = len(level) // k
+                kept = level[blocks * k:]
+                sorted_blocks = np.sort(level[:blocks * k].reshape(blocks, k), axis=1)
+                offsets = self.rng.integers(0, 2, size=blocks)
+                promoted = sorted_blocks[np.arange(blocks)[:, None], offsets[:, None] + 2 * np.arange(k // 2)]
+                weight = 2.0 ** h
+                self.max_rank_error += blocks * weight
+                self.rank_variance += blocks * weight * weight
+                self.levels[h] = kept
+                if h + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                self.levels[h + 1] = np.concatenate([self.levels[h + 1], promoted.ravel()])
+            h += 1
+
+    @property
+    def exact(self):
+        return self.max_rank_error == 0
+
+    def rank_error(self):
+        """Bound on |estimated rank - true rank| as a fraction of n (about 99% confidence)."""
+        if self.n == 0 or self.exact:
+            return 0.0
+        return float(min(self.max_rank_error, CONFIDENCE_Z * np.sqrt(self.rank_variance)) / self.n)
+
+    def quantile(self, q):
+        """Value at quantile q (scalar or list); exact, like np.quantile, while nothing was compacted."""
+        if self.n == 0:
+            return np.nan if np.isscalar(q) else [np.nan] * len(q)
+        if self.exact:
+            result = np.quantile(self.levels[0], q)
+            return float(result) if np.isscalar(q) else result.tolist()
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(level), 2.0 ** h) for h, level in enumerate(self.levels)])
+        order = np.argsort(items, kind="stable")
+        items, cumulative = items[order], np.cumsum(weights[order])
+        qs = np.atleast_1d(np.asarray(q, dtype=float))
+        positions = np.minimum(np.searchsorted(cumulative, qs * self.n, side="left"), len(items) - 1)
+        result = items[positions]
+        # The extremes are tracked exactly.
+        result = np.where(qs <= 0, self.min, np.where(qs >= 1, self.max, result))
+        return float(result[0]) if np.isscalar(q) else result.tolist()
+
+class MomentSketch:
+    """
+    Count, mean and the second and third central moment sums, combined chunk by
+    chunk with the pairwise update formulas (Chan et al., Pebay). std and skew
+    match pandas' sample std and adjusted skew up to floating point rounding.
+    """
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.m3 = 0.0
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float)
+        for chunk in iter_chunks(values[~np.isnan(values)]):
+            if len(chunk):
+                other = MomentSketch()
+                other.n = len(chunk)
+                other.mean = float(chunk.mean())
+                deviations = chunk - other.mean
+                other.m2 = float(np.dot(deviations, deviations))
+                other.m3 = float(np.dot(deviations * deviations, deviations))
+                self.merge(other)
+        return self
+
+    def merge(self, other):
+        if other.n == 0:
+            return self
+        n_a, n_b = self.n, other.n
+        n = n_a + n_b
+        delta = other.mean - self.mean
+        self.m3 += (other.m3 + delta ** 3 * n_a * n_b * (n_a - n_b) / n ** 2
+                    + 3 * delta * (n_a * other.m2 - n_b * self.m2) / n)
+        self.m2 += other.m2 + delta ** 2 * n_a * n_b / n
+        self.mean += delta * n_b / n
+        self.n = n
+        return self
+
+    def std(self):
+        return float(np.sqrt(self.m2 / (self.n - 1))) if self.n > 1 else np.nan
+
+    def skew(self):
+        n = self.n
+        if n < 3:
+            return np.nan
+        if self.m2 == 0:
+            return 0.0
+        g1 = np.sqrt(n) * self.m3 / self.m2 ** 1.5
+        return float(g1 * np.sqrt(n * (n - 1)) / (n - 2))
+
+def _floor_log2(values):
+    # frexp is exact on 32-bit halves, so 64-bit hashes are split before converting to float.
+    high = (values >> np.uint64(32)).astype(np.float64)
+    low = (values & np.uint64(0xFFFFFFFF)).astype(np.float64)
+    return np.where(high > 0, np.frexp(high)[1] + 31, np.frexp(low)[1] - 1)
+
+def distinct_values(values):
+    """The distinct non-missing values of a Series or array chunk."""
+    values = pd.Series(values) if not isinstance(values, pd.Series) else values
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        codes = np.unique(values.cat.codes.to_numpy())
+        return values.cat.categories.take(codes[codes >= 0])
+    return pd.Index(values.dropna().unique())
+
+def hash_values(values):
+    """64-bit hashes; equal values hash alike across chunks of one column."""
+    values = np.asarray(values)
+    return pd.util.hash_array(values.astype(object) if values.dtype.kind in "OUT" else values)
+
+class HyperLogLog:
+    """Distinct-count sketch with 2**p one-byte registers; standard error 1.04 / sqrt(2**p)."""
+    def __init__(self, p=14):
+        self.p = p
+        self.registers = np.zeros(1 << p, dtype=np.uint8)
+
+    def __sizeof__(self):
+        return object.__sizeof__(self) + self.registers.nbytes
+
+    def update(self, values):
+        """Add the values of a Series or array; missing values are ignored."""
+        for chunk in iter_chunks(values):
+            self.update_distinct(distinct_values(chunk))
+        return self
+
+    def update_distinct(self, values):
+        """Add values that are already distinct (repeats cannot change the registers)."""
+        p = np.uint64(self.p)
+        if len(values):
+            hashes = hash_values(values)
+            buckets = (hashes >> (np.uint64(64) - p)).astype(np.intp)
+            rest = hashes << p
+            # Position of the first 1 bit after the bucket bits.
+            ranks = np.where(rest == 0, 64 - self.p + 1, 64 - _floor_log2(rest)).astype(np.uint8)
+            np.maximum.at(self.registers, buckets, ranks)
+        return self
+
+    def merge(self, other):
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def estimate(self):
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and zeros:
+            # Linear counting is more accurate for small cardinalities.
+            return float(m * np.log(m / zeros))
+        return float(raw)
+
+    def relative_error(self):
+        """Bound on |estimate - true| / true (about 99% confidence)."""
+        return float(CONFIDENCE_Z * 1.04 / np.sqrt(len(self.registers)))
+
+class FrequentItems:
+    """
+    Misra-Gries summary (the mergeable form of Space-Saving) keeping at most
+    `capacity` counters. A kept item's true count lies in [count, count + error],
+    and any item more frequent than error is kept; error <= n / (capacity + 1).
+    Exact while the column has no more than capacity distinct values.
+    """
+    def __init__(self, capacity=1024):
+        self.capacity = capacity
+        self.counts = pd.Series(dtype="int64")
+        self.n = 0
+        self.error = 0
+
+    def __sizeof__(self):
+        return object.__sizeof__(self) + int(self.counts.memory_usage(index=True, deep=True))
+
+    def update(self, values):
+        """Add the values of a Series or array; missing values are ignored."""
+        for chunk in iter_chunks(values):
+            self.update_counts(pd.Series(chunk).value_counts(sort=False), len(chunk))
+        return self
+
+    def update_counts(self, counts, n):
+        """Add a chunk summarised as value -> count (e.g. value_counts()) covering n values."""
+        counts = counts[counts > 0].astype("int64")
+        if len(counts) > self.capacity + 1:
+            # Values outside the chunk's top capacity + 1 that have no counter cannot
+            # survive the cut below, nor change it, so they are dropped before aligning.
+            top = counts.nlargest(self.capacity + 1)
+            counts = counts[counts.index.isin(top.index) | counts.index.isin(self.counts.index)]
+        self.n += n
+        combined = self.counts.add(counts, fill_value=0).astype("int64") if len(self.counts) else counts
+        if len(combined) > self.capacity:
+            # Subtract the (capacity + 1)-th largest count from every counter and drop the non-positive ones.
+            cut = int(combined.nlargest(self.capacity + 1).iloc[-1])
+            combined = combined - cut
+            combined = combined[combined > 0]
+            self.error += cut
+        self.counts = combined
+        return self
+
+    def merge(self, other):
+        self.error += other.error
+        return self.update_counts(other.counts, other.n)
+
+    @property
+    def exact(self):
+        return self.error == 0
+
+    def top(self, k=10):
+        """[(item, lower count, upper count)] for the k most frequent kept items."""
+        best = self.counts.nlargest(k)
+        return [(item, int(count), int(count) + self.error) for item, count in best.items()]
+
+    def mode(self):
+        """(items tied for the largest count, lower count, upper count), or (None, 0, 0) when empty."""
+        if self.counts.empty:
+            return None, 0, 0
+        best = int(self.counts.max())
+        items = self.counts.index[self.counts == best].tolist()
+        return items, best, best + self.error
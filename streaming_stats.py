@@ -0,0 +1,223 @@
+import numpy as np
+import pandas as pd
+import logic
+
+# Out-of-core statistics over CSV chunks.
+# Count, mean, variance (Welford/Chan merge), min and max are exact. Quantiles come
+# from a fixed-size reservoir sample per column, so they are exact for files with
+# fewer rows than the reservoir and approximate above that.
+
+DEFAULT_CHUNKSIZE = 200_000
+RESERVOIR_SIZE = 100_000
+
+def read_header(file_path):
+    return list(logic.normalize_dataframe(pd.read_csv(file_path, nrows=0)).columns)
+
+def iter_csv_chunks(file_path, chunksize=DEFAULT_CHUNKSIZE):
+    for chunk in pd.read_csv(file_path, chunksize=chunksize):
+        yield logic.normalize_dataframe(chunk)
+
+class ReservoirSample:
+    """Uniform random sample of at most `size` values from a stream."""
+    def __init__(self, size=RESERVOIR_SIZE, seed=0):
+        self.size = size
+        self.seen = 0
+        self.values = np.empty(0, dtype=float)
+        self.rng = np.random.default_rng(seed)
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float)
+        free = self.size - len(self.values)
+        if free > 0:
+            self.values = np.concatenate([self.values, values[:free]])
+            self.seen += min(free, len(values))
+            values = values[free:]
+        if len(values) == 0:
+            return
+        # Item number i (0-based) replaces a random slot with probability size / (i + 1).
+        positions = self.seen + np.arange(1, len(values) + 1)
+        accepted = self.rng.random(len(values)) < self.size / positions
+        slots = self.rng.integers(0, self.size, size=int(accepted.sum()))
+        self.values[slots] = values[accepted]
+        self.seen += len(values)
+
+    def quantile(self, q):
+        if len(self.values) == 0:
+            return np.nan
+        return float(np.quantile(self.values, q))
+
+class NumericAccumulator:
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.nan
+        self.max = np.nan
+        self.sample = ReservoirSample()
+
+    def update(self, series):
+        values = pd.to_numeric(series, errors="coerce").dropna().to_numpy(dtype=float)
+        n = len(values)
+        if n == 0:
+            return
+        chunk_mean = values.mean()
+        chunk_m2 = ((values - chunk_mean) ** 2).sum()
+        # Chan et al. merge of two Welford states.
+        total = self.count + n
+        delta = chunk_mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += chunk_m2 + delta ** 2 * self.count * n / total
+        self.count = total
+        self.min = np.nanmin([self.min, values.min()])
+        self.max = np.nanmax([self.max, values.max()])
+        self.sample.update(values)
+
+    def summary(self):
+        std = np.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else np.nan
+        return {
+            "count": float(self.count),
+            "mean": self.mean if self.count else np.nan,
+            "std": std,
+            "min": self.min,
+            "25%": self.sample.quantile(0.25),
+            "50%": self.sample.quantile(0.5),
+            "75%": self.sample.quantile(0.75),
+            "max": self.max,
+        }
+
+class DatetimeAccumulator(NumericAccumulator):
+    """Timestamps as microseconds since the epoch, which a float holds exactly."""
+    def __init__(self, tz=None):
+        super().__init__()
+        self.tz = tz
+
+    def update(self, series):
+        values = pd.to_datetime(series, errors="coerce").dropna()
+        if values.dt.tz is not None:
+            values = values.dt.tz_convert("UTC").dt.tz_localize(None)
+        super().update(pd.Series(values.to_numpy(dtype="datetime64[us]").view("int64")))
+
+    def summary(self):
+        # describe() has no std for datetime columns.
+        out = {"count": self.count}
+        for key, value in super().summary().items():
+            if key not in ("count", "std"):
+                out[key] = self._timestamp(value)
+        return out
+
+    def _timestamp(self, value):
+        if np.isnan(value):
+            return pd.NaT
+        stamp = pd.Timestamp(int(round(value)), unit="us")
+        return stamp.tz_localize("UTC").tz_convert(self.tz) if self.tz is not None else stamp
+
+class CategoricalAccumulator:
+    def __init__(self):
+        self.count = 0
+        self.counts = None
+
+    def update(self, series):
+        counts = series.value_counts(sort=False)
+        self.count += int(counts.sum())
+        if self.counts is None:
+            self.counts = counts
+        else:
+            # sort=False keeps first-seen order so ties for "top" resolve like value_counts().
+            self.counts = pd.concat([self.counts, counts]).groupby(level=0, sort=False).sum()
+
+    def summary(self):
+        if self.counts is None or self.counts.empty:
+            return {"count": self.count, "unique": 0, "top": np.nan, "freq": np.nan}
+        return {
+            "count": self.count,
+            "unique": len(self.counts),
+            "top": self.counts.idxmax(),
+            "freq": int(self.counts.max()),
+        }
+
+class StreamingDescriber:
+    """Incremental equivalent of DataFrame.describe(include="all")."""
+    def __init__(self):
+        self.columns = None
+        self.accumulators = {}
+
+    def update(self, chunk):
+        if self.columns is None:
+            # Column kinds are fixed by the first chunk; later non-numeric values in a
+            # numeric column are treated as missing.
+            self.columns = list(chunk.columns)
+            for col in self.columns:
+                if pd.api.types.is_datetime64_any_dtype(chunk[col]):
+                    self.accumulators[col] = DatetimeAccumulator(getattr(chunk[col].dtype, "tz", None))
+                elif pd.api.types.is_numeric_dtype(chunk[col]) and not pd.api.types.is_bool_dtype(chunk[col]):
+                    self.accumulators[col] = NumericAccumulator()
+                else:
+                    self.accumulators[col] = CategoricalAccumulator()
+        for col in self.columns:
+            self.accumulators[col].update(chunk[col])
+
+    def result(self):
+        if not self.columns:
+            return pd.DataFrame()
+        kinds = {type(a) for a in self.accumulators.values()}
+        has_categorical = CategoricalAccumulator in kinds
+        has_datetime = DatetimeAccumulator in kinds
+        rows = ["count"]
+        if has_categorical:
+            rows += ["unique", "top", "freq"]
+        if has_datetime:
+            # describe() lists std last when datetime columns are present, and only
+            # when a numeric column has one.
+            rows += ["mean", "min", "25%", "50%", "75%", "max"]
+            if NumericAccumulator in kinds:
+                rows.append("std")
+        elif NumericAccumulator in kinds:
+            rows += ["mean", "std", "min", "25%", "50%", "75%", "max"]
+        out = pd.DataFrame(index=rows, columns=self.columns, dtype=object)
+        for col in self.columns:
+            for key, value in self.accumulators[col].summary().items():
+                if key in rows:
+                    out.loc[key, col] = value
+            if type(self.accumulators[col]) is NumericAccumulator:
+                out[col] = out[col].astype(float)
+        return out
+
+class StreamingGroupStats:
+    """Incremental groupby(group_col)[target_col].agg(["mean", "sum", "max", "min"])."""
+    def __init__(self, group_col, target_col):
+        self.group_col = group_col
+        self.target_col = target_col
+        self.partials = None
+
+    def update(self, chunk):
+        partial = chunk.groupby(self.group_col)[self.target_col].agg(["sum", "count", "max", "min"])
+        if self.partials is None:
+            self.partials = partial
+        else:
+            combined = pd.concat([self.partials, partial])
+            self.partials = combined.groupby(level=0).agg({"sum": "sum", "count": "sum", "max": "max", "min": "min"})
+
+    def result(self):
+        if self.partials is None:
+            return pd.DataFrame(columns=[self.group_col, "mean", "sum", "max", "min"])
+        partials = self.partials.sort_index()
+        out = pd.DataFrame({
+            "mean": partials["sum"] / partials["count"].where(partials["count"] > 0),
+            "sum": partials["sum"],
+            "max": partials["max"],
+            "min": partials["min"],
+        })
+        out.index.name = self.group_col
+        return out.reset_index()
+
+def describe_csv(file_path, chunksize=DEFAULT_CHUNKSIZE):
+    describer = StreamingDescriber()
+    for chunk in iter_csv_chunks(file_path, chunksize):
+        describer.update(chunk)
+    return describer.result()
+
+def group_stats_csv(file_path, group_col, target_col, chunksize=DEFAULT_CHUNKSIZE):
+    stats = StreamingGroupStats(group_col, target_col)
+    for chunk in iter_csv_chunks(file_path, chunksize):
+        stats.update(chunk)
+    return stats.result()
@@ -0,0 +1,50 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import logic  # noqa: E402
+
+REGIONS = ["North", "South", "East", "West", "South", "East", None, "North"]
+
+def expected(mask):
+    return np.flatnonzero(mask.fillna(False).to_numpy())
+
+def check_ranges(df):
+    text = df["region"].astype(object)
+    cases = [
+        (("region", ">=", "South"), text >= "South"),
+        (("region", ">", "North"), text > "North"),
+        (("region", "<", "North"), text < "North"),
+        (("region", "<=", "North"), text <= "North"),
+        (("region", "between", ("East", "North")), (text >= "East") & (text <= "North")),
+        (("region", "in", ["West", "East", "West"]), text.isin(["West", "East"])),
+    ]
+    for condition, mask in cases:
+        rows = logic.resolve_filter(df, [condition])
+        assert rows.tolist() == expected(mask).tolist(), condition
+
+def test_ranges_on_text():
+    check_ranges(pd.DataFrame({"region": pd.Series(REGIONS, dtype=object)}))
+
+def test_ranges_on_categories_not_in_string_order():
+    # Category order differs from string order, as in a cached or hand-built categorical.
+    categories = ["North", "South", "East", "West"]
+    check_ranges(pd.DataFrame({"region": pd.Categorical(REGIONS, categories=categories)}))
+    check_ranges(pd.DataFrame({"region": pd.Categorical(REGIONS, categories=categories, ordered=True)}))
+
+def test_conditions_are_intersected():
+    df = pd.DataFrame({"region": pd.Categorical(REGIONS, categories=["West", "South", "North", "East"]),
+                       "sales": [5, 1, 7, 3, 9, 2, 8, 4]})
+    rows = logic.resolve_filter(df, [("region", "in", ["North", "East"]), ("sales", ">", 3)])
+    assert rows.tolist() == [0, 2, 7]
+
+def test_repeated_numeric_values_select_rows_once():
+    df = pd.DataFrame({"price": [9.99, 8.99, 9.99, 12.99, 9.99, 8.99],
+                       "region": ["North", "North", "South", "North", "North", "East"]})
+    view = logic.FilteredView(df, [("price", "in", ["9.99", "9.990", "9.99"])])
+    assert len(view) == 3
+    rows = logic.resolve_filter(df, [("price", "in", ["9.99", "9.990"]), ("region", "==", "North")])
+    assert rows.tolist() == [0, 4]